@@ -22,6 +22,9 @@ fi
 
 ./prepare/prepare-files.sh
 
+echo "building dataset index"
+./commands/datasetIndex.py --dataset-directory ./input/
+
 IMAGE_NAME="ghcr.io/glopix/cloreco-images/google-code-jam-benchmark:latest"
 
 docker build . -t "$IMAGE_NAME"
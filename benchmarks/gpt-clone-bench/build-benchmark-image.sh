@@ -49,6 +49,9 @@ find ./input/ -type d -empty -delete
 
 rm -f ./input/*.md ./input/*.txt
 
+echo "building dataset index"
+./commands/datasetIndex.py --dataset-directory ./input/
+
 IMAGE_NAME="ghcr.io/glopix/cloreco-images/gpt-clone-bench-benchmark:latest"
 
 docker build . -t "$IMAGE_NAME"
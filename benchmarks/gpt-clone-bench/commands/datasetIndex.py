@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Metadata index of the benchmark dataset, so detectClones and evaluateTool do not need to walk
+the whole dataset directory tree on every execution.
+
+The index is stored in the dataset directory (input/.datasetIndex.json).
+It is created by build-benchmark-image.sh before the benchmark image is built, or on first use, if it is missing.
+The dataset of a benchmark image does not change, so a shipped index of the current version is used as it is,
+the dataset directory is not walked (or checked) by detectClones and evaluateTool.
+If the dataset is changed outside of a benchmark image, the index has to be rebuilt with this script, e.g.:
+{
+    "version": 4,
+    "datasetHash": "9f86d0...",
+    "parts": {
+        "4": {"entries": 1215, "files": 1210, "bytes": 2621440}
+    },
+    "directories": {
+        "4/tsc_p1_MT3": {"entries": 240, "pairs": 28680, "files": ["1.java", "2.java", ...]}
+    }
+}
+    datasetHash:    sha256 of the relative paths and sizes of all files, identifies the version of the dataset (key of the index).
+                    The file contents are not read, so (re)building the index only needs one walk over the directory tree.
+                    An index without a dataset hash is not used.
+    parts:          per part of the dataset (e.g. '4'): number of all files and directories in it (recursive), number of files and their total size in bytes
+    directories:    per sub directory of a part (e.g. '4/tsc_p1_MT3'): number of entries, number of possible pairs of them and names of the files
+"""
+import argparse
+import json
+import os
+import sys
+from hashlib import sha256
+from pathlib import Path
+
+# `typing.Dict` is imported to provide type hints for older Python versions (<= 3.8)
+from typing import Dict
+
+INDEX_FILE_NAME = ".datasetIndex.json"
+INDEX_VERSION = 4
+
+
+def get_index_file(datasetDir: Path) -> Path:
+    return Path(datasetDir) / INDEX_FILE_NAME
+
+
+
+def build_dataset_index(datasetDir: Path) -> Dict:
+    """
+    Walk the whole dataset directory tree once and collect the metadata of the dataset (see module docstring).
+    Only the names and sizes of the files are read, not their contents.
+    """
+    datasetDir = Path(datasetDir)
+    datasetHash = sha256()
+    parts = {}
+    directories = {}
+
+    for part in sorted(p for p in datasetDir.iterdir() if p.is_dir()):
+        entries = 0
+        files = 0
+        size = 0
+        for root, dirNames, fileNames in os.walk(part):
+            dirNames.sort()
+            entries += len(dirNames) + len(fileNames)
+            files += len(fileNames)
+
+            for fileName in sorted(fileNames):
+                file = Path(root) / fileName
+                fileSize = file.stat().st_size
+                size += fileSize
+                datasetHash.update(f"{file.relative_to(datasetDir).as_posix()}:{fileSize}\n".encode())
+
+        parts[part.name] = {"entries": entries, "files": files, "bytes": size}
+
+        for subDir in sorted(d for d in part.iterdir() if d.is_dir()):
+            subDirEntries = sorted(subDir.iterdir())
+            directories[f"{part.name}/{subDir.name}"] = {
+                "entries"   : len(subDirEntries),
+                "pairs"     : len(subDirEntries) * (len(subDirEntries) - 1) // 2,
+                "files"     : [entry.name for entry in subDirEntries if entry.is_file()],
+            }
+
+    return {
+        "version"       : INDEX_VERSION,
+        "datasetHash"   : datasetHash.hexdigest(),
+        "parts"         : parts,
+        "directories"   : directories,
+    }
+
+
+def save_dataset_index(datasetDir: Path, index: Dict) -> None:
+    """
+    Save the index in the dataset directory. If the dataset directory is not writable, the index is not saved.
+    """
+    indexFile = get_index_file(datasetDir)
+    tmpFile = indexFile.with_name(f"{indexFile.name}.{os.getpid()}.tmp")
+    try:
+        with tmpFile.open("w") as file:
+            json.dump(index, file)
+        os.replace(tmpFile, indexFile)
+    except OSError as e:
+        print(f"The dataset index could not be saved in '{indexFile}': {e}", file=sys.stderr)
+        # missing_ok of Path.unlink requires Python 3.8
+        try:
+            tmpFile.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def read_dataset_index(datasetDir: Path) -> Dict:
+    """
+    Returns the saved index of the dataset, None if it is missing, of another version or has no dataset hash.
+    """
+    try:
+        with get_index_file(datasetDir).open("r") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != INDEX_VERSION or not index.get("datasetHash"):
+        return None
+    return index
+
+
+def load_dataset_index(datasetDir: Path) -> Dict:
+    """
+    Returns the index of the dataset. It is (re)built and saved if it is missing or of another version.
+    """
+    datasetDir = Path(datasetDir)
+    index = read_dataset_index(datasetDir)
+    if index is not None:
+        return index
+
+    index = build_dataset_index(datasetDir)
+    save_dataset_index(datasetDir, index)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Builds the metadata index of the benchmark dataset (see datasetIndex.py).")
+    parser.add_argument("-d", "--dataset-directory", required=False,
+                        default=Path(__file__).absolute().parent.parent / "input",
+                        help="""Directory in which the benchmark files with clones are stored.""")
+    args = parser.parse_args()
+
+    datasetDir = Path(args.dataset_directory)
+    previous = read_dataset_index(datasetDir)
+    index = build_dataset_index(datasetDir)
+    # the index file is only rewritten if the dataset has changed
+    if previous is not None and previous["datasetHash"] == index["datasetHash"]:
+        print(f"dataset index of '{datasetDir}' is up to date, dataset hash {index['datasetHash']}")
+    else:
+        save_dataset_index(datasetDir, index)
+        print(f"dataset index of '{datasetDir}': {len(index['parts'])} parts, {len(index['directories'])} directories, dataset hash {index['datasetHash']}")
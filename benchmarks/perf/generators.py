@@ -0,0 +1,218 @@
+"""
+Deterministic generators of synthetic input data for the performance suite (see runPerf.py).
+
+All generators use their own random number generator with a fixed seed,
+so the same parameters always produce the same files (byte for byte).
+The files resemble the real inputs of the measured entry points:
+    - benchmark dataset tree:       input/<part>/<directory>/<file>.java (Google Code Jam layout)
+    - clone CSV:                    output of detectClones, e.g. A1,1.java,3,17,A2,7.java,5,20
+    - Deckard clusters:             clusters/post_cluster_*
+    - SourcererCC output:           block stats and query output (clone pairs of block IDs)
+    - DrDup / NiCad XML:            clone XML output of DrDup2/DrDupLex and NiCad
+    - run directory:                <benchmark>/<detector>/<detector>.report and .csv files
+"""
+import random
+from pathlib import Path
+
+# number of lines, which are written at once
+WRITE_BUFFER_LINES = 65536
+
+JAVA_TEMPLATE = """public class Solution{index} {{
+    public static void main(String[] args) {{
+{body}
+    }}
+}}
+"""
+
+
+def write_lines(file: Path, lines) -> None:
+    """
+    write the lines (without line breaks) of an iterable to a file in chunks of WRITE_BUFFER_LINES lines
+    """
+    Path(file).parent.mkdir(parents=True, exist_ok=True)
+    with open(file, "w") as out:
+        buffer = []
+        for line in lines:
+            buffer.append(line)
+            if len(buffer) >= WRITE_BUFFER_LINES:
+                buffer.append("")
+                out.write("\n".join(buffer))
+                buffer = []
+        if buffer:
+            buffer.append("")
+            out.write("\n".join(buffer))
+
+
+def dataset_directories(numParts: int, dirsPerPart: int) -> list[tuple[str, str]]:
+    """
+    names of the parts and their directories of the synthetic dataset: (part, directory), e.g. ('part0', 'A0')
+    """
+    return [(f"part{part}", f"A{part * dirsPerPart + directory}") for part in range(numParts) for directory in range(dirsPerPart)]
+
+
+def generate_dataset_tree(datasetDir: Path, numParts: int, dirsPerPart: int, filesPerDir: int, fileLines: int, seed: int = 1) -> None:
+    """
+    benchmark dataset in the layout of Google Code Jam: <part>/<directory>/<n>.java,
+    each file contains fileLines statements of random length
+    """
+    rng = random.Random(seed)
+    for part, directory in dataset_directories(numParts, dirsPerPart):
+        dirPath = Path(datasetDir) / part / directory
+        dirPath.mkdir(parents=True, exist_ok=True)
+        for index in range(filesPerDir):
+            body = "\n".join(f"        int v{line} = {rng.randrange(1 << 20)} * {rng.randrange(1 << 10)};" for line in range(fileLines))
+            (dirPath / f"{index}.java").write_text(JAVA_TEMPLATE.format(index=index, body=body))
+
+
+def generate_clone_csv(csvFile: Path, numLines: int, numDirs: int, filesPerDir: int,
+                       trueCloneRatio: float = 0.5, duplicateRatio: float = 0.1, seed: int = 2) -> None:
+    """
+    clone CSV (output of detectClones) with numLines clone pairs between the files of numDirs directories (A0, A1, ...):
+        directoryA,fileA,startLine,endLine,directoryB,fileB,startLine,endLine
+    trueCloneRatio: share of clone pairs within the same directory
+    duplicateRatio: share of clone pairs, which repeat an earlier clone pair (in reversed order)
+    """
+    rng = random.Random(seed)
+
+    def clone_pairs():
+        previous = []
+        for _ in range(numLines):
+            if previous and rng.random() < duplicateRatio:
+                left, right = previous[rng.randrange(len(previous))]
+                yield f"{right},{left}"
+                continue
+
+            dirLeft = rng.randrange(numDirs)
+            dirRight = dirLeft if rng.random() < trueCloneRatio else rng.randrange(numDirs)
+            startLeft, startRight = rng.randrange(1, 200), rng.randrange(1, 200)
+            left = f"A{dirLeft},{rng.randrange(filesPerDir)}.java,{startLeft},{startLeft + rng.randrange(30)}"
+            right = f"A{dirRight},{rng.randrange(filesPerDir)}.java,{startRight},{startRight + rng.randrange(30)}"
+            yield f"{left},{right}"
+
+            # keep a bounded sample of earlier clone pairs for duplicates
+            if len(previous) < 4096:
+                previous.append((left, right))
+            else:
+                previous[rng.randrange(4096)] = (left, right)
+
+    write_lines(csvFile, clone_pairs())
+
+
+def generate_deckard_clusters(clustersFile: Path, numClusters: int, clusterSize: int, numDirs: int, filesPerDir: int, seed: int = 3) -> None:
+    """
+    clusters of Deckard (post_cluster_*): blocks of lines, separated by an empty line, e.g.:
+        0000000 dist:0.0 FILE src/examples/input/A3/15.java LINE:279:13 NODE_KIND:0 nVARs:3
+    """
+    rng = random.Random(seed)
+
+    def cluster_lines():
+        for _ in range(numClusters):
+            for _ in range(rng.randrange(2, 2 * clusterSize)):
+                yield (f"0000000 dist:0.0 FILE src/examples/input/A{rng.randrange(numDirs)}/{rng.randrange(filesPerDir)}.java "
+                       f"LINE:{rng.randrange(1, 500)}:{rng.randrange(10, 60)} NODE_KIND:0 nVARs:3")
+            yield ""
+
+    write_lines(clustersFile, cluster_lines())
+
+
+def generate_sourcerer_output(baseDir: Path, numFiles: int, blocksPerFile: int, numPairs: int, seed: int = 4) -> None:
+    """
+    output of SourcererCC in the directory structure expected by its bcboutput/main.py:
+        tokenizers/block-level/file_block_stats/files-stats-0.stats:  file lines (f...) followed by their block lines (b...)
+        clone-detector/NODE_1/output8.0/query_1clones_index_WITH_FILTER.txt:  projectA,blockA,projectB,blockB
+    """
+    rng = random.Random(seed)
+    baseDir = Path(baseDir)
+    blockIDs = []
+
+    def stats_lines():
+        blockID = 100000000
+        for fileIndex in range(numFiles):
+            yield f'f1,{fileIndex},"input/A{fileIndex % 1000}/{fileIndex}.java","input/A{fileIndex % 1000}/{fileIndex}.java","hash",100,80,70'
+            for _ in range(blocksPerFile):
+                blockID += 1
+                blockIDs.append(blockID)
+                start = rng.randrange(1, 400)
+                yield f"b1,{blockID},hashhash,20,15,{start},{start + rng.randrange(5, 60)}"
+
+    write_lines(baseDir / "tokenizers/block-level/file_block_stats/files-stats-0.stats", stats_lines())
+
+    def query_lines():
+        for _ in range(numPairs):
+            yield f"1,{blockIDs[rng.randrange(len(blockIDs))]},1,{blockIDs[rng.randrange(len(blockIDs))]}"
+
+    write_lines(baseDir / "clone-detector/NODE_1/output8.0/query_1clones_index_WITH_FILTER.txt", query_lines())
+
+
+def generate_clone_xml(xmlFile: Path, numClones: int, sourcesPerClone: int, numDirs: int, filesPerDir: int,
+                       style: str = "drdup", seed: int = 5) -> None:
+    """
+    clone XML output of DrDup2/DrDupLex (style='drdup', relative file paths)
+    or NiCad clone classes (style='nicad', absolute file paths in /cloneDetection/input/)
+    """
+    rng = random.Random(seed)
+    if style == "nicad":
+        cloneTag, prefix = "class", "/cloneDetection/input/"
+    else:
+        cloneTag, prefix = "clone", ""
+
+    def xml_lines():
+        yield '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        yield "<clones>"
+        for classID in range(numClones):
+            numSources = rng.randrange(2, 2 * sourcesPerClone)
+            yield f'<{cloneTag} classid="{classID}" nclones="{numSources}" nlines="10" similarity="100">'
+            for _ in range(numSources):
+                start = rng.randrange(1, 400)
+                yield (f'<source file="{prefix}A{rng.randrange(numDirs)}/{rng.randrange(filesPerDir)}.java" '
+                       f'startline="{start}" endline="{start + rng.randrange(5, 60)}" pcid="{rng.randrange(1 << 20)}"></source>')
+            yield f"</{cloneTag}>"
+        yield "</clones>"
+
+    write_lines(xmlFile, xml_lines())
+
+
+def generate_report(reportFile: Path, toolName: str, rng: random.Random) -> None:
+    """
+    .report file of evaluateTool, with the runtime and resource usage inserted by entrypoint.py
+    """
+    types = ["Type-1", "Type-2", "Type-2 (blind)", "Type-2 (consistent)", "Very-Strongly Type-3",
+             "Strongly Type-3", "Moderatly Type-3", "Weakly Type-3/Type-4"]
+    lines = [
+        "-- Tool --",
+        f"Tool: 1 - {toolName}",
+        f"Description: {toolName}",
+        f"#Clones: {rng.randrange(1, 10**7)}",
+        "Start at: 2024-01-01 13:37:00",
+        f"Runtime (s) of detectClones: {rng.uniform(10, 10000):.2f}",
+        f"User CPU time (s) of detectClones: {rng.uniform(10, 10000):.2f}",
+        f"System CPU time (s) of detectClones: {rng.uniform(1, 100):.2f}",
+        f"Peak RSS (MB) of detectClones: {rng.uniform(100, 10000):.2f}",
+        f"Block input (MB) of detectClones: {rng.uniform(0, 1000):.2f}",
+        f"Block output (MB) of detectClones: {rng.uniform(0, 1000):.2f}",
+        "",
+        "================================================================================",
+        "    All Functionalities",
+        "================================================================================",
+        "-- Recall Per Clone Type (type: numDetected / numClones = recall) --",
+    ]
+    for cloneType in types:
+        numClones = rng.randrange(1000, 10**6)
+        numDetected = rng.randrange(numClones)
+        lines.append(f"  {cloneType}: {numDetected} / {numClones} = {numDetected / numClones}")
+    lines.append("")
+    write_lines(reportFile, lines)
+
+
+def generate_run_directory(runDir: Path, numBenchmarks: int, numTools: int, csvLines: int, seed: int = 6) -> None:
+    """
+    run directory with the result files of numTools clone detector tools in numBenchmarks benchmarks:
+        <benchmark>/<detector>/<detector>.report and <detector>.csv (csvLines clone pairs)
+    """
+    rng = random.Random(seed)
+    for benchmark in range(numBenchmarks):
+        for tool in range(numTools):
+            toolName = f"Tool{tool}"
+            detectorDir = Path(runDir) / f"Benchmark{benchmark}" / toolName
+            generate_report(detectorDir / f"{toolName}.report", toolName, rng)
+            generate_clone_csv(detectorDir / f"{toolName}.csv", csvLines, 100, 100, seed=rng.randrange(1 << 30))
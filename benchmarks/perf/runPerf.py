@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Performance suite of the python code, which is executed for each clone detector tool in each run:
+    - evaluateTool (Evaluator.true_and_false_clones, total_clones) of the Google Code Jam benchmark
+    - detectClones (DetectClones.partition and the partition pairs) of the Google Code Jam benchmark
+    - datasetIndex.py (metadata index of the benchmark dataset)
+    - the converters of Deckard, SourcererCC, DrDup2/DrDupLex and NiCad to the BigCloneEval CSV format
+    - toolStatistics.extract_statistics_to_csv and downloads.get_path_size of the web-app
+
+The input data is generated deterministically (see generators.py) in the work directory and reused by later executions
+with the same size. No network access and no docker are needed.
+
+Each case is executed in a separate process (--repeat times). Its runtime (fastest execution), CPU time and
+peak RSS (largest execution) are measured with os.wait4 and printed as table.
+The cases of the web-app (toolStatistics, get_path_size) import the web-app and measure only the runtime of the function,
+they are skipped, if the dependencies of the web-app (flask, pandas, plotnine, ...) are not installed.
+
+The results can be saved (--output) and compared with the results of an earlier execution (--baseline):
+a case is a regression, if its runtime or peak RSS exceeds the baseline by more than --tolerance.
+
+e.g.:
+    ./runPerf.py --size small
+    ./runPerf.py --size medium --only evaluateTool --output results.json
+    ./runPerf.py --size medium --baseline results.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from types import SimpleNamespace
+
+import generators
+
+PERF_DIR = Path(__file__).resolve().parent
+REPO_DIR = PERF_DIR.parent.parent
+GCJ_COMMANDS_DIR = REPO_DIR / "benchmarks/google-code-jam/commands"
+CONVERTERS_DIR = REPO_DIR / "images/_detector-tool-base/converters"
+WEB_APP_DIR = REPO_DIR / "web-app/app"
+
+# exit code of a worker (see run_worker), whose dependencies are not installed
+SKIPPED_EXIT_CODE = 3
+
+# sizes of the generated input data
+SIZES = {
+    "small": dict(
+        cloneLines=10_000, datasetParts=2, dirsPerPart=10, filesPerDir=20, fileLines=20, maxFiles=100,
+        deckardClusters=2_000, sourcererFiles=2_000, sourcererPairs=50_000, xmlClones=2_000,
+        runTools=5, runCsvLines=10_000,
+    ),
+    "medium": dict(
+        cloneLines=1_000_000, datasetParts=4, dirsPerPart=25, filesPerDir=40, fileLines=40, maxFiles=800,
+        deckardClusters=50_000, sourcererFiles=20_000, sourcererPairs=1_000_000, xmlClones=100_000,
+        runTools=10, runCsvLines=200_000,
+    ),
+    "large": dict(
+        cloneLines=10_000_000, datasetParts=8, dirsPerPart=50, filesPerDir=50, fileLines=60, maxFiles=2_000,
+        deckardClusters=500_000, sourcererFiles=100_000, sourcererPairs=10_000_000, xmlClones=1_000_000,
+        runTools=20, runCsvLines=1_000_000,
+    ),
+    "huge": dict(
+        cloneLines=100_000_000, datasetParts=8, dirsPerPart=100, filesPerDir=100, fileLines=60, maxFiles=5_000,
+        deckardClusters=2_000_000, sourcererFiles=500_000, sourcererPairs=50_000_000, xmlClones=5_000_000,
+        runTools=20, runCsvLines=5_000_000,
+    ),
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measures the runtime and memory usage of the python hot paths of Cloreco on synthetic data.")
+    parser.add_argument("-s", "--size", choices=list(SIZES), default="small",
+                        help="Size of the generated input data (default: small = clone CSV of 10K lines).")
+    parser.add_argument("--clone-lines", type=int, default=None,
+                        help="Number of lines of the generated clone CSV, overrides the value of --size.")
+    parser.add_argument("-w", "--work-directory", default=None,
+                        help="Directory of the generated input data (default: <tmp>/cloreco-perf-<size>), reused by later executions.")
+    parser.add_argument("--only", default="",
+                        help="Comma separated list of cases (or prefixes of them), which are executed (default: all).")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="Number of executions of each case (default: 3).")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Save the results to this JSON file.")
+    parser.add_argument("-b", "--baseline", default=None,
+                        help="Compare the results with the results of an earlier execution (JSON file, see --output).")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.25,
+                        help="Allowed increase of runtime and peak RSS compared to the baseline (default: 0.25 = 25%%).")
+    parser.add_argument("--list", action="store_true",
+                        help="List all cases and exit.")
+    # internal: execute a case of the web-app in this process (see run_worker)
+    parser.add_argument("--worker", nargs="+", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def get_sizes(args: argparse.Namespace) -> dict:
+    sizes = dict(SIZES[args.size])
+    if args.clone_lines:
+        sizes["cloneLines"] = args.clone_lines
+    return sizes
+
+
+def generate_inputs(workDir: Path, sizes: dict) -> SimpleNamespace:
+    """
+    generate the input data of all cases in the work directory, if it was not already generated with the same sizes
+    """
+    paths = SimpleNamespace(
+        dataset     = workDir / "dataset/input",
+        cloneCSV    = workDir / "clones.csv",
+        deckard     = workDir / "deckard",
+        sourcerer   = workDir / "sourcerer",
+        drDupXML    = workDir / "drdup-output.xml",
+        nicadXML    = workDir / "nicad-classes.xml",
+        runDir      = workDir / "run",
+        output      = workDir / "output",
+    )
+    numDirs = sizes["datasetParts"] * sizes["dirsPerPart"]
+    filesPerDir = sizes["filesPerDir"]
+
+    marker = workDir / "generated.json"
+    if marker.is_file() and json.loads(marker.read_text()) == sizes:
+        return paths
+
+    print(f"generating input data in '{workDir}'", flush=True)
+    for path in (paths.dataset.parent, paths.deckard, paths.sourcerer, paths.runDir):
+        shutil.rmtree(path, ignore_errors=True)
+
+    generators.generate_dataset_tree(paths.dataset, sizes["datasetParts"], sizes["dirsPerPart"], filesPerDir, sizes["fileLines"])
+    subprocess.run([sys.executable, GCJ_COMMANDS_DIR / "datasetIndex.py", "--dataset-directory", paths.dataset], check=True, stdout=subprocess.DEVNULL)
+    generators.generate_clone_csv(paths.cloneCSV, sizes["cloneLines"], numDirs, filesPerDir)
+    generators.generate_deckard_clusters(paths.deckard / "clusters/post_cluster_vdb_30_0_allg_0.95_30", sizes["deckardClusters"], 4, numDirs, filesPerDir)
+    (paths.deckard / "bcboutput").mkdir(parents=True, exist_ok=True)
+    generators.generate_sourcerer_output(paths.sourcerer, sizes["sourcererFiles"], 5, sizes["sourcererPairs"])
+    generators.generate_clone_xml(paths.drDupXML, sizes["xmlClones"], 3, numDirs, filesPerDir, style="drdup")
+    generators.generate_clone_xml(paths.nicadXML, sizes["xmlClones"], 3, numDirs, filesPerDir, style="nicad")
+    generators.generate_run_directory(paths.runDir, 1, sizes["runTools"], sizes["runCsvLines"])
+
+    marker.write_text(json.dumps(sizes))
+    return paths
+
+
+def get_cases(paths: SimpleNamespace, sizes: dict) -> list[SimpleNamespace]:
+    """
+    all cases: name, command and working directory of the process, file for the stdout of the process,
+    optional function to prepare the case and modules required by the case (the case is skipped, if they are not installed)
+    """
+    python = sys.executable
+    output = paths.output
+    sourcererScript = paths.sourcerer / "bcboutput/main.py"
+
+    def case(name: str, command: list, cwd: Path = None, stdout: Path = None, prepare=None) -> SimpleNamespace:
+        return SimpleNamespace(name=name, command=[str(c) for c in command], cwd=cwd or output, stdout=stdout, prepare=prepare)
+
+    def copy_sourcerer_script():
+        # SourcererCC's main.py reads its input relative to its own location
+        sourcererScript.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(REPO_DIR / "images/sourcerer-cc/bcboutput/main.py", sourcererScript)
+
+    evaluateTool = [python, GCJ_COMMANDS_DIR / "evaluateTool", "-i", paths.cloneCSV, "-o", output / "evaluateTool.report", "-d", paths.dataset]
+
+    return [
+        case("evaluateTool", evaluateTool),
+        # spill the clone pairs into temporary files and merge them
+        case("evaluateTool-spill", [*evaluateTool, "--max-pairs-in-memory", max(sizes["cloneLines"] // 10, 1)]),
+        case("detectClones-partition", [python, GCJ_COMMANDS_DIR / "detectClones", "-o", output / "detectClones.csv", "-r", "/bin/true",
+                                        "-m", sizes["maxFiles"], "-d", paths.dataset]),
+        case("datasetIndex-build", [python, GCJ_COMMANDS_DIR / "datasetIndex.py", "--dataset-directory", paths.dataset]),
+        case("converter-deckard", [python, REPO_DIR / "images/deckard/bcboutput/main.py"],
+             cwd=paths.deckard / "bcboutput", stdout=output / "deckard.csv"),
+        case("converter-sourcerer", [python, sourcererScript], stdout=output / "sourcerer.csv", prepare=copy_sourcerer_script),
+        case("converter-drdup", [python, CONVERTERS_DIR / "drDupXmlToCsv.py", paths.drDupXML, output / "drdup.csv"]),
+        case("converter-nicad", [python, CONVERTERS_DIR / "nicadXmlToCsv.py", paths.nicadXML, "-o", output / "nicad.csv",
+                                 "--strip-prefix", "/cloneDetection/input/"]),
+        case("toolStatistics-csv", [python, PERF_DIR / "runPerf.py", "--worker", "toolStatistics", paths.runDir / "Benchmark0", output / "summary.csv"]),
+        case("downloads-pathSize", [python, PERF_DIR / "runPerf.py", "--worker", "pathSize", paths.runDir]),
+    ]
+
+
+def measure(case: SimpleNamespace) -> dict|None:
+    """
+    execute the case once in a separate process
+
+    Returns:
+        runtime (s), CPU time (s) and peak RSS (MB) of the process, None if the case was skipped
+    """
+    resultFile = Path(tempfile.mkstemp(prefix="cloreco-perf", suffix=".json")[1])
+    env = dict(os.environ, PERF_RESULT_FILE=str(resultFile))
+    stdout = open(case.stdout, "w") if case.stdout else subprocess.DEVNULL
+    try:
+        # stderr is buffered in a temporary file, a pipe could block the process before it is read
+        with tempfile.TemporaryFile() as stderrFile:
+            start = perf_counter()
+            process = subprocess.Popen(case.command, cwd=case.cwd, stdout=stdout, stderr=stderrFile, env=env)
+            # wait4 instead of wait: also returns the resource usage of the process
+            _, status, usage = os.wait4(process.pid, 0)
+            seconds = perf_counter() - start
+            process.returncode = os.waitstatus_to_exitcode(status)
+            stderrFile.seek(0)
+            stderr = stderrFile.read().decode(errors="replace")
+
+        if process.returncode == SKIPPED_EXIT_CODE:
+            print(f"{case.name}: skipped ({stderr.strip().splitlines()[-1] if stderr.strip() else 'missing dependencies'})", flush=True)
+            return None
+        if process.returncode != 0:
+            raise RuntimeError(f"'{case.name}' failed with exit code {process.returncode}:\n{stderr}")
+
+        # the workers measure only the runtime of the function, without the imports
+        workerResult = resultFile.read_text()
+        if workerResult:
+            seconds = json.loads(workerResult)["seconds"]
+    finally:
+        if case.stdout:
+            stdout.close()
+        resultFile.unlink()
+
+    return {
+        "seconds"       : round(seconds, 3),
+        "cpuUser"       : round(usage.ru_utime, 3),
+        "cpuSystem"     : round(usage.ru_stime, 3),
+        # ru_maxrss: KiB on linux
+        "peakRssMB"     : round(usage.ru_maxrss / 1024, 1),
+    }
+
+
+def run_case(case: SimpleNamespace, repeat: int) -> dict|None:
+    """
+    execute the case --repeat times: the fastest runtime and the largest peak RSS are used
+    """
+    if case.prepare:
+        case.prepare()
+
+    measurements = []
+    for _ in range(repeat):
+        measurement = measure(case)
+        if measurement is None:
+            return None
+        measurements.append(measurement)
+
+    fastest = min(measurements, key=lambda measurement: measurement["seconds"])
+    return dict(fastest, peakRssMB=max(measurement["peakRssMB"] for measurement in measurements))
+
+
+def compare_with_baseline(results: dict, baselineFile: Path, tolerance: float) -> list[str]:
+    """
+    Returns:
+        the regressions (cases, whose runtime or peak RSS exceeds the baseline by more than the tolerance)
+    """
+    baseline = json.loads(Path(baselineFile).read_text())
+    if baseline.get("sizes") != results["sizes"]:
+        print(f"Warning: the baseline '{baselineFile}' was measured with other input sizes", file=sys.stderr)
+
+    regressions = []
+    for name, result in results["cases"].items():
+        baselineResult = baseline.get("cases", {}).get(name)
+        if not baselineResult:
+            continue
+        for metric in ("seconds", "peakRssMB"):
+            if baselineResult[metric] and result[metric] > baselineResult[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {baselineResult[metric]} -> {result[metric]} "
+                                   f"(+{(result[metric] / baselineResult[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_results(results: dict) -> None:
+    print(f"\n{'case':<26} {'runtime (s)':>12} {'CPU user (s)':>13} {'CPU sys (s)':>12} {'peak RSS (MB)':>14}")
+    for name, result in results["cases"].items():
+        print(f"{name:<26} {result['seconds']:>12.3f} {result['cpuUser']:>13.3f} {result['cpuSystem']:>12.3f} {result['peakRssMB']:>14.1f}")
+
+
+def run_worker(worker: list[str]) -> None:
+    """
+    execute a case of the web-app in this process and write its runtime (without the imports) to $PERF_RESULT_FILE
+    """
+    sys.path.insert(0, str(WEB_APP_DIR))
+    name, *args = worker
+    try:
+        if name == "toolStatistics":
+            from project.utils.Run import toolStatistics
+            function = lambda: toolStatistics.extract_statistics_to_csv(Path(args[0]), Path(args[1]))
+        elif name == "pathSize":
+            from project.utils.pages.downloads import get_path_size
+            function = lambda: get_path_size(Path(args[0]))
+        else:
+            raise ValueError(f"unknown worker '{name}'")
+    except ImportError as e:
+        print(f"missing dependency of the web-app: {e}", file=sys.stderr)
+        sys.exit(SKIPPED_EXIT_CODE)
+
+    start = perf_counter()
+    function()
+    seconds = perf_counter() - start
+
+    Path(os.environ["PERF_RESULT_FILE"]).write_text(json.dumps({"seconds": seconds}))
+
+
+def main() -> None:
+    args = parse_args()
+    if args.worker:
+        run_worker(args.worker)
+        return
+
+    sizes = get_sizes(args)
+    workDir = Path(args.work_directory or Path(tempfile.gettempdir()) / f"cloreco-perf-{args.size}").absolute()
+    paths = generate_inputs(workDir, sizes)
+    paths.output.mkdir(parents=True, exist_ok=True)
+
+    cases = get_cases(paths, sizes)
+    if args.list:
+        print("\n".join(case.name for case in cases))
+        return
+    if args.only:
+        selected = [name.strip() for name in args.only.split(",") if name.strip()]
+        cases = [case for case in cases if any(case.name.startswith(name) for name in selected)]
+
+    results = {
+        "sizes"     : sizes,
+        "python"    : platform.python_version(),
+        "cases"     : {},
+    }
+    for case in cases:
+        print(f"running {case.name}", flush=True)
+        result = run_case(case, max(args.repeat, 1))
+        if result is not None:
+            results["cases"][case.name] = result
+
+    print_results(results)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=4))
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, Path(args.baseline), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regressions compared to '{args.baseline}':", *regressions, sep="\n")
+            sys.exit(1)
+        print(f"\nno regressions compared to '{args.baseline}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,9 @@ find ./input/ -type f -exec chmod 664 {} \;
 echo "sorting directories"
 ./prepare/sort_directories.py --input-directory ./input/
 
+echo "building dataset index"
+./commands/datasetIndex.py --dataset-directory ./input/
+
 IMAGE_NAME="ghcr.io/glopix/cloreco-images/project-codenet-benchmark:latest"
 
 docker build . -t "$IMAGE_NAME"
@@ -0,0 +1,59 @@
+"""
+helper functions for the streaming converters of clone XML files (e.g. drDupXmlToCsv.py, nicadXmlToCsv.py)
+to clone pairs in the BigCloneEval CSV format.
+
+The XML files are read incrementally (iterparse), each clone is removed from memory after it was processed,
+so the memory usage does not depend on the size of the XML file.
+"""
+import sys
+import xml.etree.ElementTree as ET
+
+# size of the output buffer in bytes
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+
+def iter_clones(inputPath: str, tags=("clone",)):
+    """
+    yields the clone elements (elements with one of the tags directly below the root element) of the XML file.
+    Each clone element is cleared after it was processed.
+    """
+    depth = 0
+    root = None
+    for event, element in ET.iterparse(inputPath, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1 or element.tag not in tags:
+            continue
+
+        yield element
+
+        # the clone is not needed anymore
+        element.clear()
+        root.clear()
+
+
+def write_pairs(sources: list, out, separator: str = ",") -> None:
+    """
+    write all unique pairs of the sources of a clone, e.g.:
+    ["a,1.java,1,10", "a,2.java,5,14", "b,3.java,1,10"] ->
+        a,1.java,1,10,a,2.java,5,14
+        a,1.java,1,10,b,3.java,1,10
+        a,2.java,5,14,b,3.java,1,10
+    """
+    for i in range(len(sources) - 1):
+        prefix = sources[i] + separator
+        out.write("".join(f"{prefix}{sources[j]}\n" for j in range(i + 1, len(sources))))
+
+
+def open_output(outputPath: str):
+    """
+    open the output CSV file with a large buffer, '-' is stdout
+    """
+    if outputPath == "-":
+        return open(sys.stdout.fileno(), "w", buffering=OUTPUT_BUFFER_SIZE, closefd=False)
+    return open(outputPath, "w", buffering=OUTPUT_BUFFER_SIZE)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+converts the clone XML output of DrDup2 and DrDupLex to clone pairs in the BigCloneEval CSV format.
+
+The XML file is read incrementally, so the memory usage does not depend on the size of the XML file (see cloneXml.py).
+
+example input:
+<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<clones>
+    <clone nlines="10" similarity="100">
+        <source file="selected/1280642.java" startline="41" startcolumn="5" endline="50" endcolumn="5"/>
+        <source file="selected/551501.java" startline="46" startcolumn="5" endline="55" endcolumn="5"/>
+        <source file="selected/95284.java" startline="50" startcolumn="5" endline="59" endcolumn="5"/>
+    </clone>
+</clones>
+
+example output:
+selected,1280642.java,41,50, selected,551501.java,46,55
+selected,1280642.java,41,50, selected,95284.java,50,59
+selected,551501.java,46,55, selected,95284.java,50,59
+"""
+import argparse
+import xml.etree.ElementTree as ET
+from cloneXml import iter_clones, write_pairs, open_output
+
+
+def source_ident(source: ET.Element) -> str:
+    """
+    convert a source element to: directory,file,startline,endline
+    """
+    filePath = source.attrib["file"]
+    if "/" in filePath:
+        dir_part, file_part = filePath.rsplit("/", 1)
+    else:
+        dir_part, file_part = "", filePath
+    return f"{dir_part},{file_part},{source.attrib['startline']},{source.attrib['endline']}"
+
+
+def write_clone_pairs(inputPath: str, out) -> None:
+    """
+    write all unique source pairs of each clone
+    """
+    for clone in iter_clones(inputPath):
+        sources = [source_ident(source) for source in clone.findall("source")]
+        write_pairs(sources, out, separator=", ")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract clone source pairs from a DrDup2/DrDupLex XML file into a CSV file."
+    )
+    parser.add_argument("inputFile", help="Path to the input XML file")
+    parser.add_argument("outputFile", nargs="?", default="-", help="Path to the output CSV file (default: '-', stdout)")
+
+    args = parser.parse_args()
+    with open_output(args.outputFile) as out:
+        write_clone_pairs(args.inputFile, out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+converts the clone XML output of NiCad (clone pairs or clone classes) to clone pairs in the BigCloneEval CSV format.
+
+The XML files are read incrementally, so the memory usage does not depend on the size of the XML files (see cloneXml.py).
+The prefix (e.g. the path of the input directory) is removed from the file paths and the remaining '/' are replaced by ','.
+
+example input (clone pairs, e.g. input_functions-blind-clones-0.30.xml):
+<clones>
+<systeminfo processor="nicad6" system="input" granularity="functions-blind" threshold="30%" minlines="10" maxlines="2500"/>
+<cloneinfo npcs="3108" npairs="21"/>
+<runinfo ncompares="11034" cputime="43"/>
+<clone nlines="11" similarity="100">
+<source file="/cloneDetection/input/selected/1280642.java" startline="41" endline="51" pcid="512"></source>
+<source file="/cloneDetection/input/selected/551501.java" startline="46" endline="56" pcid="2012"></source>
+</clone>
+</clones>
+
+example input (clone classes, e.g. input_functions-blind-clones-0.30-classes.xml):
+<clones>
+<class classid="1" nclones="3" nlines="11" similarity="100">
+<source file="/cloneDetection/input/selected/1280642.java" startline="41" endline="51" pcid="512"></source>
+<source file="/cloneDetection/input/selected/551501.java" startline="46" endline="56" pcid="2012"></source>
+<source file="/cloneDetection/input/selected/95284.java" startline="50" endline="60" pcid="2771"></source>
+</class>
+</clones>
+
+example output (--strip-prefix=/cloneDetection/input/):
+selected,1280642.java,41,51,selected,551501.java,46,56
+"""
+import argparse
+import xml.etree.ElementTree as ET
+from cloneXml import iter_clones, write_pairs, open_output
+
+
+def source_ident(source: ET.Element, stripPrefix: str) -> str:
+    """
+    convert a source element to: directory,file,startline,endline (the pcid attribute is not used)
+    """
+    filePath = source.attrib["file"]
+    if stripPrefix:
+        filePath = filePath.replace(stripPrefix, "")
+    filePath = filePath.replace("/", ",")
+    return f"{filePath},{source.attrib['startline']},{source.attrib['endline']}"
+
+
+def write_clone_pairs(inputPath: str, out, stripPrefix: str) -> None:
+    """
+    write all unique source pairs of each clone pair (<clone>) or clone class (<class>)
+    """
+    for clone in iter_clones(inputPath, tags=("clone", "class")):
+        sources = [source_ident(source, stripPrefix) for source in clone.findall("source")]
+        write_pairs(sources, out)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract clone source pairs from NiCad XML files into a CSV file."
+    )
+    parser.add_argument("inputFiles", nargs="+", help="Paths to the input XML files")
+    parser.add_argument("-o", "--output", default="-", help="Path to the output CSV file (default: '-', stdout)")
+    parser.add_argument("-s", "--strip-prefix", default="", help="Prefix, which is removed from the file paths, e.g. the input directory")
+
+    args = parser.parse_args()
+    with open_output(args.output) as out:
+        for inputFile in args.inputFiles:
+            write_clone_pairs(inputFile, out, args.strip_prefix)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 # python 3.4+ required for pathlib
+import json
+import os
 import subprocess
 from configparser import ConfigParser
 from os import environ, chdir
@@ -22,6 +24,13 @@ configFile = '/cloneDetection/entrypoint.cfg'
 # verbose logging file, used for extra logging of the clone detection tool while detectClones execution
 loggingVerboseFile = 'verbose.log'
 
+# metrics of each partition executed by detectClones (JSON lines), next to the detectClones output file, e.g. NiCad.partitions.jsonl
+# only written by the detectClones commands of the python benchmarks
+partitionMetricsFileSuffix = '.partitions.jsonl'
+
+# number of the slowest partitions listed in the report file
+numSlowestPartitions = 5
+
 # sections in config file (entrypoint.cfg) for these commands
 evaluateToolSection = 'evaluateTool'
 cloneDetectionSection = 'detectClones'
@@ -196,25 +205,37 @@ class BenchmarkRunner:
         Wrapper for run_command() method:
         Runs the specified benchmark command, 
         prints the executed command with all arguments,
-        prints and saves the runtime of the command.       
+        prints and saves the runtime and resource usage of the command (including all its child processes):
+        CPU time (user/system), peak RSS (maximum resident set size of the largest process) and block I/O.
         """
         commandName = command[0].replace("./", "")
 
         startTime = time()
-        self.run_command(command, env, commandName)
+        usage = self.run_command(command, env, commandName)
         endTime = time()
 
-        # Calculate, save and print the elapsed time
+        # Calculate, save and print the elapsed time and resource usage
         elapsedTime = endTime - startTime
-        runtimeMessage = f"Runtime (s) of {commandName}: {elapsedTime:.2f}"
-        self.reportMessages.append(runtimeMessage)
-        print(runtimeMessage, flush=True)
+        messages = [
+            f"Runtime (s) of {commandName}: {elapsedTime:.2f}",
+            f"User CPU time (s) of {commandName}: {usage.ru_utime:.2f}",
+            f"System CPU time (s) of {commandName}: {usage.ru_stime:.2f}",
+            # ru_maxrss: KiB, ru_inblock/ru_oublock: blocks of 512 bytes
+            f"Peak RSS (MB) of {commandName}: {usage.ru_maxrss / 1024:.2f}",
+            f"Block input (MB) of {commandName}: {usage.ru_inblock * 512 / 1024**2:.2f}",
+            f"Block output (MB) of {commandName}: {usage.ru_oublock * 512 / 1024**2:.2f}",
+        ]
+        self.reportMessages.extend(messages)
+        print(*messages, sep="\n", flush=True)
 
 
-    def run_command(self, command, env={}, commandName=None) -> None:
+    def run_command(self, command, env={}, commandName=None):
         """
         Runs the specified benchmark command, 
         prints the executed command with all arguments.
+
+        Returns:
+            resource usage of the command and all its (waited for) child processes (see os.wait4)
         """
         if not commandName:
             if type(command) is list:  # concatenate elements of the 'command' list into a single string
@@ -228,9 +249,60 @@ class BenchmarkRunner:
         print(*command, sep=' ', flush=True)
 
         # capture_output not set --> output to stdout of caller = to docker output
-        subprocess.run(command, check=True, env=dict(environ, **env))
+        process = subprocess.Popen(command, env=dict(environ, **env))
+        # wait4 instead of wait: also returns the resource usage of this command
+        _, status, usage = os.wait4(process.pid, 0)
+        if os.WIFSIGNALED(status):
+            process.returncode = -os.WTERMSIG(status)
+        else:
+            process.returncode = os.WEXITSTATUS(status)
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command)
 
         print(f"'{commandName}' finished", flush=True)
+        return usage
+
+
+    def summarize_partition_metrics(self) -> list:
+        """
+        Summarizes the metrics of the partitions executed by detectClones (if it has written them):
+        number of partitions, runtime, throughput and the slowest partitions.
+
+        Returns:
+            messages, which will be inserted into the report file
+        """
+        metricsFile = Path(self.config.get(cloneDetectionSection, 'storage')).with_suffix(partitionMetricsFileSuffix)
+        try:
+            with open(metricsFile, 'r') as file:
+                partitions = [json.loads(line) for line in file if line.strip()]
+        except (OSError, ValueError):
+            return []
+
+        if not partitions:
+            return []
+
+        def partition_name(partition):
+            if partition.get('partition'):
+                return f"{partition['input']}/{partition['partition']}"
+            return partition['input']
+
+        failed = sum(1 for partition in partitions if partition.get('returnCode') != 0)
+        durations = [partition['duration'] for partition in partitions]
+        totalDuration = sum(durations)
+        totalBytes = sum(partition['bytes'] for partition in partitions)
+        slowest = sorted(partitions, key=lambda partition: partition['duration'], reverse=True)
+
+        messages = [
+            f"Partitions of detectClones: {len(partitions)} (failed: {failed}, clone lines: {sum(partition['lines'] for partition in partitions)})",
+            f"Partition runtime (s) of detectClones: total {totalDuration:.2f}, mean {totalDuration / len(partitions):.2f}, "
+            f"max {slowest[0]['duration']:.2f} ({partition_name(slowest[0])})",
+            f"Partition throughput (MB/s) of detectClones: {totalBytes / 1024**2 / totalDuration if totalDuration else 0:.2f}",
+        ]
+        for rank, partition in enumerate(slowest[:numSlowestPartitions], start=1):
+            messages.append(f"Slowest partition {rank} (s) of detectClones: {partition['duration']:.2f} "
+                            f"({partition_name(partition)}, {partition['files']} files, {partition['bytes'] / 1024**2:.2f} MB, "
+                            f"{partition['lines']} clone lines, return value {partition['returnCode']})")
+        return messages
 
 
     def insert_lines(self, dst, newLines, lineNumber) -> None: 
@@ -255,7 +327,8 @@ class BenchmarkRunner:
     def run(self) -> None:
         """
         Main method of this class. It runs all BigCloneEval commands (detectClones, clearClones, importClones, evaluateTool)
-        and inserts the runtime of each command in report file, which was created by evaluateTool.
+        and inserts the runtime and resource usage of each command and a summary of the partitions executed by detectClones
+        in report file, which was created by evaluateTool.
         """
         chdir(benchmarkCommandsDir)
 
@@ -271,11 +344,15 @@ class BenchmarkRunner:
 
         # run BigCloneEval commands:
         self.run_and_measure_command(self.detectClones, self.env)
+        partitionMessages = self.summarize_partition_metrics()
+        if partitionMessages:
+            self.reportMessages.extend(partitionMessages)
+            print(*partitionMessages, sep="\n", flush=True)
         #self.run_and_measure_command(self.clearClones)
         self.run_and_measure_command(self.importClones)
         self.run_and_measure_command(self.evaluateTool)
 
-        # insert messages (containing the runtime of each command) into the report file at line 4
+        # insert messages (containing the runtime and resource usage of each command) into the report file at line 4
         self.insert_lines(self.reportFile, self.reportMessages, 4)
 
 
@@ -1,47 +1,85 @@
 #!/usr/bin/env python3
+"""
+converts the clusters of Deckard (clusters/post_cluster*) to clone pairs in the BigCloneEval CSV format:
+    subFolder,fileName,startLine,endLine,subFolder,fileName,startLine,endLine
 
+Each cluster is a block of lines, separated by an empty line.
+All pairs of the functions of a cluster are written to stdout, in buffered chunks instead of one print per pair.
+"""
+import sys
 from os import environ
 from glob import glob
 
+# number of clone pairs, which are written to stdout at once
+WRITE_BUFFER_PAIRS = 65536
+
+
+def read_function_set(file: str) -> set:
+    """
+    read the functions of the BigCloneEval database (subFolder,fileName,startLine,endLine), all other functions are filtered out
+    """
+    with open(file) as f:
+        return {line.rstrip() for line in f}
+
+
+def function_ident(line: str) -> str:
+    """
+    convert a line of a Deckard cluster to the function identifier: subFolder,fileName,startLine,endLine
+    """
+    splittedLine = line.split()
+    splittedFullpath = splittedLine[3].split("/")
+    subFolder = splittedFullpath[-2]
+    fileName = splittedFullpath[-1]
+    lines = splittedLine[4].split(":")
+    startLine = int(lines[1])
+    endLine = startLine + int(lines[2]) - 1
+    return f"{subFolder},{fileName},{startLine},{endLine}"
+
+
+def cluster_pairs(parts: list):
+    """
+    yields the clone pairs of a cluster as CSV lines:
+    each function is paired with all functions after its first occurrence in the cluster
+    """
+    firstIndex = {}
+    for index, part in enumerate(parts):
+        firstIndex.setdefault(part, index)
+
+    for part in parts:
+        prefix = part + ","
+        for index in range(firstIndex[part] + 1, len(parts)):
+            yield prefix + parts[index]
+
+
+def write_pairs(parts: list, out) -> None:
+    """
+    write the clone pairs of a cluster in chunks of WRITE_BUFFER_PAIRS lines
+    """
+    buffer = []
+    for pair in cluster_pairs(parts):
+        buffer.append(pair)
+        if len(buffer) >= WRITE_BUFFER_PAIRS:
+            buffer.append("")
+            out.write("\n".join(buffer))
+            buffer = []
+    if buffer:
+        buffer.append("")
+        out.write("\n".join(buffer))
+
+
 if __name__ == "__main__":
-    filterOutput = False
+    functionSet = None
     if environ.get('BENCHMARK_NAME') == "BigCloneEval":
-        filterOutput = True
-
-    if filterOutput:
-        functionSet = set()
-        with open("Functions.txt") as f:
-            for line in f:
-                line = line.rstrip()
-                functionSet.add(line)
-    
+        functionSet = read_function_set("Functions.txt")
+
     postClusterFile = glob("../clusters/post_cluster*")[0]
     with open(postClusterFile) as f:
         parts = []
         for line in f:
             if line == "\n":
-                for part in parts:
-                    foundpart = False
-                    for part2 in parts:
-                        if foundpart:
-                            print(part + "," + part2)
-                        if part == part2:
-                            foundpart = True
+                write_pairs(parts, sys.stdout)
                 parts = []
             else:
-                line = line.rstrip()
-                splittedLine = line.split()
-                splittedFullpath = splittedLine[3].split("/")
-                subFolder = splittedFullpath[len(splittedFullpath) - 2]
-                fileName = splittedFullpath[len(splittedFullpath) - 1]
-                lines = splittedLine[4].split(":")
-                startLine = int(lines[1])
-                endLine = startLine + int(lines[2]) - 1
-                functionIdent = (
-                    subFolder + "," + fileName + "," + str(startLine) + "," + str(endLine)
-                )
-                if filterOutput:
-                    if functionIdent in functionSet:
-                        parts.append(functionIdent)
-                else:
+                functionIdent = function_ident(line.rstrip())
+                if functionSet is None or functionIdent in functionSet:
                     parts.append(functionIdent)
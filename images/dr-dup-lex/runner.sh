@@ -34,9 +34,7 @@ fi
 # redirect and append both stdout and stderr to $OUTPUT_TARGET
 java -jar target/DrDupLex-1.0-jar-with-dependencies.jar "$CONFIG_FILE"  &>> $OUTPUT_TARGET    || exit 1
 
-python3 transform-output-xml-to-csv.py drdup-output.xml drdup-output.csv
+# convert the clone XML to clone pairs and print them to stdout
+python3 /cloneDetection/converters/drDupXmlToCsv.py drdup-output.xml
 
-# print results to stdout
-cat drdup-output.csv
-
-rm drdup-output.xml drdup-output.csv
+rm drdup-output.xml
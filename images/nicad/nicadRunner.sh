@@ -32,11 +32,8 @@ fi
 #java -jar Convert.jar ${path}_functions-blind-abstract-clones/${dir}_functions-blind-abstract-clones-0.30.xml 2> $OUTPUT_TARGET
 
 shopt -s extglob
-cat "${path}"_*-clones/"${dir}"_*-clones-*+([[:digit:]]).xml | \
-    sed 's$<source file="$$g' | sed 's$" startline="$,$g' | sed 's$" endline="$,$g' | sed 's$" pcid=.*"></source>$$g' | \
-    sed 's$<clone nlines=.*$$g' | sed 's$</clone>.*$$g' | sed 's$</clones>$$g' |sed 's$<clones>$$g' | \
-    sed 's$<cloneinfo.*$$g' | sed 's$<systeminfo.*$$g' | sed 's$<runinfo.*$$g' | sed '/^$/d' | paste -d ',' - - | \
-    sed "s#${path}/##g" | sed 's#/#,#g'
+python3 /cloneDetection/converters/nicadXmlToCsv.py --strip-prefix="${path}/" \
+    "${path}"_*-clones/"${dir}"_*-clones-*+([[:digit:]]).xml    2>> $OUTPUT_TARGET    || exit 1
 
 # Cleanup
 rm -rf "${path}"_*-clones/                        &>> $OUTPUT_TARGET
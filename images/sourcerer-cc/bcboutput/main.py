@@ -1,47 +1,136 @@
 #!/usr/bin/env python3
+"""
+translates the clone pairs of SourcererCC (block IDs) to clone pairs in the BigCloneEval CSV format:
+    subFolder,fileName,startLine,endLine,subFolder,fileName,startLine,endLine
+
+The block stats (block ID -> file, start line, end line) of all blocks are kept in a compact index:
+each file path is stored once in a file table, the blocks are stored in arrays of 64-bit integers.
+The query output of SourcererCC is translated line by line and written in buffered chunks.
+"""
+import sys
+from array import array
+from bisect import bisect_right
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
 
-def readAllFunctionInfos():
-    functionDict = {}
+# number of clone pairs, which are written to stdout at once
+WRITE_BUFFER_PAIRS = 65536
+# a table block ID -> position is used, if it has less than (factor * number of blocks) entries
+MAX_TABLE_SPAN_FACTOR = 4
+
+
+class BlockIndex:
+    """
+    block ID -> (file index, start line, end line), in arrays sorted by block ID
+    files: file index -> "subFolder,fileName"
+    """
+    def __init__(self) -> None:
+        self.files = []
+        self.blockIDs = array("q")
+        self.fileIndices = array("l")
+        self.startLines = array("l")
+        self.endLines = array("l")
+        # block ID - minBlockID -> position in the arrays (-1: no block), see sort()
+        self.positions = None
+        self.minBlockID = 0
+
+    def add_file(self, subFolderName: str, fileName: str) -> None:
+        self.files.append(f"{subFolderName},{fileName}")
+
+    def add_block(self, blockID: int, startLine: int, endLine: int) -> None:
+        # blocks belong to the last added file
+        self.blockIDs.append(blockID)
+        self.fileIndices.append(len(self.files) - 1)
+        self.startLines.append(startLine)
+        self.endLines.append(endLine)
+
+    def sort(self) -> None:
+        """
+        sort the blocks by their ID (stable, the last block with the same ID is used), if they are not already sorted.
+        If the block IDs are dense (as assigned by the tokenizer), a table block ID -> position is created for direct lookups,
+        otherwise the blocks are found by binary search.
+        """
+        ids = self.blockIDs
+        if not all(ids[i] <= ids[i + 1] for i in range(len(ids) - 1)):
+            order = sorted(range(len(ids)), key=ids.__getitem__)
+            self.blockIDs    = array("q", (self.blockIDs[i] for i in order))
+            self.fileIndices = array("l", (self.fileIndices[i] for i in order))
+            self.startLines  = array("l", (self.startLines[i] for i in order))
+            self.endLines    = array("l", (self.endLines[i] for i in order))
+
+        self.positions = None
+        if self.blockIDs and self.blockIDs[-1] - self.blockIDs[0] < MAX_TABLE_SPAN_FACTOR * len(self.blockIDs):
+            self.minBlockID = self.blockIDs[0]
+            self.positions = array("l", [-1]) * (self.blockIDs[-1] - self.minBlockID + 1)
+            for position, blockID in enumerate(self.blockIDs):
+                self.positions[blockID - self.minBlockID] = position
+
+    def get(self, blockID: int) -> str|None:
+        """
+        returns the block in the BigCloneEval format: subFolder,fileName,startLine,endLine
+        """
+        if self.positions is not None:
+            offset = blockID - self.minBlockID
+            if offset < 0 or offset >= len(self.positions):
+                return None
+            position = self.positions[offset]
+            if position < 0:
+                return None
+        else:
+            position = bisect_right(self.blockIDs, blockID) - 1
+            if position < 0 or self.blockIDs[position] != blockID:
+                return None
+        return f"{self.files[self.fileIndices[position]]},{self.startLines[position]},{self.endLines[position]}"
+
+
+def readAllFunctionInfos() -> BlockIndex:
+    blockIndex = BlockIndex()
     with open(BASE_DIR.parent / "tokenizers/block-level/file_block_stats/files-stats-0.stats") as f:
-        fileName = ""
-        subFolderName = ""
         for line in f:
             line = line.rstrip()
             parts = line.split(",")
-            #print(parts)
 
             if line.startswith("f"):
                 filePath = parts[2].strip('"')
                 filePathParts = filePath.split("/")
-                
-                subFolderName = filePathParts[1]
-                fileName = filePathParts[2]
+
+                blockIndex.add_file(filePathParts[1], filePathParts[2])
             else:
-                id = parts[1]
-                startline = parts[-2]
-                endline = parts[-1]
-                functionDict[id] = f"{subFolderName},{fileName},{startline},{int(endline)+3}"
-    return functionDict
+                blockIndex.add_block(int(parts[1]), int(parts[-2]), int(parts[-1]) + 3)
+
+    blockIndex.sort()
+    return blockIndex
+
+
+def translate_clone_pairs(blockIndex: BlockIndex, queryFile: Path, out) -> None:
+    """
+    translate the clone pairs (projectA,blockA,projectB,blockB) of a query output file of SourcererCC
+    """
+    buffer = []
+    with open(queryFile) as f:
+        for line in f:
+            parts = line.rstrip().split(",")
+            one = blockIndex.get(int(parts[1]))
+            two = blockIndex.get(int(parts[3]))
+            if one is not None and two is not None:
+                buffer.append(f"{one},{two}\n")
+                if len(buffer) >= WRITE_BUFFER_PAIRS:
+                    out.write("".join(buffer))
+                    buffer = []
+    out.write("".join(buffer))
 
 
 if __name__ == "__main__":
-    functionDict = readAllFunctionInfos()
+    blockIndex = readAllFunctionInfos()
 
-    # The location of SourcererCC's output file depends on the used options, like similarity threshold 
-    # e.g. output file location: 
+    # The location of SourcererCC's output files depends on the used options, like similarity threshold
+    # and the number of nodes, e.g. output file location:
     # clone-detector/NODE_1/output7.0/query_1clones_index_WITH_FILTER.txt
-    outputDir  = BASE_DIR.parent / "clone-detector" / "NODE_1"
-    outputFile = outputDir.glob("output*/query*.txt")
-    outputFile = list(outputFile)[0]
+    outputDir = BASE_DIR.parent / "clone-detector"
+    outputFiles = sorted(outputDir.glob("NODE_*/output*/query*.txt"))
+    if not outputFiles:
+        raise FileNotFoundError(f"No SourcererCC query output found in {outputDir}")
 
-    with open(outputFile) as f:
-        for line in f:
-            line = line.rstrip()
-            parts = line.split(",")
-            one = functionDict.get(parts[1])
-            two = functionDict.get(parts[3])
-            if one is not None and two is not None:
-                print(f"{one},{two}")
+    for outputFile in outputFiles:
+        translate_clone_pairs(blockIndex, outputFile, sys.stdout)
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 import argparse
-from project.utils.Run import setupRun, executeRun
+from project.utils.Run import setupRun, executeRun, runQueue
 from project.utils.configure import configure_redis
 from project.utils.pages import run
 
@@ -14,7 +14,7 @@ The
 
 """
 
-def start(detectorToolsSpecified:list, benchmarksSpecified:list, runDir: str, runName: str):
+def start(detectorToolsSpecified:list, benchmarksSpecified:list, runDir: str, runName: str, priority: str = "normal"):
     """
     Initiates a run with specified benchmarks and clone detector tools.
 
@@ -26,6 +26,7 @@ def start(detectorToolsSpecified:list, benchmarksSpecified:list, runDir: str, ru
     Args:
         - detectorToolsSpecified (list): List of detector tools to be used and executed in this run.
         - benchmarksSpecified (list): List of benchmarks to be used and executed in this run.
+        - priority (str): Priority of this run in the queue (high, normal or low).
 
     Raises:
         ValueError: If any of the specified benchmarks or detector tools 
@@ -40,6 +41,7 @@ def start(detectorToolsSpecified:list, benchmarksSpecified:list, runDir: str, ru
 
     formData = {
         "runName" : runName,
+        "priority" : priority,
     }
 
     setup = setupRun.SetupRun(formData, cliMode=True, importDir=runDir)
@@ -78,27 +80,47 @@ def start(detectorToolsSpecified:list, benchmarksSpecified:list, runDir: str, ru
         runDirSeenFromHost = setup.runDir.relative_to("/app/")
         print(f"Run directory: {runDirSeenFromHost}")
         print(f"Run log: {runDirSeenFromHost.joinpath("run.log")}")
+        print(f"Run ID (for 'stop --run-id'): {setup.runID}")
     else:
         exit(1)
 
-def stop():
+def resume(runID: str, priority: str = "normal"):
     """
-    Stops and aborts the currently running Run.
+    Resumes a previous Run, which was aborted or failed.
+    Only the missing or failed combinations of benchmark and clone detector tool are executed again,
+    in the directory of this Run.
     """
-    msg = run.abort_run()
+    msg = setupRun.resume_run(runID, cliMode=True, priority=runQueue.get_priority(priority))
     print(msg['message'])
+    if msg['type'] != "success":
+        exit(1)
+
+def stop(runID: str = None):
+    """
+    Stops and aborts a queued or running Run.
+    If no Run ID is specified, the only queued or running Run is aborted.
+    """
+    msg = run.abort_run(runID)
+    print(msg['message'])
+    if msg['type'] != "success":
+        exit(1)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Manage Run via CLI")
-    parser.add_argument("command", choices=["start", "stop"], 
-                        help="Command to execute: start or stop a Run")
+    parser.add_argument("command", choices=["start", "stop", "resume"], 
+                        help="Command to execute: start, stop or resume a Run")
     parser.add_argument("--benchmarks", nargs='*', 
                         help="Benchmarks to execute")
     parser.add_argument("--detector-tools", nargs='*', 
                         help="Clone detector tools to execute")
     parser.add_argument("--run-name", type=str, default="", 
                         help="Name of this run")
+    parser.add_argument("--run-id", type=str, 
+                        help=("ID of the Run to resume or stop (name of its directory in data/cloneDetection/runs/), "
+                              "e.g. '2024-01-01___13-37-00_myRun'"))
+    parser.add_argument("--priority", choices=list(runQueue.priorities), default="normal",
+                        help="Priority of the Run in the queue, if other Runs are executed at the moment (default: normal)")
     parser.add_argument("--directory", type=str, 
                         help=("Path to the directory containing benchmark and detector tool configuration files. "
                           "The contents of this directory will be copied to a new directory under data/cloneDetection/runs/, "
@@ -117,9 +139,13 @@ def main():
             parser.error("--benchmarks is required when command is 'start'")
         if not args.detector_tools:
             parser.error("--detector-tools is required when command is 'start'")
-        start(list(args.detector_tools), list(args.benchmarks), args.directory, args.run_name)
+        start(list(args.detector_tools), list(args.benchmarks), args.directory, args.run_name, args.priority)
     elif args.command == "stop":
-        stop()
+        stop(args.run_id)
+    elif args.command == "resume":
+        if not args.run_id:
+            parser.error("--run-id is required when command is 'resume'")
+        resume(args.run_id, args.priority)
 
 if __name__ == "__main__":
     main()
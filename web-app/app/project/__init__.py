@@ -18,6 +18,23 @@ def celery_init_app(app: Flask) -> Celery:
     app.extensions["celery"] = celery_app
     return celery_app
 
+# celery queue of the runs (start_container_runner), consumed by a separate worker (see celery-workers.sh)
+# All other tasks (image builds of new clone detector tools, run archives) stay in the default queue 'celery',
+# so they do not wait until an executed run has finished
+runsQueue = "runs"
+
+def get_max_concurrent_runs() -> int:
+    """
+    get the maximum number of runs, which are executed at the same time,
+    from the environmental variable 'MAX_CONCURRENT_RUNS' (default: 2)
+    """
+    try:
+        maxRuns = int(os.getenv('MAX_CONCURRENT_RUNS', default="2"))
+    except ValueError:
+        print("Environment variable 'MAX_CONCURRENT_RUNS' is not an integer, using default value 2")
+        return 2
+    return max(1, maxRuns)
+
 def create_app() -> Flask:
     app = Flask(__name__)
 
@@ -27,6 +44,21 @@ def create_app() -> Flask:
             broker_url =        os.getenv('CELERY_BROKER_URL'),
             result_backend =    os.getenv('CELERY_RESULT_BACKEND'),
             task_ignore_result=True,
+            # maximum number of runs, which are executed at the same time (default: 2)
+            # the worker of the default queue is started with its own concurrency (see celery-workers.sh)
+            worker_concurrency = get_max_concurrent_runs(),
+            task_routes = {
+                'project.tasks.start_container_runner': {'queue': runsQueue},
+            },
+            # each worker process reserves only the task it executes, queued runs stay in the (priority) queue
+            worker_prefetch_multiplier = 1,
+            task_acks_late = True,
+            # priority queue: 0 = highest priority, 9 = lowest priority
+            broker_transport_options = {
+                'queue_order_strategy'  : 'priority',
+                'priority_steps'        : list(range(10)),
+                'sep'                   : ':',
+            },
         ),
     )   
 
@@ -24,6 +24,8 @@ templateFiles = dict(
     generalSection      = 'general',
     # Section in config files, where the Container config is set
     containerSection    = 'container',
+    # Section in config files, where the CPU cores and memory needed by the container are declared (optional)
+    resourcesSection    = 'resources',
     # Section in config files, where the description or defaults of the global(same for all tools) Benchmark settings are stored
     benchmarkDescriptionSection  = 'benchmark-argument-descriptions',
     benchmarkDefaultValueSection = 'benchmark-argument-defaults',
@@ -60,6 +62,49 @@ benchmarks = dict(
     evaluateToolSection      = "evaluateTool",
     detectedClonesFileExtension = ".csv",
     reportFileExtension      = ".report",
+    # metrics of the partitions executed by detectClones, written next to the detected clones file
+    partitionMetricsFileExtension = ".partitions.jsonl",
+)
+
+runs = dict(
+    # configuration of the containers and benchmarks of a run, saved in the run directory. Used to resume a run
+    configFileName           = "run.json",
+    # written to <run>/<benchmark>/<detector>/, if the container of this benchmark and detector tool finished successfully
+    completionMarkerFileName = "completed.json",
+    # time series of the resource usage (CPU, memory, block and network I/O) of the container, written to <run>/<benchmark>/<detector>/
+    containerStatsFileName   = "containerStats.csv",
+    # log entries of a run are sent to the web clients in batches (see logPublisher.py):
+    # seconds between two batches, maximum number of log entries per batch and of queued log entries (older ones are dropped)
+    logPublishInterval       = 0.5,
+    logPublishMaxBatchLines  = 500,
+    logPublishMaxQueuedLines = 10000,
+    # consecutive log entries, which differ only in numbers (e.g. progress), are displayed after this number of entries
+    # only as the number of skipped entries and the last entry
+    logPublishCoalesceAfter  = 3,
+)
+
+downloads = dict(
+    # size of the chunks, in which the files of a directory download are read and sent as zip file
+    zipChunkSize            = 1024 * 1024,
+    # deflate compression level of the files in a zip file (1: fastest - 9: smallest)
+    zipCompressionLevel     = 6,
+    # files larger than this (in bytes, e.g. clone CSV files) and already compressed files are not compressed again,
+    # if the compression method 'auto' is selected
+    zipStoreLargerThan      = 256 * 1024 * 1024,
+    zipStoredExtensions     = (".zip", ".gz", ".bz2", ".xz", ".7z", ".png", ".jpg", ".jpeg", ".gif"),
+    # number of files and directories per page of the file browser
+    pageSize                = 50,
+    # number of summary.csv files, which are kept parsed in memory by each web server process
+    summaryCacheEntries     = 16,
+)
+
+logs = dict(
+    # number of the last lines of a log file, which are displayed when the Logs page is loaded
+    initialLines            = 1000,
+    # maximum number of lines, which can be requested at once from the log API ("load older")
+    maxLines                = 10000,
+    # size of the blocks (in bytes), in which a log file is read backwards from its end
+    readBlockSize           = 64 * 1024,
 )
 
 ImageBuilder = dict(
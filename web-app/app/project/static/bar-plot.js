@@ -6,7 +6,8 @@
  is passed from the webserver as a JSON array and rendered using Plotly.js.
  
  Key Functionalities:
- 1. Data Handling: Parses the JSON data received from the webserver, 
+ 1. Data Handling: Requests the recall of each tool and clone type from the webserver
+    (JSON API of the summary.csv file, aggregated by the webserver),
     extracting unique names and types for the plot.
  2. Plot Generation: Utilizes Plotly.js to generate a grouped bar chart 
     where each group represents a clone detector tool, and each bar within 
@@ -19,8 +20,8 @@
     sizes and provides an interactive user experience.
  
  Usage:
- - The script expects a global variable 'summaryData' to be available, which 
-   should contain the data to be visualized, passed from the webserver.
+ - The script expects a global variable 'summaryUrl' to be available, which 
+   contains the URL of the summary data, passed from the webserver (null: no plot).
  - Upon loading, the script initializes the plot with all clone types 
    selected. Users can then interact with the checkboxes to filter the data.
  
@@ -33,64 +34,74 @@ document.addEventListener('DOMContentLoaded', function() {
     const plotContainer = document.getElementById('recallPlot');
     const typeSelectorsContainer = document.getElementById('cloneTypeSelectors');
 
-    if (!plotContainer || !typeSelectorsContainer) {
+    if (!plotContainer || !typeSelectorsContainer || !summaryUrl) {
         console.error('Required elements not found on the page.');
         return; 
         // Exit the script if elements are not found
     }
 
-    // extract unique names and types
-    let names = new Set(summaryData.map(d => d.Name));
-    let types = new Set(summaryData.map(d => d.Type));
+    // request only the columns needed by the plot, one row per tool and clone type
+    fetch(`${summaryUrl}?columns=Name,Type,recall&aggregate=mean`)
+    .then(response => response.json())
+    .then(summary => renderPlot(summary.rows))
+    .catch((error) => {
+        console.error('Error:', error);
+    });
 
-    // generate the plot data (x and y values, names of bars)
-    function generatePlotData(selectedTypes) {
-        let plotData = [];
-        names.forEach(name => {
-            let trace = {
-                x: [],
-                y: [],
-                name: name,
-                type: 'bar'
-            };
-            selectedTypes.forEach(type => {
-                let entry = summaryData.find(d => d.Name === name && d.Type === type);
-                if (entry) {
-                    trace.x.push(type);
-                    trace.y.push(entry.recall);
-                }
+    function renderPlot(summaryData) {
+        // extract unique names and types
+        let names = new Set(summaryData.map(d => d.Name));
+        let types = new Set(summaryData.map(d => d.Type));
+
+        // generate the plot data (x and y values, names of bars)
+        function generatePlotData(selectedTypes) {
+            let plotData = [];
+            names.forEach(name => {
+                let trace = {
+                    x: [],
+                    y: [],
+                    name: name,
+                    type: 'bar'
+                };
+                selectedTypes.forEach(type => {
+                    let entry = summaryData.find(d => d.Name === name && d.Type === type);
+                    if (entry) {
+                        trace.x.push(type);
+                        trace.y.push(entry.recall);
+                    }
+                });
+                plotData.push(trace);
             });
-            plotData.push(trace);
-        });
-        return plotData;
-    }
+            return plotData;
+        }
 
-    // layout settings
-    var layout = {
-        title: 'Recall comparison by clone type for different clone detector tools',
-        xaxis: { title: 'Clone Type' },
-        yaxis: { title: 'Recall' },
-        barmode: 'group'
-    };
+        // layout settings
+        var layout = {
+            title: 'Recall comparison by clone type for different clone detector tools',
+            xaxis: { title: 'Clone Type' },
+            yaxis: { title: 'Recall' },
+            barmode: 'group'
+        };
 
-    // Initial plot
-    Plotly.newPlot(plotContainer, generatePlotData(Array.from(types)), layout);
+        // Initial plot
+        Plotly.newPlot(plotContainer, generatePlotData(Array.from(types)), layout);
 
-    // create checkboxes for each clone type
-    let typeSelectorsDiv = document.getElementById('cloneTypeSelectors');
-    types.forEach(type => {
-        let checkbox = document.createElement('input');
-        checkbox.type = 'checkbox';
-        checkbox.id = type;
-        checkbox.checked = true;
-        checkbox.onchange = () => {
-            let selectedTypes = Array.from(types).filter(t => document.getElementById(t).checked);
-            Plotly.newPlot('recallPlot', generatePlotData(selectedTypes), layout);
-        };
-        let label = document.createElement('label');
-        label.htmlFor = type;
-        label.appendChild(document.createTextNode(type));
-        typeSelectorsDiv.appendChild(checkbox);
-        typeSelectorsDiv.appendChild(label);
-    });
+        // create checkboxes for each clone type
+        let typeSelectorsDiv = document.getElementById('cloneTypeSelectors');
+        types.forEach(type => {
+            let checkbox = document.createElement('input');
+            checkbox.type = 'checkbox';
+            checkbox.id = type;
+            checkbox.checked = true;
+            checkbox.onchange = () => {
+                let selectedTypes = Array.from(types).filter(t => document.getElementById(t).checked);
+                Plotly.newPlot('recallPlot', generatePlotData(selectedTypes), layout);
+            };
+            let label = document.createElement('label');
+            label.htmlFor = type;
+            label.appendChild(document.createTextNode(type));
+            typeSelectorsDiv.appendChild(checkbox);
+            typeSelectorsDiv.appendChild(label);
+        });
+    }
 });
@@ -13,8 +13,38 @@ document.addEventListener('DOMContentLoaded', function() {
         while (logs.firstChild) {
             logs.removeChild(logs.firstChild);
         }
+        // a new log file is written, older log entries belong to the previous run or image build
+        logOffset = 0;
+        loadOlderLogs.classList.add("hidden");
     }
 
+    // request the log entries before the first displayed log entry from the log API
+    // and insert them at the top of the log terminal
+    const loadOlderLogs = document.getElementById("load-older-logs");
+    function load_older_logs() {
+        if (!logOffset) {
+            return
+        }
+        fetch(`${logApiUrl}?before=${logOffset}`)
+            .then(response => response.json())
+            .then(data => {
+                const logs = document.getElementById("log-terminal");
+                const firstEntry = logs.firstChild;
+                data.lines.forEach(line => {
+                    const logEntry = document.createElement("p");
+                    logEntry.innerHTML = line;
+                    colorize_element(logEntry);
+                    logs.insertBefore(logEntry, firstEntry);
+                });
+                logOffset = data.offset;
+                if (!logOffset) {
+                    loadOlderLogs.classList.add("hidden");
+                }
+            })
+            .catch(error => console.error('Error:', error));
+    }
+    loadOlderLogs.addEventListener('click', load_older_logs);
+
     // colorize a HTML element (designed for logEntry paragraphs)
     function colorize_element(element) {
         if (!element.innerHTML.includes('|')) {
@@ -58,6 +88,15 @@ document.addEventListener('DOMContentLoaded', function() {
         logs.appendChild(logEntry);
     }
 
+    // append a new message or a batch of messages (list, see logPublisher.py) to the log shown on the website
+    function display_log_entries(msg) {
+        if (Array.isArray(msg)) {
+            msg.forEach(display_log_entry);
+        } else {
+            display_log_entry(msg);
+        }
+    }
+
     // colorize log entries which have been generated prior to the current page load
     function colorize_past_logs() {
         const logs = document.getElementById("log-terminal");
@@ -139,7 +178,7 @@ document.addEventListener('DOMContentLoaded', function() {
             progress = progressUpdate;
         }
 
-        if (['running', 'finished', 'startup'].includes(progressUpdate.status)) {
+        if (['queued', 'running', 'finished', 'startup'].includes(progressUpdate.status)) {
             // add imaginary extra steps to the progress bar calculation as long as the run is not finished
             let extraSteps = 1;
             if(progressUpdate.status === "finished" ){
@@ -289,7 +328,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const SSE_eventSources = [];
     // Server-sent events of current container status logs
     // current container status logs: log entries, stdout from the container
-    let SSE_logs = initialize_event_source(logsChannel, 'logs', display_log_entry);
+    let SSE_logs = initialize_event_source(logsChannel, 'logs', display_log_entries);
     SSE_eventSources.push(SSE_logs);
 
     // Server-sent events of current container execution progress
@@ -316,5 +355,24 @@ document.addEventListener('DOMContentLoaded', function() {
 
     colorize_past_logs();
 
+    // cancel the run, whose logs are displayed
+    const cancelRunButton = document.getElementById("cancel-run");
+    if (cancelRunButton) {
+        cancelRunButton.addEventListener('click', function() {
+            if (!confirm("Cancel this run?")) {
+                return;
+            }
+            fetch(this.getAttribute('data-action'))
+                .then(response => response.json())
+                .then(data => {
+                    alert(data.message);
+                    if (data.type === "success") {
+                        cancelRunButton.classList.add('pure-button-disabled');
+                    }
+                })
+                .catch(error => console.error('Error:', error));
+        });
+    }
+
 });
 
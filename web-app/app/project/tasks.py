@@ -5,28 +5,47 @@ from pathlib import Path
 from project.utils.Run.executeRun import ExecuteRun
 from project.utils.ImageBuilder.ImageBuilder import ImageBuilder
 from project.utils.pages import run as Run
+from project.utils.Run.runQueue import get_run_key, is_active
+from project.utils.Run import runArchives
+from project.utils.configure import configure_redis
 
-# abort run if this celery worker gets shut down (SIGINT)
+# abort executed runs if this celery worker gets shut down (SIGINT)
 @worker_shutting_down.connect
 def worker_shutting_down_handler(sig, how, exitcode, ** kwargs):
-    msg = Run.abort_run()
-    print(msg)
+    for msg in Run.abort_all_runs():
+        print(msg)
 
 
 # this method will be part of the base class 'ExecuteRun'
 # and will be exectued as a task in a separate celery process.
 # This task will execute a run (prepare and start the clone detector tool containers)
 @shared_task(bind=True, base=ExecuteRun)
-def start_container_runner(self, containerConfigs: list[dict], runDir: str|Path, benchmarks: list[dict]) -> None:
+def start_container_runner(self, containerConfigs: list[dict], runDir: str|Path, benchmarks: list[dict], resume: bool = False) -> None:
     try:
-        self.run(containerConfigs, runDir, benchmarks)
+        self.run(containerConfigs, runDir, benchmarks, resume)
     except Exception as exc:
         self.log.critical("Error in Celery container runner:")
         self.log.critical(exc)
-        self.redis.set("run.status", "failed")
+        self.redis.set(get_run_key(Path(runDir).name, "status"), "failed")
         raise exc
 
 
+# This task creates the zip archive of a run (see runArchives.py) in a separate celery process,
+# after the run has ended or if the run directory has changed since the archive was created.
+@shared_task
+def build_run_archive_task(runDir: str) -> None:
+    redis = configure_redis()
+    runID = Path(runDir).name
+    try:
+        # the run was deleted or resumed in the meantime (a resumed run requests its archive again at its end)
+        if not Path(runDir).is_dir() or is_active(redis, runID):
+            return
+        if not runArchives.archive_is_current(runDir):
+            runArchives.build_run_archive(runDir)
+    finally:
+        redis.delete(get_run_key(runID, "archive"))
+
+
 # this method will be part of the base class 'ImageBuilder'
 # and will be exectued as a task in a separate celery process.
 # It is used to build an container image based on given git repository 
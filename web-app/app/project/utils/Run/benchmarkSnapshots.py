@@ -0,0 +1,222 @@
+"""
+The Class in this file is used to provide the benchmark dataset (clone files) to the clone detector tool containers,
+without copying the whole dataset into a new volume for each container.
+
+For each benchmark image, a "golden" volume is populated once with the benchmark dataset and kept between runs.
+Each clone detector tool container gets a copy-on-write clone of this golden volume:
+an overlay volume, which uses the golden volume as (read only) lower layer and a small scratch volume for all changes.
+This way, no detector tool can modify the golden volume and all detector tools get the same, unmodified benchmark dataset.
+
+The golden volume of a benchmark is identified by the ID (digest) of the benchmark image.
+If the benchmark image changes (e.g. new image pulled), a new golden volume is created and the outdated one is removed.
+If multiple docker hosts are used (see dockerHosts.py), each docker host has its own golden volumes.
+"""
+import docker
+from redis.exceptions import LockError
+from threading import Thread, Event
+from types import SimpleNamespace
+
+# labels of the volumes created by this class
+benchmarkLabel  = "cloreco.benchmark"
+imageLabel      = "cloreco.benchmark.image"
+goldenLabel     = "cloreco.benchmark.golden"
+# redis set, which contains the names of all completely populated golden volumes (of the local docker host)
+goldenVolumesKey = "benchmark.golden_volumes"
+
+# the lock of a golden volume (see get_golden_volume) expires after lockTimeout seconds, e.g. if the worker was killed.
+# While the golden volume is populated, the lock is extended every lockExtendInterval seconds.
+lockTimeout         = 60
+lockExtendInterval  = 20
+# maximum time (in seconds) to wait until another run has populated the golden volume
+lockBlockingTimeout = 6 * 3600
+
+
+class BenchmarkSnapshots:
+
+    def __init__(self, dockerClient, redis, log, dockerHostName: str = "local"):
+        self.dockerClient = dockerClient
+        self.redis = redis
+        self.log = log
+
+        # the golden volumes of other docker hosts are stored in separate sets
+        self.goldenVolumesKey = goldenVolumesKey
+        if dockerHostName != "local":
+            self.goldenVolumesKey = f"{goldenVolumesKey}.{dockerHostName}"
+
+
+    def get_image_id(self, image: str) -> str:
+        """
+        returns the ID of the benchmark image, the image will be pulled if it does not exist yet
+        """
+        try:
+            return self.dockerClient.images.get(image).id
+        except docker.errors.ImageNotFound:
+            self.log.info(f"pulling benchmark image '{image}'")
+            return self.dockerClient.images.pull(image).id
+
+
+    def get_golden_volume(self, benchmark: dict):
+        """
+        returns the golden volume of the benchmark, containing the benchmark dataset of the current benchmark image.
+        The golden volume is created and populated, if it does not exist yet.
+        """
+        image = benchmark["container"]["image"]
+        imageID = self.get_image_id(image)
+        volumeName = f"cloreco_golden_{benchmark['name']}_{imageID.removeprefix('sha256:')[:12]}"
+
+        # only one thread/run at a time may create the golden volume of a benchmark
+        lock = self.redis.lock(f"{self.goldenVolumesKey}.lock.{benchmark['name']}", timeout=lockTimeout, blocking_timeout=lockBlockingTimeout)
+        if not lock.acquire():
+            raise RuntimeError(f"benchmark volume of benchmark '{benchmark['name']}' is still created by another run after {lockBlockingTimeout} seconds")
+
+        # the population of the golden volume may take longer than lockTimeout
+        stopExtending = Event()
+        Thread(target=self.extend_lock, args=(lock, stopExtending), daemon=True).start()
+        try:
+            if self.redis.sismember(self.goldenVolumesKey, volumeName):
+                try:
+                    return self.dockerClient.volumes.get(volumeName)
+                except docker.errors.NotFound:
+                    self.redis.srem(self.goldenVolumesKey, volumeName)
+
+            self.remove_outdated_golden_volumes(benchmark, volumeName)
+            return self.create_golden_volume(benchmark, volumeName, imageID)
+        finally:
+            stopExtending.set()
+            try:
+                lock.release()
+            except LockError:
+                # the lock expired (e.g. the connection to redis was lost while extending it)
+                pass
+
+
+    def extend_lock(self, lock, stopExtending: Event) -> None:
+        """
+        every lockExtendInterval seconds reset the expiry of the lock to lockTimeout seconds, until stopExtending is set
+        """
+        while not stopExtending.wait(lockExtendInterval):
+            try:
+                lock.extend(lockTimeout, replace_ttl=True)
+            except Exception as e:
+                self.log.warning(f"the lock of the benchmark volume could not be extended: {e}")
+                return
+
+
+    def create_golden_volume(self, benchmark: dict, volumeName: str, imageID: str):
+        """
+        create the golden volume and populate it with the benchmark dataset
+        by starting the benchmark container with this (empty) volume
+        """
+        self.log.info(f"creating benchmark volume for benchmark '{benchmark['general']['pretty_name']}'")
+        self.log.trace(f"This might take a while, since the entire benchmark dataset is copied into a volume. This is only done once per benchmark image")
+
+        # remove a partially populated volume (e.g. if the previous population was interrupted)
+        self.remove_volume(volumeName)
+
+        labels = {
+            benchmarkLabel  : benchmark["name"],
+            imageLabel      : imageID,
+        }
+        volume = self.dockerClient.volumes.create(name=volumeName, labels=labels)
+
+        try:
+            self.dockerClient.containers.run(
+                image               = imageID,
+                volumes             = {volume.name: {'bind': benchmark["container"]["benchmark_path"], 'mode': 'rw'}},
+                network_disabled    = True,
+                remove              = True
+            )
+        except Exception:
+            self.remove_volume(volumeName)
+            raise
+
+        self.redis.sadd(self.goldenVolumesKey, volumeName)
+        return volume
+
+
+    def remove_outdated_golden_volumes(self, benchmark: dict, currentVolumeName: str) -> None:
+        """
+        remove the golden volumes of outdated images of the benchmark,
+        if they are not used by clones anymore (e.g. of another run)
+        """
+        outdatedVolumes = self.dockerClient.volumes.list(filters={"label": f"{benchmarkLabel}={benchmark['name']}"})
+
+        for volume in outdatedVolumes:
+            if volume.name == currentVolumeName:
+                continue
+            if self.dockerClient.volumes.list(filters={"label": f"{goldenLabel}={volume.name}"}):
+                continue
+
+            self.log.trace(f"removing outdated benchmark volume '{volume.name}'")
+            self.redis.srem(self.goldenVolumesKey, volume.name)
+            self.remove_volume(volume.name)
+
+
+    def create_clone(self, benchmark: dict, goldenVolume, volumeName: str) -> SimpleNamespace:
+        """
+        create a copy-on-write clone of the golden volume:
+        an overlay volume with the golden volume as lower layer and the directories of a new scratch volume as upper and work layer.
+
+        Returns:
+            SimpleNamespace with
+            - volume: the overlay volume (mount in clone detector tool container)
+            - scratchVolume: the volume containing all changes of the clone detector tool
+        """
+        image = goldenVolume.attrs["Labels"][imageLabel]
+        labels = {goldenLabel: goldenVolume.name}
+
+        scratchVolume = self.dockerClient.volumes.create(name=f"{volumeName}_scratch", labels=labels)
+        clone = SimpleNamespace(volume=None, scratchVolume=scratchVolume)
+
+        try:
+            self._create_overlay(clone, image, volumeName, goldenVolume, labels)
+        except Exception:
+            self.remove_volume(volumeName)
+            self.remove_volume(scratchVolume.name)
+            raise
+
+        return clone
+
+
+    def _create_overlay(self, clone: SimpleNamespace, image: str, volumeName: str, goldenVolume, labels: dict) -> None:
+        scratchVolume = clone.scratchVolume
+
+        # the directories of the overlay mount have to exist
+        self.dockerClient.containers.run(
+            image               = image,
+            entrypoint          = ["mkdir", "-p", "/scratch/upper", "/scratch/work"],
+            volumes             = {scratchVolume.name: {'bind': '/scratch', 'mode': 'rw'}},
+            network_disabled    = True,
+            remove              = True
+        )
+
+        lowerDir = goldenVolume.attrs["Mountpoint"]
+        scratchDir = scratchVolume.attrs["Mountpoint"]
+
+        clone.volume = self.dockerClient.volumes.create(
+            name        = volumeName,
+            driver      = "local",
+            driver_opts = {
+                "type"      : "overlay",
+                "device"    : "overlay",
+                "o"         : f"lowerdir={lowerDir},upperdir={scratchDir}/upper,workdir={scratchDir}/work"
+            },
+            labels      = labels
+        )
+
+        # the overlay is mounted, when the volume is used by a container for the first time
+        # ensure it can be mounted on this docker host (e.g. not possible with rootless docker)
+        self.dockerClient.containers.run(
+            image               = image,
+            entrypoint          = ["ls", "/benchmark"],
+            volumes             = {clone.volume.name: {'bind': '/benchmark', 'mode': 'ro'}},
+            network_disabled    = True,
+            remove              = True
+        )
+
+
+    def remove_volume(self, volumeName: str) -> None:
+        try:
+            self.dockerClient.volumes.get(volumeName).remove(force=True)
+        except docker.errors.NotFound:
+            pass
@@ -0,0 +1,211 @@
+"""
+The Class in this file is used to record the resource usage of a clone detector tool container while it is executed.
+
+A background thread reads the stats of the container (docker stats) at a fixed interval
+and appends one row per sample to a CSV file in <run>/<benchmark>/<detector>/, e.g.:
+    Time (s),CPU (%),Memory (MB),Block Input (MB),Block Output (MB),Network Input (MB),Network Output (MB),PIDs
+    5.0,198.41,1432.7,12.3,0.1,0.0,0.0,38
+    10.0,201.05,2210.4,12.3,40.8,0.0,0.0,38
+
+A summary of the samples so far (peak memory, mean and maximum CPU usage) is passed to a callback after each sample,
+e.g. to publish it to the web clients via server-sent events.
+"""
+import csv
+from pathlib import Path
+from threading import Thread, Event
+from time import monotonic
+import docker
+import requests.exceptions
+
+# columns of the time series file
+statsColumns = [
+    "Time (s)",
+    "CPU (%)",
+    "Memory (MB)",
+    "Block Input (MB)",
+    "Block Output (MB)",
+    "Network Input (MB)",
+    "Network Output (MB)",
+    "PIDs",
+]
+
+MB = 1024 * 1024
+
+
+def get_cpu_percent(stats: dict) -> float:
+    """
+    CPU usage of the container since the previous stats of the docker daemon (precpu_stats) in percent of one CPU core,
+    e.g. 200.0 = two fully used CPU cores (calculated the same way as 'docker stats')
+    """
+    cpuStats = stats.get("cpu_stats", {})
+    preCpuStats = stats.get("precpu_stats", {})
+
+    cpuDelta = cpuStats.get("cpu_usage", {}).get("total_usage", 0) - preCpuStats.get("cpu_usage", {}).get("total_usage", 0)
+    systemDelta = cpuStats.get("system_cpu_usage", 0) - preCpuStats.get("system_cpu_usage", 0)
+    onlineCPUs = cpuStats.get("online_cpus") or len(cpuStats.get("cpu_usage", {}).get("percpu_usage") or []) or 1
+
+    if cpuDelta <= 0 or systemDelta <= 0:
+        return 0.0
+    return cpuDelta / systemDelta * onlineCPUs * 100
+
+
+def get_memory_usage(stats: dict) -> int:
+    """
+    memory usage of the container in bytes, without the inactive page cache (calculated the same way as 'docker stats')
+    """
+    memoryStats = stats.get("memory_stats", {})
+    usage = memoryStats.get("usage", 0)
+    details = memoryStats.get("stats", {})
+    # cgroup v2: 'inactive_file', cgroup v1: 'total_inactive_file'
+    inactiveFile = details.get("inactive_file", details.get("total_inactive_file", 0))
+    if inactiveFile < usage:
+        usage -= inactiveFile
+    return usage
+
+
+def get_block_io(stats: dict) -> tuple[int, int]:
+    """
+    read and written bytes of all block devices of the container
+    """
+    read = written = 0
+    for entry in stats.get("blkio_stats", {}).get("io_service_bytes_recursive") or []:
+        # cgroup v1: 'Read'/'Write', cgroup v2: 'read'/'write'
+        operation = entry.get("op", "").lower()
+        if operation == "read":
+            read += entry.get("value", 0)
+        elif operation == "write":
+            written += entry.get("value", 0)
+    return read, written
+
+
+def get_network_io(stats: dict) -> tuple[int, int]:
+    """
+    received and transmitted bytes of all network interfaces of the container (none, if the network is disabled)
+    """
+    received = transmitted = 0
+    for interface in (stats.get("networks") or {}).values():
+        received += interface.get("rx_bytes", 0)
+        transmitted += interface.get("tx_bytes", 0)
+    return received, transmitted
+
+
+def parse_stats(stats: dict, elapsed: float) -> list|None:
+    """
+    convert the stats of the docker daemon to a row of the time series file (see statsColumns),
+    None if the stats are empty (the container is not running (anymore))
+    """
+    if not stats.get("memory_stats"):
+        return None
+
+    blockRead, blockWritten = get_block_io(stats)
+    networkReceived, networkTransmitted = get_network_io(stats)
+
+    return [
+        round(elapsed, 1),
+        round(get_cpu_percent(stats), 2),
+        round(get_memory_usage(stats) / MB, 1),
+        round(blockRead / MB, 1),
+        round(blockWritten / MB, 1),
+        round(networkReceived / MB, 1),
+        round(networkTransmitted / MB, 1),
+        stats.get("pids_stats", {}).get("current", 0),
+    ]
+
+
+class ContainerStatsSampler:
+    """
+    samples the stats of a container at a fixed interval in a background thread, until stop() is called
+    or the container has stopped
+    """
+
+    def __init__(self, container, statsFile: Path, interval: float, onSample=None, log=None):
+        self.container = container
+        self.statsFile = Path(statsFile)
+        self.interval = interval
+        # called with the summary (see get_summary) after each sample
+        self.onSample = onSample
+        self.log = log
+
+        self.stopSampling = Event()
+        self.thread = Thread(target=self.sample_stats, daemon=True)
+
+        self.numSamples = 0
+        self.cpuTotal = 0.0
+        self.cpuMax = 0.0
+        self.memoryPeak = 0.0
+        self.lastRow = None
+
+
+    def start(self) -> None:
+        self.thread.start()
+
+
+    def stop(self) -> dict:
+        """
+        stop sampling, wait for the last sample to be written and return the summary of all samples
+        """
+        self.stopSampling.set()
+        # reading the stats of a container takes up to ~2 seconds (the docker daemon waits for a second CPU sample)
+        self.thread.join(timeout=self.interval + 5)
+        return self.get_summary()
+
+
+    def get_summary(self) -> dict:
+        summary = {
+            "samples"           : self.numSamples,
+            "peakMemory (MB)"   : self.memoryPeak,
+            "meanCPU (%)"       : round(self.cpuTotal / self.numSamples, 2) if self.numSamples else 0.0,
+            "maxCPU (%)"        : self.cpuMax,
+        }
+        if self.lastRow:
+            summary.update(dict(zip(statsColumns, self.lastRow)))
+        return summary
+
+
+    def add_sample(self, row: list) -> None:
+        self.numSamples += 1
+        self.cpuTotal += row[1]
+        self.cpuMax = max(self.cpuMax, row[1])
+        self.memoryPeak = max(self.memoryPeak, row[2])
+        self.lastRow = row
+
+
+    def sample_stats(self) -> None:
+        start = monotonic()
+        nextSample = start
+
+        try:
+            with open(self.statsFile, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(statsColumns)
+
+                while not self.stopSampling.wait(max(0.0, nextSample - monotonic())):
+                    nextSample += self.interval
+
+                    try:
+                        stats = self.container.stats(stream=False)
+                    except docker.errors.NotFound:
+                        return
+                    except (docker.errors.APIError, requests.exceptions.RequestException) as exc:
+                        if self.log:
+                            self.log.debug(f"Failed to read the stats of container '{self.container.name}': {exc}")
+                        continue
+
+                    row = parse_stats(stats, monotonic() - start)
+                    if row is None:
+                        return
+
+                    self.add_sample(row)
+                    writer.writerow(row)
+                    # the time series can be read while the container is executed
+                    file.flush()
+
+                    if self.onSample:
+                        self.onSample(self.get_summary())
+
+                    # skip samples, if reading the stats took longer than the interval
+                    if nextSample < monotonic():
+                        nextSample = monotonic()
+        except OSError as exc:
+            if self.log:
+                self.log.error(f"Failed to write the stats of container '{self.container.name}' to '{self.statsFile}': {exc}")
@@ -0,0 +1,117 @@
+"""
+functions in this file are used to connect to the docker hosts, which execute the clone detector tool containers.
+
+By default, all containers are executed on the docker host of this celery container ('local').
+Additional docker hosts (e.g. other machines with a docker daemon reachable via tcp or ssh) can be specified
+in the environmental variable 'DOCKER_HOSTS' as comma separated list of '<name>=<docker base URL>' entries, e.g.:
+
+    DOCKER_HOSTS: "local, node1=tcp://192.168.0.11:2375, node2=ssh://cloreco@192.168.0.12"
+
+The list can also be stored in the redis hash 'docker.hosts' (name -> base URL), which overrides the environmental variable
+and is read at the start of each run, e.g.:
+
+    redis-cli HSET docker.hosts local local node1 tcp://192.168.0.11:2375
+
+Containers are executed on whichever docker host has enough resources available (see ResourceScheduler).
+Only containers on the 'local' docker host can mount the run directory,
+the files of containers on all other docker hosts are copied into the container before it is started
+and the result files are copied back into the run directory after the container finished.
+"""
+import docker
+from os import environ
+from types import SimpleNamespace
+
+# name of the docker host of this celery container
+localHostName = "local"
+# redis hash, containing the docker hosts (name -> base URL), overrides the environmental variable 'DOCKER_HOSTS'
+dockerHostsKey = "docker.hosts"
+
+
+def parse_docker_hosts(value: str) -> dict[str, str]:
+    """
+    convert the value of the environmental variable 'DOCKER_HOSTS' to a dict of docker hosts (name -> base URL), e.g.:
+    "local, node1=tcp://192.168.0.11:2375" -> {"local": "local", "node1": "tcp://192.168.0.11:2375"}
+    A host without name is named after its base URL.
+    """
+    hosts = {}
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+
+        name, separator, url = entry.partition("=")
+        if not separator:
+            name, url = entry, entry
+        name, url = name.strip(), url.strip()
+
+        if not name or not url:
+            raise ValueError(f"Invalid docker host '{entry}' in 'DOCKER_HOSTS'. Use '<name>=<docker base URL>', e.g. 'node1=tcp://192.168.0.11:2375'")
+        if name in hosts:
+            raise ValueError(f"The docker host name '{name}' is used multiple times in 'DOCKER_HOSTS'")
+        hosts[name] = url
+
+    return hosts
+
+
+def get_docker_hosts(redis) -> dict[str, str]:
+    """
+    returns the docker hosts (name -> base URL), which execute the clone detector tool containers:
+    from the redis hash 'docker.hosts', the environmental variable 'DOCKER_HOSTS' or only the local docker host (default)
+    """
+    hosts = redis.hgetall(dockerHostsKey)
+    if hosts:
+        return hosts
+
+    hosts = parse_docker_hosts(environ.get('DOCKER_HOSTS', default=localHostName))
+    if not hosts:
+        hosts = {localHostName: localHostName}
+    return hosts
+
+
+def connect_docker_host(name: str, url: str, maxPoolSize: int) -> SimpleNamespace:
+    """
+    create a docker client for the docker host
+
+    Returns:
+        SimpleNamespace with
+        - name: name of the docker host
+        - url: docker base URL of the docker host ('local' for the docker host of this celery container)
+        - client: docker client
+        - isLocal: the run directory can be mounted into the containers on this docker host
+        - benchmarkSnapshots: provides the benchmark volumes on this docker host (set by ExecuteRun)
+    """
+    # each container executed at the same time needs multiple connections (waiting, log streaming)
+    if url == localHostName:
+        client = docker.from_env(timeout=300, max_pool_size=maxPoolSize)
+    else:
+        client = docker.DockerClient(base_url=url, timeout=300, max_pool_size=maxPoolSize)
+
+    # ensure the docker host is reachable
+    client.ping()
+
+    return SimpleNamespace(
+        name                = name,
+        url                 = url,
+        client              = client,
+        isLocal             = url == localHostName,
+        benchmarkSnapshots  = None
+    )
+
+
+def connect_docker_hosts(redis, log, maxPoolSize: int) -> list[SimpleNamespace]:
+    """
+    connect to all docker hosts, which execute the clone detector tool containers.
+    Unreachable docker hosts are skipped, an error is raised if no docker host is reachable.
+    """
+    hosts = []
+    for name, url in get_docker_hosts(redis).items():
+        try:
+            hosts.append(connect_docker_host(name, url, maxPoolSize))
+        # connection errors of the requests library are OSErrors
+        except (docker.errors.DockerException, OSError) as exc:
+            log.warning(f"docker host '{name}' ({url}) is not reachable and will not be used in this run: {exc}")
+
+    if not hosts:
+        raise ConnectionError("None of the docker hosts, which execute the clone detector tool containers, is reachable")
+
+    return hosts
@@ -11,59 +11,146 @@ from flask_sse import sse
 from loguru import logger as log
 from types import SimpleNamespace
 from pathlib import Path
-from os import chdir
 import project.utils.configFilesParser.configParserFiles as cp
 import project.settings as settings
 import socket
-from shutil import make_archive
+from shutil import copyfileobj
+import tarfile
+from io import BytesIO
+from tempfile import TemporaryFile
 from project.utils.configure import configure_redis
 import requests.exceptions
-from threading import Thread, Event
-from time import sleep
+from threading import Thread, Event, Lock
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from os import environ
+from time import sleep, time
 from flask import current_app
 from project.utils.Run import toolStatistics
+from project.utils.Run.resourceScheduler import ResourceScheduler, parse_resources, parse_memory
+from project.utils.Run.benchmarkSnapshots import BenchmarkSnapshots
+from project.utils.Run.dockerHosts import connect_docker_hosts
+from project.utils.Run import runCheckpoints
+from project.utils.Run.runArchives import request_run_archive
+from project.utils.Run.runSizes import update_run_sizes
+from project.utils.Run.containerStats import ContainerStatsSampler
+from project.utils.Run.logPublisher import LogPublisher
+from project.utils.Run.runQueue import get_run_key, remove_active_run
 from project.utils.utils import convert_to_image_name
 
 class ExecuteRun(AbortableTask):
 
-    def __call__(self, containerConfigs: list[dict], runDir: str|Path, benchmarks: list[dict]) -> None:
+    def __call__(self, containerConfigs: list[dict], runDir: str|Path, benchmarks: list[dict], resume: bool = False) -> None:
         runDir = Path(runDir)
         self.runDir = runDir
         self.runID = runDir.name
+        # resume a previous run: skip all combinations of benchmark and clone detector tool, which have already been completed
+        self.resume = resume
 
         self.containerConfigs = containerConfigs
         # sort the list of benchmark dictionaries by the 'name' key
         self.benchmarks = sorted(benchmarks, key=lambda x: x['name'])
 
-        self.archiveName = self.runID
+
+        self.redis = configure_redis()
+
+        # the run was aborted while it was queued (or it was already executed by another worker): skip it
+        if self.is_aborted() or self.redis.get(get_run_key(self.runID, "status")) != "queued":
+            print(f"Run '{self.runID}' is not queued anymore (aborted while it was queued?): skipped")
+            return
+
+        self.redis.set(get_run_key(self.runID, "status"), "started")
+
+        # server-sent events channels of this run
+        self.sseChannels = SimpleNamespace(
+            logs        = f"run_{self.runID}_logs",
+            progress    = f"run_{self.runID}_progress",
+            heartbeats  = f"run_{self.runID}_heartbeats",
+            stats       = f"run_{self.runID}_stats"
+        )
 
         self.configure_logging()
 
-        self.redis = configure_redis()
-        # set current run id, task id, directory and log file location in database
-        self.redis.set('run.id', str(self.runID))
-        self.redis.set('run.task.id', self.request.id)
-        self.redis.set('run.directory', str(self.runDir))
-        self.redis.set("run.log", str(self.logFile))
+        # set task id, directory and log file location of this run in database
+        self.redis.set(get_run_key(self.runID, 'task.id'), self.request.id)
+        self.redis.set(get_run_key(self.runID, 'directory'), str(self.runDir))
+        self.redis.set(get_run_key(self.runID, 'log'), str(self.logFile))
 
-        # Create a Docker client
-        self.dockerClient = docker.from_env(timeout=300)
+        try:
+            self.setup()
+            self.startup_check()
+        except Exception as exc:
+            self.startup_failure(exc)
+            raise
 
-        self.currentAppContext = current_app.app_context()
+        # Call the main task logic
+        self.start()
 
-        # host path to the current run directory
-        self.hostRunPath = self.get_host_data_path() / "cloneDetection" / "runs" / self.runID
+
+    def setup(self) -> None:
+        """
+        create the docker client, the resource scheduler and the state shared between the threads executing the containers
+        """
+        # maximum number of clone detector tool containers, which are executed at the same time on each docker host (of all runs)
+        self.maxParallelContainers = self.get_max_parallel_containers()
+        # seconds between two samples of the resource usage of each container (0: no sampling)
+        self.containerStatsInterval = self.get_container_stats_interval()
+
+        # Create a Docker client for each docker host, which executes the clone detector tool containers (see dockerHosts.py)
+        # each container executed at the same time needs multiple connections (waiting, log streaming)
+        dockerHosts = connect_docker_hosts(self.redis, self.log, maxPoolSize=max(10, 3 * self.maxParallelContainers))
+        self.dockerHosts = {dockerHost.name: dockerHost for dockerHost in dockerHosts}
+
+        # reserves the declared CPU cores and memory of each container on one of the docker hosts (shared with other runs)
+        self.resourceScheduler = ResourceScheduler(dockerHosts, self.redis, self.runID, self.maxParallelContainers, self.get_reserved_host_memory())
+
+        # provides copy-on-write clones of a pre-populated benchmark volume to the containers on each docker host,
+        # None: copy the benchmark dataset into a new volume for each container
+        if self.use_benchmark_snapshots():
+            for dockerHost in dockerHosts:
+                dockerHost.benchmarkSnapshots = BenchmarkSnapshots(dockerHost.client, self.redis, self.log, dockerHost.name)
+
+        # the flask app, used to create a separate app context in each thread
+        self.app = current_app._get_current_object()
+
+        # host path to the current run directory (only containers on the docker host of this celery container can mount it)
+        self.hostRunPath = None
+        localHost = next((dockerHost for dockerHost in dockerHosts if dockerHost.isLocal), None)
+        if localHost:
+            self.dockerClient = localHost.client
+            self.hostRunPath = self.get_host_data_path() / "cloneDetection" / "runs" / self.runID
 
         # save the number of already executed containers in this run
         # will be incremented on each container start
         self.numExecutedContainers = 0
 
+        # guards the state shared between the threads executing the containers (counters, volumes)
+        self.lock = Lock()
+        # the statistics of a benchmark may be updated by multiple threads at the same time
+        # and the plotting library is not thread-safe
+        self.statisticsLock = Lock()
+        # benchmark volumes (docker host name, volume name) of all containers currently executed, will be removed if the run fails or is aborted
+        self.activeVolumes = set()
+        # set if one container execution failed or the run was aborted, all other containers will be stopped
+        self.stopContainers = Event()
+
         self.abortHeartbeats = Event()
 
-        self.startup_check()
 
-        # Call the main task logic
-        self.start()
+    def startup_failure(self, exc: Exception) -> None:
+        """
+        In case of an error before the containers of this run are started:
+        update status in redis and logs, remove this run from the active runs
+        """
+        self.log.error(f"Run '{self.runID}' could not be started: {exc}")
+        self.redis.set(get_run_key(self.runID, "status"), "failed")
+        self.redis.hset(get_run_key(self.runID, "progress"), mapping={
+            "status"         : "error",
+            "currentMessage" : f"Run '{self.runID}' failed: {exc}",
+            "isExecuted"     : "False"
+        })
+        remove_active_run(self.redis, self.runID)
+        self.log.remove()
+        self.logPublisher.stop()
 
 
     def startup_check(self) -> None:
@@ -81,6 +168,52 @@ class ExecuteRun(AbortableTask):
             raise TypeError(f"self.benchmarks is not a list")
 
 
+    def get_max_parallel_containers(self) -> int:
+        """
+        get the maximum number of clone detector tool containers, which are executed at the same time on each docker host (of all runs),
+        from the environmental variable 'MAX_PARALLEL_CONTAINERS' (default: 1 = one container after another)
+        """
+        try:
+            maxParallelContainers = int(environ.get('MAX_PARALLEL_CONTAINERS', default=1))
+        except ValueError:
+            raise ValueError("Environmental variable 'MAX_PARALLEL_CONTAINERS' needs to be an integer")
+
+        return max(maxParallelContainers, 1)
+
+
+    def get_reserved_host_memory(self) -> int:
+        """
+        get the memory of the docker host, which will not be reserved for clone detector tool containers
+        (e.g. for the docker host itself, this web-app and the benchmark containers),
+        from the environmental variable 'RESERVED_HOST_MEMORY' (default: 2g)
+        """
+        try:
+            return parse_memory(environ.get('RESERVED_HOST_MEMORY', default="2g"))
+        except ValueError:
+            raise ValueError("Environmental variable 'RESERVED_HOST_MEMORY' needs to be a memory declaration, e.g. '2g'")
+
+
+    def get_container_stats_interval(self) -> float:
+        """
+        get the interval (in seconds), in which the resource usage (CPU, memory, block and network I/O) of each container is sampled,
+        from the environmental variable 'CONTAINER_STATS_INTERVAL' (default: 5, 0 = no sampling)
+        """
+        try:
+            interval = float(environ.get('CONTAINER_STATS_INTERVAL', default=5))
+        except ValueError:
+            raise ValueError("Environmental variable 'CONTAINER_STATS_INTERVAL' needs to be a number")
+
+        return max(interval, 0)
+
+
+    def use_benchmark_snapshots(self) -> bool:
+        """
+        check the environmental variable 'BENCHMARK_VOLUME_SNAPSHOTS' (default: true),
+        whether the benchmark dataset is provided to the containers as copy-on-write clones of a pre-populated benchmark volume
+        """
+        return environ.get('BENCHMARK_VOLUME_SNAPSHOTS', default="True").lower() in ('true', '1', 't', 'yes')
+
+
     def get_host_data_path(self) -> Path:
         """
         returns a Path object of the 'data' directory, containing the host path (outside of this celery container)
@@ -100,10 +233,21 @@ class ExecuteRun(AbortableTask):
                 return Path(mount['Source'])
 
 
-    def publish_to_sse(self, msg: str, channel: str="run_logs") -> None:
+    def publish_logs(self, lines: list[str]) -> None:
+        """
+        send a batch of log entries as one message via the logs channel of this run (see logPublisher.py)
+        """
+        with self.app.app_context():
+            self.publish_to_sse(lines, self.sseChannels.logs)
+
+
+    def publish_to_sse(self, msg: str, channel: str=None) -> None:
         """
         send messages to web clients via server-sent events on an (optional) specified channel
+        (default: logs channel of this run)
         """
+        if not channel:
+            channel = self.sseChannels.logs
         sse.publish({"message": msg}, channel=channel)
 
 
@@ -111,37 +255,85 @@ class ExecuteRun(AbortableTask):
         """
         every second send heartbeats to the web clients via server-sent events
         as periodic signal to indicate normal operation of this container execution
-        via the "container_heartbeats" channel
+        via the heartbeats channel of this run
         """
-        with self.currentAppContext:
+        with self.app.app_context():
             while not abortHeartbeats.is_set():
                 sleep(1)
-                self.publish_to_sse("HEARTBEAT: ExecuteRun", "run_heartbeats")
+                self.publish_to_sse("HEARTBEAT: ExecuteRun", self.sseChannels.heartbeats)
 
 
-    def stream_logs(self, containerID: int) -> None:
+    def stream_logs(self, containerID: int, job: SimpleNamespace) -> None:
         """
-        send new log entries (stdout of container) to the web clients via server-sent events
+        send new log entries (stdout of container) to the web clients via server-sent events (in batches, see logPublisher.py)
+        If multiple containers are executed at the same time,
+        each log entry is prefixed with the benchmark and the clone detector tool of the container
+        (and the docker host, if multiple docker hosts are used).
         """
-        container = self.dockerClient.containers.get(containerID)
+        container = job.host.client.containers.get(containerID)
+
+        prefix = ""
+        if len(self.dockerHosts) > 1:
+            prefix = f"[{job.benchmark['name']}/{job.detectorName}@{job.host.name}] "
+        elif self.maxParallelContainers > 1:
+            prefix = f"[{job.benchmark['name']}/{job.detectorName}] "
 
         # Get container logs
+        # (written to the log file and queued for the web clients, which get them in batches from the log publisher)
         for log_line in container.logs(stream=True, follow=True):
-            msg = log_line.decode('utf-8')
-            with self.currentAppContext:
-                self.log.info(msg)
+            msg = log_line.decode('utf-8', errors='replace')
+            self.log.info(f"{prefix}{msg}")
 
 
-    def send_progress_update(self, status: str, msg: str) -> None:
+    def start_container_stats_sampler(self, container, job: SimpleNamespace) -> ContainerStatsSampler|None:
+        """
+        sample the resource usage of a container in the background and save it as time series in the directory of the job
+        (see containerStats.py). A summary of each sample is sent to the web clients via the stats channel of this run.
+        Returns None, if the sampling is disabled.
+        """
+        if not self.containerStatsInterval:
+            return None
+
+        def publish_summary(summary: dict) -> None:
+            statsUpdate = {
+                "benchmark" : job.benchmark['name'],
+                "detector"  : job.detectorName,
+                **summary
+            }
+            with self.app.app_context():
+                self.publish_to_sse(statsUpdate, self.sseChannels.stats)
+
+        statsFile = self.runDir / job.benchmark['name'] / job.detectorName / settings.runs['containerStatsFileName']
+        sampler = ContainerStatsSampler(container, statsFile, self.containerStatsInterval, onSample=publish_summary, log=self.log)
+        sampler.start()
+        return sampler
+
+
+    def stop_container_stats_sampler(self, sampler: ContainerStatsSampler|None, detectorName: str) -> None:
+        """
+        stop sampling the resource usage of a container and log the summary of all samples
+        """
+        if sampler is None:
+            return
+
+        summary = sampler.stop()
+        if summary['samples']:
+            self.log.info(f"Resource usage of the container for '{detectorName}': "
+                          f"peak memory {summary['peakMemory (MB)']} MB, "
+                          f"mean CPU {summary['meanCPU (%)']} %, max CPU {summary['maxCPU (%)']} % "
+                          f"({summary['samples']} samples)")
+
+
+    def send_progress_update(self, status: str, msg: str, benchmark: dict = None) -> None:
         """
         send updates about the current progress of execution
-        via the "run_progress" channel
+        via the progress channel of this run
         """
         isExecuted = "True"
         if status in {'error', 'failure', 'aborted', 'finished'}:
             isExecuted = "False"
-        elif status == 'running':
-            msg = f"{msg} (in {self.currentBenchmark['general']['pretty_name']})"
+        elif status == 'running' and benchmark:
+            msg = f"{msg} (in {benchmark['general']['pretty_name']})"
 
         progressUpdate = {
             "type"           : "container",
@@ -153,25 +345,32 @@ class ExecuteRun(AbortableTask):
             "isExecuted"     : isExecuted
         }
 
-        self.redis.hset("run.progress", mapping=progressUpdate)
+        self.redis.hset(get_run_key(self.runID, "progress"), mapping=progressUpdate)
 
-        with self.currentAppContext:
-            self.publish_to_sse(progressUpdate, "run_progress")
+        with self.app.app_context():
+            self.publish_to_sse(progressUpdate, self.sseChannels.progress)
 
 
-    def wait_for_container(self, container, detectorName: str) -> bool:
+    def wait_for_container(self, container, detectorName: str) -> int|None:
         """
         wait for:
             a) container execution to finish  or
 
-            b) task abortion
+            b) task abortion  or
+
+            c) failure of another container, executed at the same time
+
+        Returns:
+            the exit code of the container or None, if the container was already removed
         """
         while(True):
             try:
                 # Attempt to wait for the container to finish, with a timeout of 1 second
-                container.wait(timeout=2)
+                result = container.wait(timeout=2)
                 # exit this method, if the container finished execution
-                return
+                return result.get('StatusCode')
+            except docker.errors.NotFound:
+                return None
             # if the container has not finished, this Exception is raised and will be ignored
             except requests.exceptions.ConnectionError:
                 pass
@@ -184,44 +383,82 @@ class ExecuteRun(AbortableTask):
                 self.log.warning(f"Received request from user to cancel this run")
                 self.log.warning(f"aborting run and stopping Container '{detectorName}'")
                 self.send_progress_update(status="aborted", msg=f"aborting run and stopping Container '{detectorName}'")
-                container.stop(timeout=5)
-                print("remove container")
-                # container.remove() # The container will be removed automatically after it has been stopped. (setting 'auto_remove' : True)
-                self.abortHeartbeats.set()
-                print("container removed")
+                self.stop_container_on_abort(container)
                 raise Exception("Task aborted")
 
+            # another container of this run failed or was aborted
+            if self.stopContainers.is_set():
+                self.log.warning(f"stopping Container '{detectorName}', since the run will be terminated")
+                self.stop_container_on_abort(container)
+                raise Exception("Task aborted")
+
+
+    def stop_container_on_abort(self, container) -> None:
+        """
+        stop a container of this run, because the run is aborted or failed
+        """
+        self.stopContainers.set()
+        container.stop(timeout=5)
+        print("remove container")
+        # container.remove() # The container will be removed automatically after it has been stopped. (setting 'auto_remove' : True)
+        self.abortHeartbeats.set()
+        print("container removed")
+
 
-    def create_benchmark_volume(self) -> None:
+    def create_benchmark_volume(self, job: SimpleNamespace) -> None:
         """
         create the volume, which will contain the benchmark input dataset (clone files)
-        this volume will be shared between this benchmark container and all clone detector tools
+        this volume will be shared between this benchmark container and one clone detector tool
+
+        If benchmark snapshots are enabled, the volume is a copy-on-write clone of the pre-populated (golden) benchmark volume
+        and does not need to be populated by a benchmark container.
         """
-        self.log.trace("create shared benchmark volume")
+        self.log.trace(f"create shared benchmark volume for '{job.detectorName}'")
 
-        benchmark = self.currentBenchmark
-        volumeName=f"{self.runID}_benchmark_{benchmark['name']}_shared_volume"
+        benchmark = job.benchmark
+        volumeName=f"{self.runID}_benchmark_{benchmark['name']}_{job.simpleDetectorName}_shared_volume"
 
-        volume = self.dockerClient.volumes.create(name=volumeName)
+        dockerHost = job.host
+        benchmarkSnapshots = dockerHost.benchmarkSnapshots
+        if benchmarkSnapshots:
+            try:
+                goldenVolume = benchmarkSnapshots.get_golden_volume(benchmark)
+                clone = benchmarkSnapshots.create_clone(benchmark, goldenVolume, volumeName)
+            except docker.errors.DockerException as exc:
+                # e.g. overlay mounts are not supported by this docker host
+                self.log.warning(f"Failed to create a copy-on-write clone of the benchmark volume on docker host '{dockerHost.name}': {exc}")
+                self.log.warning(f"The benchmark dataset will be copied into a new volume for each container on this docker host in this run")
+                dockerHost.benchmarkSnapshots = None
+            else:
+                job.volume = clone.volume
+                job.scratchVolume = clone.scratchVolume
+                with self.lock:
+                    self.activeVolumes.update(((dockerHost.name, clone.volume.name), (dockerHost.name, clone.scratchVolume.name)))
+                return
+
+        volume = dockerHost.client.volumes.create(name=volumeName)
 
-        self.currentBenchmark["volume"] = volume
+        job.volume = volume
+        job.populateVolume = True
+        with self.lock:
+            self.activeVolumes.add((dockerHost.name, volume.name))
 
 
-    def run_benchmark_container(self) -> None:
+    def run_benchmark_container(self, job: SimpleNamespace) -> None:
         """
-        Create and run a container for the current benchmark,
+        Create and run a container for the benchmark of the specified job,
         in which the benchmark dataset (clone files) is stored.
         Also, a volume will be created.
         This volume is used to share the benchmark dataset with
-        containers that run clone detector tools.
+        the container that runs the clone detector tool of this job.
         """
-        benchmark = self.currentBenchmark
+        benchmark = job.benchmark
 
-        self.send_progress_update(status="running", msg=f"preparing container for benchmark: '{benchmark['general']['pretty_name']}'")
+        self.send_progress_update(status="running", msg=f"preparing container for benchmark: '{benchmark['general']['pretty_name']}'", benchmark=benchmark)
 
-        volume = self.currentBenchmark["volume"]
+        volume = job.volume
 
-        containerName = f"{self.runID}-benchmark-{benchmark['name']}"
+        containerName = f"{self.runID}-benchmark-{benchmark['name']}-{job.simpleDetectorName}"
         containerImage = benchmark["container"]["image"]
         benchmarkPath = benchmark["container"]["benchmark_path"]
 
@@ -237,44 +474,29 @@ class ExecuteRun(AbortableTask):
             'auto_remove'       : True  # remove container after it has been stopped
         }
 
-        self.send_progress_update(status="running", msg=f"start benchmark container for benchmark: '{benchmark['general']['pretty_name']}'")
+        self.send_progress_update(status="running", msg=f"start benchmark container for benchmark: '{benchmark['general']['pretty_name']}'", benchmark=benchmark)
         self.log.trace(f"start benchmark container for benchmark: '{benchmark['general']['pretty_name']}'")
         self.log.trace(f"This might take a while, since the entire benchmark dataset is copied into a volume")
 
         # Create and start the container
-        container = self.dockerClient.containers.run(**containerConfig)
+        container = job.host.client.containers.run(**containerConfig)
 
-        self.currentBenchmark["container"]["obj"] = container
         container.stop(timeout=5)
 
 
-    def stop_benchmark_container(self) -> None:
-        """
-        Stop and delete the current benchmark container,
-        where the benchmark dataset (clone files) are stored.
-        """
-        self.log.trace("benchmark container will be stopped and removed")
-
-        if "obj" in self.currentBenchmark["container"]:
-            container = self.currentBenchmark["container"]["obj"]
-            container.stop()
-
-
-    def remove_benchmark_volume(self) -> None:
+    def remove_benchmark_volume(self, dockerHostName: str, volumeName: str) -> None:
         """
-        Remove the current benchmark volume.
+        Remove the specified benchmark volume on the specified docker host.
         This volume is used to share the benchmark dataset with
-        the clone detector tool containers.
+        a clone detector tool container.
         """
         self.log.trace("shared benchmark volume will be removed")
 
-        try:
-            volume = self.currentBenchmark["volume"]
-        except KeyError:
-            return
+        with self.lock:
+            self.activeVolumes.discard((dockerHostName, volumeName))
 
         try:
-            self.dockerClient.volumes.get(volume.name)
+            volume = self.dockerHosts[dockerHostName].client.volumes.get(volumeName)
         except docker.errors.NotFound:
             # if volume does not exist: done
             return
@@ -285,6 +507,8 @@ class ExecuteRun(AbortableTask):
                 volume.remove(force=True)
                 self.log.trace("Benchmark volume removed")
                 return
+            except docker.errors.NotFound:
+                return
             except docker.errors.APIError as exc:
                 if "volume is in use" in str(exc):
                     print("removing Benchmark volume...")
@@ -295,15 +519,27 @@ class ExecuteRun(AbortableTask):
                 sleep(1)
                 #raise exc
 
-    def _prepare_paths(self, fileName: str, detectorName: str, detector: dict, pathInContainer: str = False) -> SimpleNamespace:
+
+    def remove_all_benchmark_volumes(self) -> None:
+        """
+        Remove the benchmark volumes of all containers, which were executed at the time the run failed or was aborted.
+        """
+        # sorted: the overlay volume of a benchmark volume clone is removed before its '..._scratch' volume
+        with self.lock:
+            volumes = sorted(self.activeVolumes)
+
+        for dockerHostName, volumeName in volumes:
+            self.remove_benchmark_volume(dockerHostName, volumeName)
+
+    def _prepare_paths(self, fileName: str, job: SimpleNamespace, pathInContainer: str = False) -> SimpleNamespace:
         """
         Prepares and returns the file paths for different environments: this container, the host system,
         and the specified detector's container.
 
         Parameters:
         - fileName: The name of the file for which paths are being prepared.
-        - detectorName: The name of the detector tool, used in constructing paths.
-        - detector: A dictionary containing the detector's configuration, specifically its container settings.
+        - job: The job (benchmark and detector tool) for which the container is executed,
+                containing the detector's name (used in constructing paths) and its configuration.
         - pathInContainer: Optional. A specific path within the detector's container. If not provided,
                             a default path based on the detector's configuration is used.
 
@@ -311,7 +547,7 @@ class ExecuteRun(AbortableTask):
         A SimpleNamespace object containing:
         - filename: The name of the file.
         - path: The file's path within this container.
-        - hostPath: The file's path on the host system.
+        - hostPath: The file's path on the host system (None, if the docker host of this container is not used).
         - containerPath: The file's path within the detector's container.
 
         Note: Ensures the file exists at the specified path within this container by touching it, as Docker does not
@@ -325,14 +561,18 @@ class ExecuteRun(AbortableTask):
             # Remove special characters from the name of the file in the container
             # to ensure that there are no problems with applications in the container (such as detectClones)
             simpleFileName, _  = convert_to_image_name(fileName, preserveSuffix=True)
-            pathInContainer = Path(detector['container']['mountpoint_base']) / simpleFileName
+            pathInContainer = Path(job.detector['container']['mountpoint_base']) / simpleFileName
+
+        hostPath = None
+        if self.hostRunPath:
+            hostPath = str(self.hostRunPath / job.benchmark['name'] / job.detectorName / fileName)
 
         paths = SimpleNamespace(
             filename        = fileName,
             # path to file in this container
-            path            = str(self.runDir / self.currentBenchmark['name'] / detectorName / fileName),
+            path            = str(self.runDir / job.benchmark['name'] / job.detectorName / fileName),
             # path to file in host system (outside of this container)
-            hostPath        = str(self.hostRunPath / self.currentBenchmark['name'] / detectorName / fileName),
+            hostPath        = hostPath,
             # path to file in the container
             containerPath   = str(pathInContainer)
         )
@@ -343,11 +583,12 @@ class ExecuteRun(AbortableTask):
         return paths
 
 
-    def _prepare_mount_points(self, detectorName: str, detector: dict) -> list:
+    def _prepare_files(self, job: SimpleNamespace) -> SimpleNamespace:
         """
-        Prepares and returns a list of mount points for a Docker container. These mount points include:
+        Prepares the files, which are shared with the container of a detector:
         - The benchmark detectClones CSV file
         - The benchmark evaluateTool report file
+        - The metrics of the partitions executed by detectClones (only written by the detectClones commands of some benchmarks)
         - The configuration file for the clone detector tool
         - The configuration file for the entrypoint script (entrypoint.cfg)
         - A file for verbose logging
@@ -356,36 +597,44 @@ class ExecuteRun(AbortableTask):
         detectClones CSV file and the evaluateTool report file within the container.
 
         Parameters:
-        - detector_name: The name of the detector tool.
-        - detector: A dictionary containing the detector's configuration.
+        - job: The job (benchmark and detector tool) for which the container is executed.
 
         Returns:
-        A list of docker.types.Mount objects configured for the container.
+        A SimpleNamespace object containing the paths (see _prepare_paths) of each file.
         """
+        detectorName = job.detectorName
+        detector = job.detector
 
         ## benchmark detectClones csv file
         # <detectorTool>.<detectedClonesFileExtension>
         # e.g.:     NiCad.csv
         csvFilename = f"{detectorName}{settings.benchmarks['detectedClonesFileExtension']}"
-        csvFile = self._prepare_paths(csvFilename, detectorName, detector)
+        csvFile = self._prepare_paths(csvFilename, job)
 
         ## benchmark evaluateTool report file
         # <detectorTool>.<reportFileExtension>
         # e.g.:     NiCad.report
         evaluateToolReportFilename = f"{detectorName}{settings.benchmarks['reportFileExtension']}"
-        reportFile = self._prepare_paths(evaluateToolReportFilename, detectorName, detector)
+        reportFile = self._prepare_paths(evaluateToolReportFilename, job)
+
+        ## metrics of the partitions executed by detectClones
+        # next to the .csv file, since detectClones writes them there by default
+        # e.g.:     NiCad.partitions.jsonl
+        partitionMetricsFilename = f"{detectorName}{settings.benchmarks['partitionMetricsFileExtension']}"
+        partitionMetricsContainerPath = Path(csvFile.containerPath).with_suffix(settings.benchmarks['partitionMetricsFileExtension'])
+        partitionMetricsFile = self._prepare_paths(partitionMetricsFilename, job, pathInContainer=partitionMetricsContainerPath)
 
         ## config file for clone detector
         # <detectorTool>.<fileExtensionFinal>
         # e.g.      NiCad.cfg
         detectorToolConfigFilename = f"{detectorName}{settings.templateFiles['fileExtensionFinal']}"
-        detectorToolConfigFile = self._prepare_paths(detectorToolConfigFilename, detectorName, detector, pathInContainer=detector['container']['mountpoint_detector_config'])
+        detectorToolConfigFile = self._prepare_paths(detectorToolConfigFilename, job, pathInContainer=detector['container']['mountpoint_detector_config'])
 
         # config for entrypoint script
         # <detectorTool>.<reportFileExtension>
         # e.g.:     entrypoint.cfg
         entrypointConfigFilename = settings.benchmarks['configFileName']
-        entrypointConfigFile = self._prepare_paths(entrypointConfigFilename, detectorName, detector, pathInContainer=detector['container']['mountpoint_entrypoint_config'])
+        entrypointConfigFile = self._prepare_paths(entrypointConfigFilename, job, pathInContainer=detector['container']['mountpoint_entrypoint_config'])
 
 
         # write path of .csv file in container to entrypoint.cfg
@@ -399,98 +648,226 @@ class ExecuteRun(AbortableTask):
 
         # verbose logging file
         verboseLogFilename = "verbose.log"
-        verboseLogFile = self._prepare_paths(verboseLogFilename, detectorName, detector)
+        verboseLogFile = self._prepare_paths(verboseLogFilename, job)
+
+        return SimpleNamespace(
+            csv                 = csvFile,
+            report              = reportFile,
+            partitionMetrics    = partitionMetricsFile,
+            detectorToolConfig  = detectorToolConfigFile,
+            entrypointConfig    = entrypointConfigFile,
+            verboseLog          = verboseLogFile,
+            # files created by the container, which are copied back from containers on other docker hosts
+            results             = [csvFile, reportFile, partitionMetricsFile, verboseLogFile]
+        )
+
+
+    def _prepare_mount_points(self, files: SimpleNamespace) -> list:
+        """
+        Prepares and returns a list of mount points of the prepared files (see _prepare_files) for a Docker container
+        on the docker host of this celery container.
 
+        Returns:
+        A list of docker.types.Mount objects configured for the container.
+        """
         # Define mounts
         mounts = [
             # detectClones storage mount (.CSV file)
             docker.types.Mount(
-                source=csvFile.hostPath,
-                target=csvFile.containerPath,
+                source=files.csv.hostPath,
+                target=files.csv.containerPath,
                 type='bind' ),
             # evaluateTool storage mount (.report file)
             docker.types.Mount(
-                source=reportFile.hostPath,
-                target=reportFile.containerPath,
+                source=files.report.hostPath,
+                target=files.report.containerPath,
+                type='bind' ),
+            # detectClones partition metrics mount (.partitions.jsonl file)
+            docker.types.Mount(
+                source=files.partitionMetrics.hostPath,
+                target=files.partitionMetrics.containerPath,
                 type='bind' ),
             # mount config file of clone detector
             docker.types.Mount(
-                source=detectorToolConfigFile.hostPath,
-                target=detectorToolConfigFile.containerPath,
+                source=files.detectorToolConfig.hostPath,
+                target=files.detectorToolConfig.containerPath,
                 type='bind' ),
             # mount config file of entrypoint.py script (entrypoint.cfg)
             docker.types.Mount(
-                source=entrypointConfigFile.hostPath,
-                target=entrypointConfigFile.containerPath,
+                source=files.entrypointConfig.hostPath,
+                target=files.entrypointConfig.containerPath,
                 type='bind',
                 read_only=True ),
             # verbose logging file mount (verbose.log file)
             docker.types.Mount(
-                source=verboseLogFile.hostPath,
-                target=verboseLogFile.containerPath,
+                source=files.verboseLog.hostPath,
+                target=files.verboseLog.containerPath,
                 type='bind' ),
         ]
         return mounts
 
 
-    def run_container(self, detector: dict) -> None:
+    def copy_files_to_container(self, container, files: SimpleNamespace) -> None:
+        """
+        Copy the prepared files (see _prepare_files) into a created (not yet started) container on another docker host,
+        which can not mount the run directory.
+        """
+        archive = BytesIO()
+        with tarfile.open(fileobj=archive, mode="w") as tar:
+            for file in (files.csv, files.report, files.partitionMetrics, files.detectorToolConfig, files.entrypointConfig, files.verboseLog):
+                tarInfo = tarfile.TarInfo(name=file.containerPath.lstrip("/"))
+                tarInfo.size = Path(file.path).stat().st_size
+                # the tool in the container may not run as root
+                tarInfo.mode = 0o666
+                with open(file.path, "rb") as f:
+                    tar.addfile(tarInfo, f)
+
+        container.put_archive("/", archive.getvalue())
+
+
+    def copy_result_files_from_container(self, container, files: SimpleNamespace) -> None:
+        """
+        Stream the result files (.csv, .report, verbose.log) of a finished container on another docker host
+        back into the run directory.
+        """
+        for file in files.results:
+            try:
+                bits, _ = container.get_archive(file.containerPath)
+            except docker.errors.NotFound:
+                self.log.warning(f"'{file.containerPath}' was not found in the container")
+                continue
+
+            # the archive is buffered in a temporary file, since the .csv file may be large
+            with TemporaryFile() as archive:
+                for chunk in bits:
+                    archive.write(chunk)
+                archive.seek(0)
+
+                with tarfile.open(fileobj=archive, mode="r") as tar:
+                    member = tar.next()
+                    with tar.extractfile(member) as src, open(file.path, "wb") as dst:
+                        copyfileobj(src, dst)
+
+
+    def create_container(self, dockerHost: SimpleNamespace, containerConfig: dict):
+        """
+        create (but don't start) a container on another docker host, the image will be pulled if it does not exist yet
+        """
+        try:
+            return dockerHost.client.containers.create(**containerConfig)
+        except docker.errors.ImageNotFound:
+            self.log.info(f"pulling image '{containerConfig['image']}' on docker host '{dockerHost.name}'")
+            dockerHost.client.images.pull(containerConfig['image'])
+            return dockerHost.client.containers.create(**containerConfig)
+
+
+    def remove_remote_container(self, container, files: SimpleNamespace) -> None:
+        """
+        stop a container on another docker host, copy its result files back into the run directory and remove it
+        """
+        try:
+            container.stop(timeout=5)
+            self.copy_result_files_from_container(container, files)
+        except (docker.errors.APIError, OSError, tarfile.TarError) as exc:
+            self.log.error(f"Failed to copy the result files from container '{container.name}': {exc}")
+        finally:
+            try:
+                container.remove(force=True)
+            except docker.errors.NotFound:
+                pass
+
+
+    def run_container(self, job: SimpleNamespace) -> int|None:
         """
         Configures, starts, and manages a Docker container for a given detector. It includes steps to:
-        - Create and prepare mount points for the container,
+        - Create and prepare mount points for the container (or copy the files into the container on other docker hosts),
         - Configure the container's settings,
-        - Start the container and stream its logs,
-        - Wait until the container has stopped or finished execution.
+        - Start the container on the docker host of the job and stream its logs,
+        - Wait until the container has stopped or finished execution,
+        - Copy the result files back into the run directory (only on other docker hosts).
 
         Parameters:
-        - detector: A dictionary containing the detector's configuration.
-        """
-        # remove file extension
-        detectorName = str(detector['detector_config_filename']).removesuffix(settings.templateFiles['fileExtensionWebEdit'])
+        - job: The job (benchmark and detector tool) for which the container is executed.
 
-        simpleDetectorName, _ = convert_to_image_name(detectorName)
+        Returns:
+        The exit code of the container (None if unknown).
+        """
+        detector = job.detector
+        detectorName = job.detectorName
+        simpleDetectorName = job.simpleDetectorName
+        benchmark = job.benchmark
 
-        self.numExecutedContainers += 1
-        self.send_progress_update(status="running", msg=f"preparing container for '{detectorName}'")
+        with self.lock:
+            self.numExecutedContainers += 1
+        self.send_progress_update(status="running", msg=f"preparing container for '{detectorName}'", benchmark=benchmark)
 
-        mounts = self._prepare_mount_points(detectorName, detector)
-        benchmarkVolume = self.currentBenchmark["volume"].name
+        files = self._prepare_files(job)
+        benchmarkVolume = job.volume.name
+        dockerHost = job.host
 
         env = {
             "CLONE_DETECTOR_TOOL_NAME"  : simpleDetectorName,
-            "BENCHMARK_NAME"            : self.currentBenchmark["name"]
+            "BENCHMARK_NAME"            : benchmark["name"]
         }
 
+        # limit the container to its reserved CPU cores and memory
+        resourceLimits = self.resourceScheduler.container_options(job.reservation)
+
         # Define container configuration
         containerConfig = {
-            'name'              : f"{self.runID}-{simpleDetectorName}",
+            'name'              : f"{self.runID}-{benchmark['name']}-{simpleDetectorName}",
             'image'             : detector["container"]["image"],
             #'entrypoint'        : f"bash -c 'while sleep 2; do echo $((i++)); ; done'",
             #'entrypoint'        : f"bash -c 'sleep 5'",
             'entrypoint'        : settings.benchmarks["startCommand"],
-            'mounts'            : mounts,
             'volumes'           : {benchmarkVolume: {'bind': '/cloneDetection/benchmark/', 'mode': 'rw'}},
             'environment'       : env,
             'detach'            : True,
             'network_disabled'  : True,
-            'auto_remove'       : True  # remove container after it has been stopped
+            **resourceLimits
         }
 
-        self.send_progress_update(status="running", msg=f"executing container for '{detectorName}'")
-        self.log.info(f"start container for '{detectorName}'")
+        if dockerHost.isLocal:
+            containerConfig['mounts'] = self._prepare_mount_points(files)
+            containerConfig['auto_remove'] = True   # remove container after it has been stopped
+
+        self.send_progress_update(status="running", msg=f"executing container for '{detectorName}'", benchmark=benchmark)
+        self.log.info(f"start container for '{detectorName}' in benchmark '{benchmark['general']['pretty_name']}'")
+        if resourceLimits:
+            self.log.trace(f"resource limits of container for '{detectorName}': {resourceLimits}")
 
         # Create and start the container
-        container = self.dockerClient.containers.run(**containerConfig)
+        if dockerHost.isLocal:
+            container = dockerHost.client.containers.run(**containerConfig)
+        else:
+            # the files can't be mounted on other docker hosts: copy them into the container before it is started.
+            # The container is removed after its result files were copied back into the run directory
+            container = self.create_container(dockerHost, containerConfig)
+            self.copy_files_to_container(container, files)
+            container.start()
+
+        statsSampler = None
+        try:
+            # Start streaming logs in the background in separate Thread
+            streamLogsThread = Thread(target=self.stream_logs, args=(container.id, job), daemon=True)
 
-        # Start streaming logs in the background in separate Thread
-        streamLogsThread = Thread(target=self.stream_logs, args=(container.id,), daemon=True)
+            streamLogsThread.start()
 
-        streamLogsThread.start()
+            # record the resource usage of the container in the background
+            statsSampler = self.start_container_stats_sampler(container, job)
 
-        # wait till container has stopped/finished execution
-        self.wait_for_container(container, detectorName)
+            # wait till container has stopped/finished execution
+            exitCode = self.wait_for_container(container, detectorName)
+        finally:
+            self.stop_container_stats_sampler(statsSampler, detectorName)
+            if not dockerHost.isLocal:
+                self.remove_remote_container(container, files)
 
-        self.send_progress_update(status="running", msg=f"Container run for '{detectorName}' finished")
-        self.log.success(f"Container run for '{detectorName}' finished")
+        self.send_progress_update(status="running", msg=f"Container run for '{detectorName}' finished", benchmark=benchmark)
+        if exitCode:
+            self.log.warning(f"Container run for '{detectorName}' finished with exit code {exitCode}")
+        else:
+            self.log.success(f"Container run for '{detectorName}' finished")
 
         # Stop the container
         try:
@@ -502,12 +879,47 @@ class ExecuteRun(AbortableTask):
             print(type(exc))
         #container.remove()
 
+        return exitCode
+
+
+    def mark_job_completed(self, job: SimpleNamespace, exitCode: int|None, runtime: float) -> None:
+        """
+        write the completion marker of the job, if its container finished successfully,
+        so this job will be skipped, if the run is resumed.
+        """
+        detectorDir = self.runDir / job.benchmark['name'] / job.detectorName
+        reportFile = detectorDir / f"{job.detectorName}{settings.benchmarks['reportFileExtension']}"
+
+        # the exit code is unknown (None), if the container was removed before its exit code could be retrieved.
+        # in this case, the container is considered as successful, if the evaluateTool report has been created
+        reportCreated = reportFile.is_file() and reportFile.stat().st_size > 0
+        if exitCode or not reportCreated:
+            self.log.warning(f"'{job.detectorName}' in benchmark '{job.benchmark['general']['pretty_name']}' did not complete successfully and will be executed again, if this run is resumed")
+            return
+
+        try:
+            detectClonesRuntime = toolStatistics.extract_run_time(reportFile)
+        except Exception:
+            detectClonesRuntime = None
+
+        runCheckpoints.write_completion_marker(detectorDir, job.benchmark['name'], job.detectorName, exitCode, runtime, detectClonesRuntime)
+
 
     def configure_logging(self) -> None:
         # configure logging
         self.log = log
         #self.log.add(sys.stdout, format="{time:YYYY-MM-DD HH:mm:ss} {level} {message}", level="DEBUG")
-        self.log.add(self.publish_to_sse, format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}", level="TRACE")
+
+        # log entries are sent to the web clients in batches, at most one message per interval (see logPublisher.py)
+        self.logPublisher = LogPublisher(
+            self.publish_logs,
+            interval        = settings.runs['logPublishInterval'],
+            maxBatchLines   = settings.runs['logPublishMaxBatchLines'],
+            maxQueuedLines  = settings.runs['logPublishMaxQueuedLines'],
+            coalesceAfter   = settings.runs['logPublishCoalesceAfter']
+        )
+        self.logPublisher.start()
+        self.log.add(self.logPublisher.write, format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}", level="TRACE")
 
         self.logFile = self.runDir / "run.log"
         self.log.add(self.logFile, format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}", level="TRACE")
@@ -520,27 +932,34 @@ class ExecuteRun(AbortableTask):
         create a CSV containing a summary of the report files
         and diagrams of runtime and recall results
         """
-        self.redis.set("run.status", "finished")
+        self.redis.set(get_run_key(self.runID, "status"), "finished")
         self.log.success(f"All container executions of '{self.runID}' completed")
 
-        self.create_statistics()
+        for benchmark in self.benchmarks:
+            self.create_statistics(benchmark)
 
         self.send_progress_update(status="finished", msg=f"Run '{self.runID}' completed")
         self.log.success(f"Run '{self.runID}' completed")
 
 
-    def create_statistics(self) -> None:
+    def create_statistics(self, benchmark: dict) -> None:
         """
         create a CSV containing a summary of the report files
-        and diagrams of runtime and recall results
+        and diagrams of runtime and recall results of the specified benchmark
         """
-        benchmark = self.currentBenchmark['name']
+        with self.statisticsLock:
+            self._create_statistics(benchmark)
+
+
+    def _create_statistics(self, benchmark: dict) -> None:
+        benchmark = benchmark['name']
 
         runBenchmarkDir = self.runDir / benchmark
         # paths to CSV and diagrams
         reportSummaryCSV = self.runDir / benchmark /"summary.csv"
         recallDiagram = self.runDir / benchmark /"recall.svg"
         runtimeDiagram = self.runDir / benchmark / "runtime.svg"
+        resourceDiagram = self.runDir / benchmark / "resources.svg"
 
 
         self.send_progress_update(status="running", msg=f"Creating statistics file and diagram")
@@ -556,6 +975,7 @@ class ExecuteRun(AbortableTask):
         try:
             toolStatistics.create_recall_plot(reportSummaryCSV, recallDiagram, clusterBy="Type")
             toolStatistics.create_runtime_plot(reportSummaryCSV, runtimeDiagram)
+            toolStatistics.create_resource_plot(runBenchmarkDir, resourceDiagram)
         except Exception as exc:
             self.log.error(f"Failed to create statistics file and diagram. Error:")
             self.log.error(exc)
@@ -564,12 +984,10 @@ class ExecuteRun(AbortableTask):
     def aborted(self) -> None:
         """
         If the run is aborted by a user:
-        change name of (later created) archive file,
         update status in redis, logs and SSE
         """
-        self.archiveName = f"{self.archiveName}---aborted"
-        self.remove_benchmark_volume()
-        self.redis.set("run.status", "aborted")
+        self.remove_all_benchmark_volumes()
+        self.redis.set(get_run_key(self.runID, "status"), "aborted")
         self.send_progress_update(status="aborted", msg=f"Run '{self.runID}' aborted")
         self.log.error(f"Run '{self.runID}' aborted")
 
@@ -577,10 +995,9 @@ class ExecuteRun(AbortableTask):
     def failure(self) -> None:
         """
         In case of error:
-        change name of (later created) archive file,
         update status in redis, logs and SSE
         """
-        self.redis.set("run.status", "failed")
+        self.redis.set(get_run_key(self.runID, "status"), "failed")
         self.send_progress_update(status="error", msg=f"Run '{self.runID}' failed")
         self.log.error(f"Run '{self.runID}' failed")
 
@@ -590,22 +1007,39 @@ class ExecuteRun(AbortableTask):
         perform cleanup steps at the end of the run
         """
         self.abortHeartbeats.set()
+        self.resourceScheduler.release_all()
+        remove_active_run(self.redis, self.runID)
+        self.update_sizes()
+        self.create_archive()
         self.log.remove()
+        # send the last log entries of this run
+        self.logPublisher.stop()
 
 
-    def create_archive(self) -> None:
-        self.log.info(f"Creating archive for run '{self.runID}': '{self.archiveName}'")
+    def update_sizes(self) -> None:
+        """
+        update the cached sizes of the directories of this run, which are displayed on the Downloads page (see runSizes.py)
+        """
+        try:
+            update_run_sizes(self.redis, self.runDir)
+        except Exception as exc:
+            self.log.warning(f"Failed to update the sizes of the directories of run '{self.runID}': {exc}")
 
-        archivedRunsDir = settings.directories["downloads"]
-        chdir(archivedRunsDir)
-        make_archive(self.archiveName, "zip", self.runDir)
 
-        self.log.info(f"archive for run '{self.runID}' complete")
+    def create_archive(self) -> None:
+        """
+        request the zip archive of this run, which is created by a separate celery task (see runArchives.py)
+        and sent by the Downloads page
+        """
+        try:
+            if request_run_archive(self.redis, self.runDir):
+                self.log.info(f"The archive of run '{self.runID}' will be created in the background")
+        except Exception as exc:
+            self.log.warning(f"Failed to request the archive of run '{self.runID}': {exc}")
 
 
     def handle_run_exception(self, exc):
-        #self.stop_benchmark_container()
-        self.remove_benchmark_volume()
+        self.remove_all_benchmark_volumes()
 
         if str(exc) == "Task aborted":
             self.aborted()
@@ -615,55 +1049,173 @@ class ExecuteRun(AbortableTask):
             raise exc
 
 
-    def run_containers(self):
+    def create_jobs(self) -> list[SimpleNamespace]:
         """
-        This method orchestrates the setup, execution, and cleanup phases for running benchmark containers and their respective detectors.
+        Create one job for each combination of benchmark and clone detector tool of this run.
+        Each job will be executed in its own container, with its own benchmark volume.
+        If this run is resumed, no jobs are created for already completed combinations.
+        """
+        jobs = []
+        for benchmark in self.benchmarks:
+            for detector in self.containerConfigs:
+                # remove file extension
+                detectorName = runCheckpoints.get_detector_name(detector)
+                simpleDetectorName, _ = convert_to_image_name(detectorName)
+
+                # skip already completed jobs, if this run is resumed
+                if self.resume and runCheckpoints.is_completed(self.runDir / benchmark['name'] / detectorName):
+                    self.log.info(f"Skipping '{detectorName}' in benchmark: {benchmark['general']['pretty_name']}, since it has already been completed")
+                    self.numExecutedContainers += 1
+                    continue
+
+                # CPU cores and memory declared in the [resources] section of the config template
+                resources = parse_resources(detector.get('resources', {}), detector['detector_config_filename'])
+                self.resourceScheduler.check(resources, detectorName)
+
+                jobs.append(SimpleNamespace(
+                    benchmark           = benchmark,
+                    detector            = detector,
+                    detectorName        = detectorName,
+                    simpleDetectorName  = simpleDetectorName,
+                    resources           = resources,
+                    reservation         = None,
+                    # docker host, which executes the container of this job (set when the resources are reserved)
+                    host                = None,
+                    volume              = None,
+                    # scratch volume of the copy-on-write clone of the benchmark volume (only if benchmark snapshots are used)
+                    scratchVolume       = None,
+                    # the benchmark volume needs to be populated by a benchmark container
+                    populateVolume      = False
+                ))
+
+        return jobs
+
+
+    def run_job(self, job: SimpleNamespace) -> None:
+        """
+        Execute a single job (one clone detector tool in one benchmark).
 
-        The workflow for each detector includes:
-        - Creating a shared benchmark volume.
-        - Running a benchmark container to pupulate the benchmark volume with the clone dataset.
+        The workflow for each job includes:
+        - Waiting until the declared resources (CPU cores, memory) of the clone detector tool are available.
+        - Creating a shared benchmark volume (a copy-on-write clone of the pre-populated benchmark volume, if enabled).
+        - Running a benchmark container to pupulate the benchmark volume with the clone dataset (only if it is not a clone).
         - Running the specific detector container.
+        - Writing the completion marker of the job, if the detector container finished successfully.
         - Generating/updating the statistic file based on the 'evaluateTool' report of the benchmark in the detector container.
-        - Stopping the benchmark container.
-        - Removing the shared benchmark volume.
+        - Removing the shared benchmark volume (and its scratch volume) and releasing the reserved resources.
 
-        For each detector, a new benchmark volume and container are created to isolate the benchmark files.
+        For each job, a new benchmark volume and container are created to isolate the benchmark files.
         This prevents modifications by any detector tool, ensuring consistent and comparable results across all detector tool executions.
         """
-        for detector in self.containerConfigs:
-            self.create_benchmark_volume()
-            self.run_benchmark_container()
+        # skip this job, if the run was aborted or another job failed before this job started
+        if self.stopContainers.is_set():
+            return
+
+        # wait until enough CPU cores and memory are available to start this job
+        job.reservation = self.resourceScheduler.acquire(job.resources, self.stopContainers)
+        if not job.reservation:
+            return
+        # the container is executed on the docker host, on which its resources were reserved
+        job.host = self.dockerHosts[job.reservation.host]
+
+        with self.app.app_context():
+            if len(self.dockerHosts) > 1:
+                self.log.info(f"Executing '{job.detectorName}' in benchmark: {job.benchmark['general']['pretty_name']} on docker host '{job.host.name}'")
+            else:
+                self.log.info(f"Executing '{job.detectorName}' in benchmark: {job.benchmark['general']['pretty_name']}")
+
+            try:
+                self.create_benchmark_volume(job)
+                if job.populateVolume:
+                    self.run_benchmark_container(job)
+
+                # the results of a previous execution of this job will be overwritten
+                runCheckpoints.remove_completion_marker(self.runDir / job.benchmark['name'] / job.detectorName)
+
+                startTime = time()
+                exitCode = self.run_container(job)
+                self.mark_job_completed(job, exitCode, time() - startTime)
+
+                self.create_statistics(job.benchmark)
+            finally:
+                if job.volume:
+                    self.remove_benchmark_volume(job.host.name, job.volume.name)
+                # remove the scratch volume after the overlay volume, which uses it
+                if job.scratchVolume:
+                    self.remove_benchmark_volume(job.host.name, job.scratchVolume.name)
+                self.resourceScheduler.release(job.reservation)
+
+
+    def run_containers(self) -> None:
+        """
+        This method orchestrates the setup, execution, and cleanup phases for running benchmark containers and their respective detectors.
+
+        Up to 'self.maxParallelContainers' jobs (combinations of benchmark and detector tool) are executed at the same time,
+        regardless of their benchmark, as long as the resources declared by their clone detector tools fit on the docker host.
+        Jobs, which don't fit, wait until other jobs have released their resources.
+        If one job fails or the run is aborted, all other jobs are stopped and pending jobs won't be started.
+        """
+        jobs = self.create_jobs()
+
+        self.log.info(f"Executing {len(jobs)} container(s), up to {self.maxParallelContainers} at the same time")
 
-            self.run_container(detector)
-            self.create_statistics()
+        # jobs are started in this order, if their resources are available
+        for job in jobs:
+            self.resourceScheduler.add(job.resources)
+
+        # every job waits in its own thread for its resources, the number of jobs executed at the same time
+        # is limited by the resource scheduler
+        with ThreadPoolExecutor(max_workers=max(len(jobs), 1), thread_name_prefix=self.runID) as executor:
+            futures = [executor.submit(self.run_job, job) for job in jobs]
+
+            done, notDone = wait(futures, return_when=FIRST_EXCEPTION)
+
+            # one job failed: stop all other containers and skip pending jobs
+            if notDone:
+                self.stopContainers.set()
+                for future in notDone:
+                    future.cancel()
+                wait(notDone)
+
+        exceptions = [future.exception() for future in futures if not future.cancelled() and future.exception()]
+        if not exceptions:
+            return
+
+        # the run was aborted by a user
+        if self.is_aborted():
+            raise Exception("Task aborted")
+
+        # re-raise the exception of the first failed job,
+        # instead of the exceptions of the jobs, which were stopped because of this failure
+        failures = [exc for exc in exceptions if str(exc) != "Task aborted"]
+        if failures:
+            raise failures[0]
+        raise exceptions[0]
 
-            self.remove_benchmark_volume()
 
     def execute_run(self) -> None:
         try:
-            for benchmark in self.benchmarks:
-                self.currentBenchmark = benchmark
-                self.log.info(f"Executing in benchmark: {self.currentBenchmark['general']['pretty_name']}")
-
-                self.run_containers()
+            self.run_containers()
 
             self.success()
         except Exception as exc:
             self.handle_run_exception(exc)
 
-        #self.create_archive()
 
     def start(self) -> None:
-        self.log.info(f"Run '{self.runID}' started")
+        if self.resume:
+            self.log.info(f"Run '{self.runID}' resumed")
+        else:
+            self.log.info(f"Run '{self.runID}' started")
         # send startup message to SSE progress channel, to notifiy about a new run
         # this results in JS clearing the logs on the website
         self.send_progress_update("startup", "startup")
 
-        self.redis.set("run.status", "started")
-
         # Start streaming heartbeats in the background in separate Thread
         Thread(target=self.send_heartbeats, args=(self.abortHeartbeats,), daemon=True).start()
 
-        self.execute_run()
-
-        self.final()
+        # the cleanup steps are performed even if the run failed (handle_run_exception re-raises the exception)
+        try:
+            self.execute_run()
+        finally:
+            self.final()
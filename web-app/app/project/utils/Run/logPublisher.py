@@ -0,0 +1,145 @@
+"""
+The Class in this file is used to send the log entries of a run to the web clients via server-sent events in batches.
+
+Clone detector tool containers may write thousands of lines per second (e.g. the progress of each processed file).
+Instead of one server-sent event (redis publish) per log entry, the log entries are collected
+and sent by a background thread as one message (list of log entries) at a fixed interval:
+    batches:        up to maxBatchLines log entries per message, the remaining log entries are sent with the next message
+    coalescing:     consecutive log entries, which differ only in numbers (e.g. 'processing file 17 of 5000'),
+                    are displayed as their first coalesceAfter entries, the number of skipped entries and the last entry
+    backpressure:   at most maxQueuedLines log entries are kept. If they are written faster than they can be sent,
+                    the oldest log entries are dropped (and their number is displayed instead).
+                    Writing a log entry never waits for the web clients or redis.
+All log entries are still written to the log file of the run (run.log).
+"""
+import re
+import sys
+from collections import deque
+from threading import Thread, Event, Lock
+from types import SimpleNamespace
+
+# log entries with the same text, except for the numbers in it, are coalesced
+numberPattern = re.compile(r"\d+")
+
+
+class LogPublisher:
+    """
+    collects log entries (loguru sink, see write) and sends them in batches via the publish function in a background thread,
+    until stop() is called
+    """
+
+    def __init__(self, publish, interval: float, maxBatchLines: int, maxQueuedLines: int, coalesceAfter: int):
+        # called with a list of log entries, sends them as one message to the web clients
+        self.publish = publish
+        self.interval = interval
+        self.maxBatchLines = maxBatchLines
+        self.maxQueuedLines = maxQueuedLines
+        self.coalesceAfter = coalesceAfter
+
+        # queued log entries, consecutive similar log entries are grouped (see add_line)
+        self.groups = deque()
+        self.queuedLines = 0
+        # number of log entries, which were dropped since the last batch
+        self.droppedLines = 0
+        self.lock = Lock()
+
+        self.stopPublishing = Event()
+        self.thread = Thread(target=self.publish_batches, daemon=True)
+
+
+    def start(self) -> None:
+        self.thread.start()
+
+
+    def stop(self) -> None:
+        """
+        stop the background thread, after the queued log entries have been sent
+        """
+        self.stopPublishing.set()
+        self.thread.join(timeout=self.interval + 5)
+
+
+    def write(self, message: str) -> None:
+        """
+        queue a log entry (loguru sink)
+        """
+        self.add_line(str(message).rstrip("\n"))
+
+
+    def add_line(self, line: str) -> None:
+        shape = numberPattern.sub("#", line)
+
+        with self.lock:
+            group = self.groups[-1] if self.groups else None
+
+            if group and group.shape == shape and len(group.lines) >= self.coalesceAfter:
+                # only the last log entry of the group is kept, the previous one is skipped
+                if group.last is not None:
+                    group.skipped += 1
+                else:
+                    self.queuedLines += 1
+                group.last = line
+            elif group and group.shape == shape:
+                group.lines.append(line)
+                self.queuedLines += 1
+            else:
+                self.groups.append(SimpleNamespace(shape=shape, lines=[line], skipped=0, last=None))
+                self.queuedLines += 1
+
+            # backpressure: drop the oldest log entries
+            while self.queuedLines > self.maxQueuedLines and len(self.groups) > 1:
+                dropped = self.groups.popleft()
+                numLines = len(dropped.lines) + (dropped.last is not None)
+                self.queuedLines -= numLines
+                self.droppedLines += numLines + dropped.skipped
+
+
+    def take_batch(self) -> list[str]:
+        """
+        remove the oldest queued log entries (up to maxBatchLines) and return them as a list of lines
+        """
+        batch = []
+        with self.lock:
+            if self.droppedLines:
+                batch.append(f"... {self.droppedLines} log entries are not displayed, since they were written faster than they could be sent "
+                             f"(all log entries are written to the log file of the run) ...")
+                self.droppedLines = 0
+
+            while self.groups and len(batch) < self.maxBatchLines:
+                group = self.groups.popleft()
+                self.queuedLines -= len(group.lines) + (group.last is not None)
+
+                batch.extend(group.lines)
+                if group.skipped:
+                    batch.append(f"... {group.skipped} similar log entries ...")
+                if group.last is not None:
+                    batch.append(group.last)
+        return batch
+
+
+    def publish_batch(self) -> bool:
+        """
+        send the oldest queued log entries as one message
+
+        Returns:
+            False, if no log entries were queued
+        """
+        batch = self.take_batch()
+        if not batch:
+            return False
+
+        try:
+            self.publish(batch)
+        except Exception as exc:
+            # not logged via loguru, since its log entries would be sent via this publisher again
+            print(f"Failed to send {len(batch)} log entries to the web clients: {exc}", file=sys.stderr)
+        return True
+
+
+    def publish_batches(self) -> None:
+        while not self.stopPublishing.wait(self.interval):
+            self.publish_batch()
+
+        # send the remaining log entries, e.g. the last log entries of a run
+        while self.publish_batch():
+            pass
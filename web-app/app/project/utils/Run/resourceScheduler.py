@@ -0,0 +1,277 @@
+"""
+The Class in this file is used to schedule the containers of a run according to their declared resources.
+Each clone detector tool can declare the CPU cores and memory it needs in the [resources] section of its config template, e.g.:
+
+    [resources]
+    cpus = 4
+    memory = 12g
+
+A container is only started if its declared resources are still available on one of the docker hosts (see dockerHosts.py),
+otherwise it waits until enough resources are released by other containers (of this or other runs executed at the same time).
+This way, containers executed at the same time don't oversubscribe the memory of the host (and get OOM-killed)
+and don't compete for the same CPU cores, which keeps the runtimes comparable.
+"""
+from threading import Condition, Event
+from types import SimpleNamespace
+import json
+import re
+
+# redis hash, containing the reserved resources of all containers executed at the moment (of all runs)
+reservationsKey = "resources.reservations"
+
+# factors of the units, which can be used for the memory declaration (same as docker: b, k, m, g)
+memoryUnits = {
+    "b": 1,
+    "k": 1024,
+    "m": 1024**2,
+    "g": 1024**3,
+    "t": 1024**4,
+}
+
+def parse_memory(value: str) -> int:
+    """
+    convert a memory declaration like '512m', '12g' or '1073741824' (bytes) to the number of bytes
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([bkmgt]?)b?\s*", str(value).lower())
+    if not match:
+        raise ValueError(f"Invalid memory declaration: '{value}'. Use a number followed by one of the units b, k, m, g (e.g. '12g')")
+
+    number, unit = match.groups()
+    return int(float(number) * memoryUnits[unit or "b"])
+
+
+def parse_resources(resources: dict, name: str = "") -> SimpleNamespace:
+    """
+    convert the [resources] section of a config template to the requested resources of a container
+    undeclared or empty values are not limited and not taken into account by the scheduler
+
+    Returns:
+        SimpleNamespace with
+        - cpus: number of CPU cores (may be fractional, e.g. 0.5) or 0
+        - memory: memory in bytes or 0
+    """
+    cpus = str(resources.get("cpus", "") or "").strip()
+    memory = str(resources.get("memory", "") or "").strip()
+
+    request = SimpleNamespace(cpus=0, memory=0)
+    try:
+        if cpus:
+            request.cpus = float(cpus)
+        if memory:
+            request.memory = parse_memory(memory)
+    except ValueError as exc:
+        raise ValueError(f"Error in [resources] section of '{name}': {exc}")
+
+    if request.cpus < 0 or request.memory < 0:
+        raise ValueError(f"Error in [resources] section of '{name}': declared resources must not be negative")
+
+    return request
+
+
+class ResourceScheduler:
+    """
+    Keeps track of the CPU cores and memory of the docker hosts, which are reserved by the containers of all runs.
+    The reservations are stored in redis, so runs executed at the same time (in different celery worker processes)
+    share the resources of the docker hosts.
+    Integer CPU declarations are pinned to dedicated CPU cores (cpuset), so two containers never share a core.
+
+    Containers of a run are started in the order they were added to the queue.
+    A container, which doesn't fit, is skipped by the following containers, which fit (e.g. with less memory).
+    Each container is started on the docker host with the fewest containers (relative to its limit), on which it fits.
+    """
+
+    def __init__(self, dockerHosts: list[SimpleNamespace], redis, runID: str, maxContainers: int, reservedMemory: int = 0):
+        self.redis = redis
+        self.runID = runID
+
+        # resources of each docker host (name -> resources)
+        self.hosts = {}
+        for dockerHost in dockerHosts:
+            info = dockerHost.client.info()
+            self.hosts[dockerHost.name] = SimpleNamespace(
+                name            = dockerHost.name,
+                maxContainers   = maxContainers,
+                totalCPUs       = int(info.get("NCPU", 1)),
+                # keep some memory for the docker host, this web-app and the benchmark containers
+                totalMemory     = max(int(info.get("MemTotal", 0)) - reservedMemory, 0)
+            )
+
+        # requests of this run, which wait for their resources (in order of execution)
+        self.pending = []
+        # number of reservations of this run, used to create unique reservation IDs
+        self.numReservations = 0
+
+        self.condition = Condition()
+
+
+    def check(self, request: SimpleNamespace, name: str) -> None:
+        """
+        raise an error, if the requested resources exceed the resources of every docker host
+        (the container could never be started)
+        """
+        maxCPUs = max(host.totalCPUs for host in self.hosts.values())
+        maxMemory = max(host.totalMemory for host in self.hosts.values())
+
+        if request.cpus > maxCPUs:
+            raise ValueError(f"'{name}' requests {request.cpus} CPU cores, but the docker host(s) have only {maxCPUs} CPU cores")
+        if request.memory > maxMemory:
+            raise ValueError(f"'{name}' requests {request.memory / memoryUnits['g']:.1f} GiB memory, "
+                             f"but only {maxMemory / memoryUnits['g']:.1f} GiB are available on the docker host(s)")
+
+
+    def add(self, request: SimpleNamespace) -> None:
+        """
+        add the request of a container to the end of the queue
+        """
+        with self.condition:
+            self.pending.append(request)
+
+
+    def get_usage(self) -> dict[str, SimpleNamespace]:
+        """
+        returns the resources of each docker host (name -> usage), which are reserved by the containers of all runs at the moment
+        """
+        reservations = [json.loads(reservation) for reservation in self.redis.hgetall(reservationsKey).values()]
+
+        usages = {}
+        for hostName in self.hosts:
+            # reservations without docker host were created before multiple docker hosts were supported
+            hostReservations = [reservation for reservation in reservations if reservation.get("host", "local") == hostName]
+            usages[hostName] = SimpleNamespace(
+                containers  = len(hostReservations),
+                cpus        = sum(reservation["cpus"] for reservation in hostReservations),
+                memory      = sum(reservation["memory"] for reservation in hostReservations),
+                cores       = {core for reservation in hostReservations for core in reservation["cores"]}
+            )
+        return usages
+
+
+    def fits(self, request: SimpleNamespace, host: SimpleNamespace, usage: SimpleNamespace) -> bool:
+        return (usage.containers < host.maxContainers
+                and usage.cpus + request.cpus <= host.totalCPUs
+                and usage.memory + request.memory <= host.totalMemory)
+
+
+    def get_host(self, request: SimpleNamespace, usages: dict[str, SimpleNamespace]) -> SimpleNamespace|None:
+        """
+        returns the docker host with the fewest containers (relative to its limit), on which the request fits,
+        or None if it doesn't fit on any docker host
+        """
+        hosts = [host for host in self.hosts.values() if self.fits(request, host, usages[host.name])]
+        if not hosts:
+            return None
+        return min(hosts, key=lambda host: usages[host.name].containers / host.maxContainers)
+
+
+    def is_next(self, request: SimpleNamespace, usages: dict[str, SimpleNamespace]) -> bool:
+        """
+        check if the request is the first request in the queue of this run, which fits
+        """
+        for pendingRequest in self.pending:
+            if self.get_host(pendingRequest, usages):
+                return pendingRequest is request
+        return False
+
+
+    def reserve(self, request: SimpleNamespace) -> SimpleNamespace|None:
+        """
+        reserve the requested resources, if they are available and all previous requests in the queue of this run are started.
+        Returns the reservation, or None if the resources are not available
+        """
+        with self.redis.lock(f"{reservationsKey}.lock", timeout=30):
+            usages = self.get_usage()
+            if not self.is_next(request, usages):
+                return None
+
+            host = self.get_host(request, usages)
+
+            cores = []
+            if request.cpus and request.cpus.is_integer():
+                freeCores = [core for core in range(host.totalCPUs) if core not in usages[host.name].cores]
+                cores = freeCores[:int(request.cpus)]
+
+            self.numReservations += 1
+            reservation = SimpleNamespace(
+                id      = f"{self.runID}/{self.numReservations}",
+                host    = host.name,
+                cpus    = request.cpus,
+                memory  = request.memory,
+                cores   = cores
+            )
+            self.redis.hset(reservationsKey, reservation.id, json.dumps({"host": reservation.host, "cpus": reservation.cpus,
+                                                                         "memory": reservation.memory, "cores": reservation.cores}))
+
+        return reservation
+
+
+    def acquire(self, request: SimpleNamespace, stopEvent: Event) -> SimpleNamespace|None:
+        """
+        wait until the requested resources are available on a docker host and all previous requests in the queue are started, then reserve them.
+        Returns the reservation (including the name of the docker host), or None if 'stopEvent' was set while waiting
+        """
+        with self.condition:
+            if not any(pendingRequest is request for pendingRequest in self.pending):
+                self.pending.append(request)
+
+            reservation = None
+            while not stopEvent.is_set():
+                reservation = self.reserve(request)
+                if reservation:
+                    break
+                # resources may be released by another run at any time, check again after 1 second
+                self.condition.wait(timeout=1)
+
+            self.pending = [pendingRequest for pendingRequest in self.pending if pendingRequest is not request]
+            # other requests may be able to start now
+            self.condition.notify_all()
+
+            if stopEvent.is_set() and reservation:
+                self.release(reservation)
+                return None
+
+            return reservation
+
+
+    def release(self, reservation: SimpleNamespace) -> None:
+        """
+        release the resources of a finished container and wake up the waiting containers
+        """
+        self.redis.hdel(reservationsKey, reservation.id)
+
+        with self.condition:
+            self.condition.notify_all()
+
+
+    def release_all(self) -> None:
+        """
+        release the resources of all containers of this run (e.g. at the end of the run)
+        """
+        reservationIDs = [reservationID for reservationID in self.redis.hkeys(reservationsKey) if reservationID.startswith(f"{self.runID}/")]
+        if reservationIDs:
+            self.redis.hdel(reservationsKey, *reservationIDs)
+
+
+    @staticmethod
+    def clear_reservations(redis) -> None:
+        """
+        remove the reservations of all runs, e.g. on startup of celery, when no containers are executed
+        """
+        redis.delete(reservationsKey)
+
+
+    @staticmethod
+    def container_options(reservation: SimpleNamespace) -> dict:
+        """
+        returns the docker run arguments, which limit the container to its reserved resources
+        """
+        options = {}
+        if reservation.memory:
+            options['mem_limit'] = reservation.memory
+            # same as 'mem_limit': the container can not use swap, which would distort the runtime
+            options['memswap_limit'] = reservation.memory
+        if reservation.cores:
+            options['cpuset_cpus'] = ",".join(str(core) for core in reservation.cores)
+        elif reservation.cpus:
+            options['nano_cpus'] = int(reservation.cpus * 1e9)
+
+        return options
@@ -0,0 +1,195 @@
+"""
+functions in this file are used to create the zip archive of a run once, after the run has ended,
+so the Downloads page can send this file directly (with HTTP range support), instead of zipping the run directory on every download.
+
+The archive and its manifest are stored in the archived runs directory (settings.directories["downloads"]):
+    <runID>.zip             zip archive of the run directory
+    <runID>.manifest.json   manifest of the archive, e.g.:
+{
+    "runID": "2024-01-01___13-37-00_myRun",
+    "created": "2024-01-01 15:00:00",
+    "stamp": "9f86d0...",
+    "archive": {"file": "2024-01-01___13-37-00_myRun.zip", "size": 81923321, "sha256": "e3b0c4..."},
+    "files": {
+        "BigCloneEval/NiCad/NiCad.csv": {"size": 412345678, "sha256": "2c26b4..."},
+        ...
+    }
+}
+    stamp:  sha256 of the relative paths, sizes and modification times of all files in the run directory,
+            the archive is outdated (and will be created again), if the run directory has changed since then
+
+The archives are created by a celery task (see tasks.py), one task per run at the same time.
+"""
+import json
+import os
+import zipfile
+from datetime import datetime
+from hashlib import sha256
+from pathlib import Path
+import project.settings as settings
+from project.utils.Run.runQueue import get_run_key, priorities
+
+# size of the chunks, in which the files are read
+chunkSize = 1024 * 1024
+# the archive of a run is requested/created (see request_run_archive), expires if the task was lost
+archiveRequestExpiration = 6 * 60 * 60
+
+
+def get_archive_file(runID: str) -> Path:
+    return Path(settings.directories["downloads"]) / f"{runID}.zip"
+
+
+def get_manifest_file(runID: str) -> Path:
+    return Path(settings.directories["downloads"]) / f"{runID}.manifest.json"
+
+
+def get_zip_compression(file: Path, compression: str) -> int:
+    """
+    compression method of a file in a zip archive:
+     'store':   no compression (fastest)
+     'deflate': deflate compression (smallest)
+     'auto':    no compression for large files (e.g. clone CSV files of multiple GB) and already compressed files,
+                deflate compression for all other files
+    """
+    if compression == "store":
+        return zipfile.ZIP_STORED
+    if compression == "deflate":
+        return zipfile.ZIP_DEFLATED
+
+    if file.suffix.lower() in settings.downloads["zipStoredExtensions"] or file.stat().st_size > settings.downloads["zipStoreLargerThan"]:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def get_run_stamp(runDir: Path) -> str:
+    """
+    Returns a hash of the relative paths, sizes and modification times of all files and directories in the run directory.
+    """
+    runDir = Path(runDir)
+    stamp = sha256()
+    for root, dirNames, fileNames in os.walk(runDir):
+        dirNames.sort()
+        for name in sorted(dirNames + fileNames):
+            path = Path(root) / name
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            stamp.update(f"{path.relative_to(runDir).as_posix()}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return stamp.hexdigest()
+
+
+def load_manifest(runID: str) -> dict|None:
+    try:
+        with open(get_manifest_file(runID), "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def archive_is_current(runDir: Path) -> bool:
+    """
+    check if the archive of the run exists and the run directory has not changed since it was created
+    """
+    runID = Path(runDir).name
+    manifest = load_manifest(runID)
+    if not manifest or not get_archive_file(runID).is_file():
+        return False
+    return manifest.get("stamp") == get_run_stamp(runDir)
+
+
+def remove_run_archive(runID: str) -> None:
+    get_archive_file(runID).unlink(missing_ok=True)
+    get_manifest_file(runID).unlink(missing_ok=True)
+
+
+def file_checksum(path: Path) -> str:
+    checksum = sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(chunkSize):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def build_run_archive(runDir: Path, compression: str = "auto") -> dict:
+    """
+    Create the zip archive and the manifest (with the sha256 checksum of each file) of a run directory.
+    Each file is read once: it is compressed and its checksum is calculated at the same time.
+    The archive is created in a temporary file and replaces the previous archive only when it is complete,
+    so an outdated archive can be downloaded in the meantime.
+
+    Returns:
+        the manifest of the archive
+    """
+    runDir = Path(runDir)
+    runID = runDir.name
+    archiveFile = get_archive_file(runID)
+    archiveFile.parent.mkdir(parents=True, exist_ok=True)
+
+    # the stamp is taken before the files are read: if the run directory changes in the meantime, the archive is outdated
+    stamp = get_run_stamp(runDir)
+    files = {}
+
+    tmpFile = archiveFile.with_name(f".{archiveFile.name}.{os.getpid()}.tmp")
+    try:
+        with zipfile.ZipFile(tmpFile, mode='w') as z:
+            for file in sorted(runDir.rglob('*')):
+                arcname = file.relative_to(runDir).as_posix()
+                try:
+                    if file.is_dir():
+                        z.mkdir(arcname)
+                        continue
+
+                    zipInfo = zipfile.ZipInfo.from_file(file, arcname)
+                    zipInfo.compress_type = get_zip_compression(file, compression)
+                    # ZipFile.open uses the compression level of the entry, not of the archive
+                    zipInfo._compresslevel = settings.downloads["zipCompressionLevel"]
+                    checksum = sha256()
+                    with open(file, "rb") as src, z.open(zipInfo, mode='w') as dst:
+                        while chunk := src.read(chunkSize):
+                            dst.write(chunk)
+                            checksum.update(chunk)
+                except FileNotFoundError:
+                    continue
+
+                files[arcname] = {"size": zipInfo.file_size, "sha256": checksum.hexdigest()}
+
+        archiveChecksum = file_checksum(tmpFile)
+        os.replace(tmpFile, archiveFile)
+    finally:
+        tmpFile.unlink(missing_ok=True)
+
+    manifest = {
+        "runID"     : runID,
+        "created"   : datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "stamp"     : stamp,
+        "archive"   : {"file": archiveFile.name, "size": archiveFile.stat().st_size, "sha256": archiveChecksum},
+        "files"     : files,
+    }
+
+    manifestFile = get_manifest_file(runID)
+    tmpManifest = manifestFile.with_name(f".{manifestFile.name}.{os.getpid()}.tmp")
+    with open(tmpManifest, "w") as file:
+        json.dump(manifest, file, indent=4)
+    os.replace(tmpManifest, manifestFile)
+
+    return manifest
+
+
+def request_run_archive(redis, runDir: Path) -> bool:
+    """
+    send a task to create the archive of the run to the celery task queue (with low priority),
+    unless the archive of this run is already requested
+
+    Returns:
+        True, if the task was sent
+    """
+    runID = Path(runDir).name
+    if not redis.set(get_run_key(runID, "archive"), "requested", nx=True, ex=archiveRequestExpiration):
+        return False
+
+    # imported here, since the tasks module imports the modules of the runs (circular import)
+    from project.tasks import build_run_archive_task
+
+    build_run_archive_task.apply_async(args=(str(runDir),), priority=priorities["low"])
+    return True
@@ -0,0 +1,131 @@
+"""
+functions in this file are used to resume a run:
+ save/load the configuration of a run (clone detector tool containers and benchmarks) in the run directory
+ write/check completion markers of each finished combination of benchmark and clone detector tool
+
+A completion marker is written to <run>/<benchmark>/<detector>/ after the container finished successfully, e.g.:
+{
+    "benchmark": "BigCloneEval",
+    "detector": "NiCad",
+    "finished": "2024-01-01 13:37:00",
+    "exitCode": 0,
+    "runtime": 3712.84,
+    "detectClonesRuntime": 3521.2,
+    "report": {"file": "NiCad.report", "size": 4211, "sha256": "9f86d0..."},
+    "csv": {"file": "NiCad.csv", "size": 81923321}
+}
+If a run is resumed, only combinations without (valid) completion marker are executed again.
+"""
+import json
+from datetime import datetime
+from hashlib import sha256
+from pathlib import Path
+import project.settings as settings
+
+
+def save_run_config(runDir: Path, containerConfigs: list[dict], benchmarks: list[dict]) -> None:
+    """
+    save the configuration of the containers and benchmarks of this run in the run directory
+    """
+    runConfig = {
+        "containerConfigs"  : containerConfigs,
+        "benchmarks"        : benchmarks
+    }
+    with open(Path(runDir) / settings.runs['configFileName'], "w") as file:
+        json.dump(runConfig, file, indent=4)
+
+
+def load_run_config(runDir: Path) -> tuple[list[dict], list[dict]]:
+    """
+    load the configuration of the containers and benchmarks of a run from its run directory
+
+    Returns:
+        containerConfigs, benchmarks
+    """
+    configFile = Path(runDir) / settings.runs['configFileName']
+    if not configFile.is_file():
+        raise FileNotFoundError(f"The run '{Path(runDir).name}' can not be resumed, since its configuration file '{configFile.name}' is missing")
+
+    with open(configFile, "r") as file:
+        runConfig = json.load(file)
+
+    return runConfig["containerConfigs"], runConfig["benchmarks"]
+
+
+def get_detector_name(containerConfig: dict) -> str:
+    """
+    returns the name of a clone detector tool (and its directory in the run directory) from its container config
+    """
+    return str(containerConfig['detector_config_filename']).removesuffix(settings.templateFiles['fileExtensionWebEdit'])
+
+
+def _file_sha256(file: Path) -> str:
+    fileHash = sha256()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            fileHash.update(chunk)
+    return fileHash.hexdigest()
+
+
+def write_completion_marker(detectorDir: Path, benchmarkName: str, detectorName: str, exitCode: int, runtime: float, detectClonesRuntime: float|None) -> None:
+    """
+    write the completion marker of a finished combination of benchmark and clone detector tool
+    """
+    detectorDir = Path(detectorDir)
+    reportFile = detectorDir / f"{detectorName}{settings.benchmarks['reportFileExtension']}"
+    csvFile = detectorDir / f"{detectorName}{settings.benchmarks['detectedClonesFileExtension']}"
+
+    marker = {
+        "benchmark"             : benchmarkName,
+        "detector"              : detectorName,
+        "finished"              : datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "exitCode"              : exitCode,
+        "runtime"               : round(runtime, 2),
+        "detectClonesRuntime"   : detectClonesRuntime,
+        "report"                : {"file": reportFile.name, "size": reportFile.stat().st_size, "sha256": _file_sha256(reportFile)},
+        "csv"                   : {"file": csvFile.name, "size": csvFile.stat().st_size},
+    }
+
+    with open(detectorDir / settings.runs['completionMarkerFileName'], "w") as file:
+        json.dump(marker, file, indent=4)
+
+
+def remove_completion_marker(detectorDir: Path) -> None:
+    (Path(detectorDir) / settings.runs['completionMarkerFileName']).unlink(missing_ok=True)
+
+
+def is_completed(detectorDir: Path) -> bool:
+    """
+    check if the combination of benchmark and clone detector tool has a valid completion marker:
+    the report and CSV file recorded in the marker still exist and were not changed
+    """
+    detectorDir = Path(detectorDir)
+    markerFile = detectorDir / settings.runs['completionMarkerFileName']
+
+    try:
+        with open(markerFile, "r") as file:
+            marker = json.load(file)
+
+        reportFile = detectorDir / marker["report"]["file"]
+        csvFile = detectorDir / marker["csv"]["file"]
+
+        return (reportFile.stat().st_size == marker["report"]["size"]
+                and csvFile.stat().st_size == marker["csv"]["size"]
+                and _file_sha256(reportFile) == marker["report"]["sha256"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def get_missing_jobs(runDir: Path, containerConfigs: list[dict], benchmarks: list[dict]) -> list[tuple[str, str]]:
+    """
+    returns all combinations of benchmark and clone detector tool of a run, which have not been completed (yet)
+    e.g.: [("BigCloneEval", "NiCad"), ("GoogleCodeJam", "NiCad")]
+    """
+    missing = []
+    for benchmark in benchmarks:
+        for containerConfig in containerConfigs:
+            detectorName = get_detector_name(containerConfig)
+            if not is_completed(Path(runDir) / benchmark['name'] / detectorName):
+                missing.append((benchmark['name'], detectorName))
+
+    return missing
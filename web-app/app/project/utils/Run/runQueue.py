@@ -0,0 +1,149 @@
+"""
+functions in this file are used to manage the state of multiple runs in redis.
+Runs are queued in the celery task queue (by priority, then in order of submission)
+and executed by the celery workers, several runs may be executed at the same time.
+
+The state of each run is stored in redis keys prefixed with the run ID, e.g. for the run '2024-01-01___13-37-00_myRun':
+    run.2024-01-01___13-37-00_myRun.task.id     celery task ID of the run
+    run.2024-01-01___13-37-00_myRun.directory   run directory
+    run.2024-01-01___13-37-00_myRun.log         log file of the run
+    run.2024-01-01___13-37-00_myRun.status      queued, started, finished, failed or aborted
+    run.2024-01-01___13-37-00_myRun.progress    (hash) current progress of the run
+    run.2024-01-01___13-37-00_myRun.priority    priority of the run in the queue
+    run.2024-01-01___13-37-00_myRun.archive     set while the archive of the run is requested or created (see runArchives.py)
+    run.2024-01-01___13-37-00_myRun.sizes       cached sizes of the directories of the run (see runSizes.py)
+All queued or executed runs are stored in the sorted set 'runs.active' (score: time of submission).
+"""
+from pathlib import Path
+from time import time
+import project.settings as settings
+
+# sorted set of the IDs of all queued or executed runs (score: time of submission)
+activeRunsKey = "runs.active"
+# ID of the run, which was submitted last
+latestRunKey  = "runs.latest"
+
+# priorities, which can be selected for a run. Celery (with redis broker): 0 = highest priority
+priorities = {
+    "high"      : 0,
+    "normal"    : 5,
+    "low"       : 9,
+}
+
+
+def get_run_key(runID: str, key: str) -> str:
+    """
+    returns the name of a redis key of the specified run, e.g.:
+    get_run_key("2024-01-01___13-37-00_myRun", "status") -> "run.2024-01-01___13-37-00_myRun.status"
+    """
+    return f"run.{runID}.{key}"
+
+
+def get_priority(priorityName: str) -> int:
+    """
+    convert the name of a priority (high, normal, low) to the celery task priority (default: normal)
+    """
+    return priorities.get(str(priorityName).lower(), priorities["normal"])
+
+
+def queue_run(redis, runID: str, runDir: str|Path, priority: int) -> None:
+    """
+    register a new (or resumed) run, before its celery task is sent to the queue
+    """
+    redis.set(get_run_key(runID, "directory"), str(runDir))
+    redis.set(get_run_key(runID, "log"), str(Path(runDir) / "run.log"))
+    redis.set(get_run_key(runID, "status"), "queued")
+    redis.set(get_run_key(runID, "priority"), priority)
+
+    progress = {
+        "type"           : "container",
+        "status"         : "queued",
+        "progressBar"    : "enabled",
+        "currentStep"    : 0,
+        "totalSteps"     : 0,
+        "currentMessage" : f"Run '{runID}' is queued and will be started as soon as a worker is available",
+        "isExecuted"     : "False"
+    }
+    redis.delete(get_run_key(runID, "progress"))
+    redis.hset(get_run_key(runID, "progress"), mapping=progress)
+
+    redis.zadd(activeRunsKey, {runID: time()})
+    redis.set(latestRunKey, runID)
+
+
+def remove_active_run(redis, runID: str) -> None:
+    """
+    remove a run from the queued or executed runs, after it has been finished, failed or was aborted
+    """
+    redis.zrem(activeRunsKey, runID)
+
+
+def is_active(redis, runID: str) -> bool:
+    """
+    check if a run is queued or executed at the moment
+    """
+    return redis.zscore(activeRunsKey, runID) is not None
+
+
+def get_active_runs(redis) -> list[dict]:
+    """
+    returns all queued or executed runs, ordered like the celery queue (executed runs first, then by priority and time of submission)
+    e.g.:
+    [
+        {"runID": "2024-01-01___13-37-00_myRun", "status": "started", "priority": 5, "message": "executing container for 'NiCad'"},
+        {"runID": "2024-01-01___13-40-12_run2", "status": "queued", "priority": 0, "message": "Run '2024-01-01___13-40-12_run2' is queued ..."},
+    ]
+    """
+    runs = []
+    for runID, submitted in redis.zrange(activeRunsKey, 0, -1, withscores=True):
+        priority = redis.get(get_run_key(runID, "priority"))
+        runs.append({
+            "runID"     : runID,
+            "status"    : redis.get(get_run_key(runID, "status")) or "queued",
+            "priority"  : int(priority) if priority is not None else priorities["normal"],
+            "message"   : redis.hget(get_run_key(runID, "progress"), "currentMessage") or "",
+            "submitted" : submitted,
+        })
+
+    return sorted(runs, key=lambda run: (run["status"] == "queued", run["priority"], run["submitted"]))
+
+
+def get_active_run_directories(redis) -> list[Path]:
+    """
+    returns the directories of all queued or executed runs
+    """
+    runsDir = Path(settings.directories["runs"])
+    return [runsDir / runID for runID in redis.zrange(activeRunsKey, 0, -1)]
+
+
+def get_latest_run_id(redis) -> str|None:
+    """
+    returns the ID of the run, which was submitted last
+    """
+    return redis.get(latestRunKey)
+
+
+def reset_interrupted_runs(redis) -> list[str]:
+    """
+    executed on startup of the celery worker:
+    runs, which were executed when the worker was stopped (e.g. killed), are set to failed (they can be resumed).
+    Queued runs stay queued, their tasks are still in the celery task queue.
+
+    Returns:
+        IDs of the interrupted runs
+    """
+    interruptedRuns = []
+    for runID in redis.zrange(activeRunsKey, 0, -1):
+        if redis.get(get_run_key(runID, "status")) == "queued":
+            continue
+
+        redis.set(get_run_key(runID, "status"), "failed")
+        redis.hset(get_run_key(runID, "progress"), mapping={
+            "status"         : "error",
+            "currentMessage" : f"Run '{runID}' was interrupted, since the Celery (backend service) container was stopped",
+            "isExecuted"     : "False"
+        })
+        remove_active_run(redis, runID)
+        interruptedRuns.append(runID)
+
+    return interruptedRuns
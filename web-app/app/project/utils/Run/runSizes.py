@@ -0,0 +1,116 @@
+"""
+functions in this file are used to cache the sizes of the directories of a run, which are displayed on the Downloads page,
+so the files of a run are not read on every listing.
+
+The sizes of all directories of a run are stored as JSON in the redis key 'run.<runID>.sizes', e.g.:
+{
+    "stamps": {
+        ".": 1704116220123456789,
+        "BigCloneEval": 1704116219987654321,
+        "BigCloneEval/NiCad": 1704116210123456789,
+        ...
+    },
+    "sizes": {
+        ".": 1234567890,
+        "BigCloneEval": 1234560000,
+        "BigCloneEval/NiCad": 412345678,
+        ...
+    }
+}
+    stamps: modification time (ns) of each directory of the run, when the sizes were calculated.
+            The sizes are calculated again, if a directory was modified (a file or directory in it was created,
+            deleted or renamed) or removed since then. Only the directories are checked, not every file.
+
+The sizes are updated at the end of each run (see ExecuteRun.final) and removed, if files of the run are deleted (see downloads.py).
+The sizes of queued or executed runs are not cached, since their files are still written.
+"""
+import json
+import os
+from pathlib import Path
+from project.utils.Run.runQueue import get_run_key
+
+
+def get_sizes_key(runID: str) -> str:
+    return get_run_key(runID, "sizes")
+
+
+def calculate_run_sizes(runDir: Path) -> tuple[dict, dict]:
+    """
+    Calculate the size (in Bytes) of the run directory and each of its subdirectories, in one walk over the run directory.
+
+    Returns:
+        dict: relative path of the directory ('.' for the run directory) -> size
+        dict: relative path of the directory -> modification time (ns)
+    """
+    runDir = Path(runDir)
+    sizes = {}
+    stamps = {}
+    # bottom-up: the sizes of the subdirectories are known before the size of their parent directory is calculated
+    for root, dirNames, fileNames in os.walk(runDir, topdown=False):
+        size = 0
+        for fileName in fileNames:
+            try:
+                size += os.lstat(os.path.join(root, fileName)).st_size
+            except FileNotFoundError:
+                continue
+
+        relativeRoot = Path(root).relative_to(runDir).as_posix()
+        for dirName in dirNames:
+            size += sizes.get(Path(relativeRoot, dirName).as_posix(), 0)
+
+        try:
+            stamps[relativeRoot] = os.stat(root).st_mtime_ns
+        except FileNotFoundError:
+            continue
+        sizes[relativeRoot] = size
+    return sizes, stamps
+
+
+def directories_unchanged(runDir: Path, stamps: dict) -> bool:
+    """
+    check if none of the directories of the run was modified or removed since their modification times were stored
+    (new directories change the modification time of their parent directory)
+    """
+    for relativePath, stamp in stamps.items():
+        try:
+            if os.stat(os.path.join(runDir, relativePath)).st_mtime_ns != stamp:
+                return False
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def update_run_sizes(redis, runDir: Path) -> dict:
+    """
+    calculate the sizes of the directories of a run and store them in redis
+    """
+    runDir = Path(runDir)
+    sizes, stamps = calculate_run_sizes(runDir)
+    redis.set(get_sizes_key(runDir.name), json.dumps({"stamps": stamps, "sizes": sizes}))
+    return sizes
+
+
+def get_run_sizes(redis, runDir: Path, isActive: bool = False) -> dict:
+    """
+    Returns the sizes of the directories of a run (see calculate_run_sizes):
+    from redis, if no directory of the run was modified since they were calculated,
+    otherwise the sizes are calculated again (and stored in redis, unless the run is queued or executed)
+    """
+    runDir = Path(runDir)
+    if isActive:
+        return calculate_run_sizes(runDir)[0]
+
+    cached = redis.get(get_sizes_key(runDir.name))
+    if cached:
+        try:
+            cached = json.loads(cached)
+            if cached["stamps"] and directories_unchanged(runDir, cached["stamps"]):
+                return cached["sizes"]
+        except (ValueError, KeyError, TypeError):
+            pass
+
+    return update_run_sizes(redis, runDir)
+
+
+def remove_run_sizes(redis, runID: str) -> None:
+    redis.delete(get_sizes_key(runID))
@@ -9,6 +9,9 @@ import project.utils.configFilesParser.configParserFiles as cp
 from pathlib import Path
 from re import fullmatch
 import shutil
+from project.utils.Run import runCheckpoints
+from project.utils.Run import runQueue
+from celery.utils import uuid
 
 class SetupRun():
 
@@ -53,20 +56,15 @@ class SetupRun():
 
     def start_run(self) -> dict:
 
-        # only used for debugging, to allow mutliple runs at the same time
-        #self.redis.set("run.status", "finished")
-
         # prevent whitespaces, since this could lead to error in docker
         if not fullmatch(pattern=r"^[\w\d\_\-\.]*", string=self.runID):
             return {'type': "error",
                     'message': "Run name: only [a-z A-Z 0-9 _ . -] allowed, no whitespaces" }
 
-        # check if a run is executed at the moment
-        if self.redis.hget('run.progress', 'isExecuted') == "True":
+        # runs submitted at the same time with the same name would share the run directory
+        if self.runDir.exists() or runQueue.is_active(self.redis, self.runID):
             return {'type': "error",
-                    'message': "Another run is being executed at the moment. Please wait and try again" }
-
-        self.redis.set("run.status", "starting")
+                    'message': f"A run with the ID '{self.runID}' already exists. Please wait a second or choose another run name" }
 
         # update detectors list
         # only those detector tools whose checkbox was clicked in the web form remain
@@ -75,12 +73,10 @@ class SetupRun():
         self.benchmarks = self.get_selected(self.benchmarks)
 
         if len(self.detectorTemplates) == 0:
-            self.redis.set("run.status", "aborted")
             return {'type': "error",
                     'message': "no detector tool selected" }
 
         if len(self.benchmarks) == 0:
-            self.redis.set("run.status", "aborted")
             return {'type': "error",
                     'message': "no benchmark selected" }
 
@@ -107,18 +103,22 @@ class SetupRun():
         # extract benchmark directories and names
         benchmarks = self.assamble_benchmarks()
 
+        # save the configuration of the containers and benchmarks, so this run can be resumed later
+        runCheckpoints.save_run_config(self.runDir, containerConfigs, benchmarks)
+
         # run container of each detector tool
         # in celery task queue, executed by worker services in the background
-        start_container_runner.apply_async(args=(containerConfigs, str(self.runDir), benchmarks))
+        priority = runQueue.get_priority(self.formData.get("priority"))
+        submit_run(self.redis, containerConfigs, self.runDir, benchmarks, priority)
 
         if self.cliMode:
-            return {'type': "success", 'message': f"""Run started."""}
+            return {'type': "success", 'message': f"""Run '{self.runID}' queued."""}
         else:
             return {'type': "success",
-                    'message': f"""Run started. <br>
+                    'message': f"""Run '{self.runID}' queued. It will be started as soon as a worker is available. <br>
                             The current progress can be monitored via the
-                            '<a href="{url_for("main.show_logs", logCategory="run")}">Logs (Run)</a>'
-                            menu item."""}
+                            '<a href="{url_for("main.show_run_logs", runID=self.runID)}">Logs (Run)</a>'
+                            page."""}
 
 
     def assamble_benchmarks(self) -> list[dict]:
@@ -183,6 +183,9 @@ class SetupRun():
                             "mountpoint_base":"/cloneDetection/",
                             "mountpoint_detector_config":"/cloneDetection/Applications/SourcerCC/clone-detector/sourcerer-cc.properties",
                             "mountpoint_entrypoint_config":"/cloneDetection/entrypoint.cfg"
+                        },
+                        "resources":{
+                            "memory":"8g"
                         }
                     },
                     {
@@ -193,6 +196,10 @@ class SetupRun():
                             "mountpoint_base":"/cloneDetection/",
                             "mountpoint_detector_config":"/cloneDetection/Applications/StoneDetector/config/default.properties",
                             "mountpoint_entrypoint_config":"/cloneDetection/entrypoint.cfg"
+                        },
+                        "resources":{
+                            "cpus":"4",
+                            "memory":"12g"
                         }
                     }
                 ]
@@ -204,6 +211,7 @@ class SetupRun():
                 'detector_config_filename'  : template['filename'],
                 'entrypoint_config_filename': template['benchmarkCfgFilename'],
                 'container'                 : template['container'],
+                'resources'                 : template['resources'],
                 }
             )
 
@@ -327,3 +335,64 @@ class SetupRun():
             config = self.get_form_data(filename, arguments=benchmark['detectClonesArguments'])
             cp.update_config(dstFile, detectClonesSection, config)
 
+
+def submit_run(redis, containerConfigs: list[dict], runDir: Path, benchmarks: list[dict], priority: int, resume: bool = False) -> None:
+    """
+    register the run in redis and send it to the celery task queue.
+    Runs with higher priority (lower value) are started first, runs with the same priority in order of submission.
+    """
+    runID = Path(runDir).name
+
+    # the task ID is known before the task is sent, so the run can be aborted while it is queued
+    taskID = uuid()
+    runQueue.queue_run(redis, runID, runDir, priority)
+    redis.set(runQueue.get_run_key(runID, "task.id"), taskID)
+
+    start_container_runner.apply_async(args=(containerConfigs, str(runDir), benchmarks), kwargs={'resume': resume},
+                                       task_id=taskID, priority=priority)
+
+
+def resume_run(runID: str, cliMode: bool = False, priority: int = runQueue.priorities["normal"]) -> dict:
+    """
+    resume a previous run, which was aborted or failed:
+    all combinations of benchmark and clone detector tool, which have not been completed, are executed again (in the same run directory).
+    The configuration of the containers and benchmarks saved in the run directory at the start of the run is used.
+    """
+    redis = configure_redis()
+
+    # ensure there is no path in front of the run ID
+    runID = Path(str(runID)).name
+    runDir = Path(settings.directories["runs"]) / runID
+
+    if not runID or not runDir.is_dir():
+        return {'type': "error",
+                'message': f"Run '{runID}' does not exist" }
+
+    # check if this run is queued or executed at the moment
+    if runQueue.is_active(redis, runID):
+        return {'type': "error",
+                'message': f"Run '{runID}' is queued or executed at the moment" }
+
+    try:
+        containerConfigs, benchmarks = runCheckpoints.load_run_config(runDir)
+    except (OSError, ValueError, KeyError) as exc:
+        return {'type': "error",
+                'message': str(exc) }
+
+    missingJobs = runCheckpoints.get_missing_jobs(runDir, containerConfigs, benchmarks)
+    if not missingJobs:
+        return {'type': "error",
+                'message': f"All clone detector tools of run '{runID}' have already been completed" }
+
+    # run the missing containers in celery task queue, executed by worker services in the background
+    submit_run(redis, containerConfigs, runDir, benchmarks, priority, resume=True)
+
+    message = f"Run '{runID}' queued for resumption: {len(missingJobs)} missing or failed container(s) will be executed."
+    if cliMode:
+        return {'type': "success", 'message': message}
+    else:
+        return {'type': "success",
+                'message': f"""{message} <br>
+                        The current progress can be monitored via the
+                        '<a href="{url_for("main.show_run_logs", runID=runID)}">Logs (Run)</a>'
+                        page."""}
@@ -10,6 +10,29 @@ import pandas as pd
 from plotnine import *
 import re
 
+# resource usage of each benchmark phase in the report file (inserted by entrypoint.py) -> column in summary.csv
+# e.g.: "Peak RSS (MB) of detectClones: 2048.51"
+resourceUsageMetrics = {
+    "User CPU time (s)"     : "CPU User (s)",
+    "System CPU time (s)"   : "CPU System (s)",
+    "Peak RSS (MB)"         : "Peak RSS (MB)",
+    "Block input (MB)"      : "Block Input (MB)",
+    "Block output (MB)"     : "Block Output (MB)",
+}
+# benchmark phases (commands executed by entrypoint.py)
+# the columns of detectClones have no suffix (e.g. 'Peak RSS (MB)'), the columns of the other phases are suffixed with the phase name
+# (e.g. 'Peak RSS (MB) of evaluateTool')
+resourceUsagePhases = ["detectClones", "importClones", "evaluateTool"]
+# line prefix in the report file -> column in summary.csv, e.g.: "Peak RSS (MB) of evaluateTool:" -> "Peak RSS (MB) of evaluateTool"
+resourceUsageColumns = {
+    f"{metric} of {phase}:" : column if phase == "detectClones" else f"{column} of {phase}"
+    for phase in resourceUsagePhases
+    for metric, column in resourceUsageMetrics.items()
+}
+
+# summary of the resource usage time series of the container (see containerStats.py) -> column in summary.csv
+containerStatsColumns = ["Peak Container Memory (MB)", "Mean Container CPU (%)", "Max Container CPU (%)"]
+
 def create_recall_plot(csvFile: Path, dst: Path, clusterBy: str ='Type') -> None:
     """
     Create a plot (bar chart) based on the tool statistics from a CSV file
@@ -75,6 +98,53 @@ def create_runtime_plot(csvFile: Path, dst: Path) -> None:
     ggsave(plot, filename=dst, verbose = False)
 
 
+def create_resource_plot(runBenchmarkPath: Path, dst: Path) -> None:
+    """
+    Create a plot (line chart) of the memory and CPU usage over time of all clone detector tool containers of a benchmark,
+    based on their resource usage time series (see containerStats.py), and save it to the specified destination filepath.
+    Nothing is created, if no time series was recorded.
+    """
+    frames = []
+    for statsFile in Path(runBenchmarkPath).glob(f"*/{settings.runs['containerStatsFileName']}"):
+        data = pd.read_csv(statsFile, usecols=["Time (s)", "CPU (%)", "Memory (MB)"])
+        if data.empty:
+            continue
+        data['Name'] = statsFile.parent.name
+        frames.append(data)
+
+    if not frames:
+        return
+
+    # one facet per metric: memory and CPU usage
+    data = pd.concat(frames).melt(id_vars=['Name', 'Time (s)'], value_vars=['Memory (MB)', 'CPU (%)'], var_name='Metric')
+
+    plot = (
+        ggplot(data, aes(x='Time (s)', y='value', color='Name')) +
+        geom_line() +
+        facet_wrap('~Metric', ncol=1, scales='free_y') +
+        labs(title='Resource usage over time for different clone detector tools', x='Time (s)', y='') +
+        theme(axis_text_x=element_text())
+    )
+
+    ggsave(plot, filename=dst, width=15, height=8, verbose = False)
+
+
+def extract_container_stats(statsFile: Path) -> dict:
+    """
+    summarize the resource usage time series of a container (see containerStats.py):
+    peak memory, mean and maximum CPU usage (see containerStatsColumns)
+    """
+    data = pd.read_csv(statsFile, usecols=["CPU (%)", "Memory (MB)"])
+    if data.empty:
+        return dict.fromkeys(containerStatsColumns)
+
+    return {
+        "Peak Container Memory (MB)"    : data["Memory (MB)"].max(),
+        "Mean Container CPU (%)"        : round(data["CPU (%)"].mean(), 2),
+        "Max Container CPU (%)"         : data["CPU (%)"].max(),
+    }
+
+
 def extract_run_time(logFile: Path) -> float:
     """
     reads the log file of the run and extracts the run time of the "detectClones" command
@@ -152,8 +222,8 @@ def extract_per_clone_type_statistic(lines: list[str]) -> list[dict]:
 
 def extract_statistics_from_file(reportFilePath: Path) -> list[dict]:
     """
-    extracts the tool name, runtime, total number of reported clones (true and false positives) 
-    and main statistics from a .report file 
+    extracts the tool name, runtime, resource usage of each benchmark phase (see resourceUsageColumns),
+    resource usage of the container (see containerStatsColumns), total number of reported clones (true and false positives) and main statistics from a .report file 
     main statistics means the values of the following report part:
         ================================================================================
             All Functionalities
@@ -186,6 +256,15 @@ def extract_statistics_from_file(reportFilePath: Path) -> list[dict]:
     lines = text.split("\n")
 
     cloneStatistic = []
+    # reports of older runs do not contain the resource usage
+    resourceUsage = {column: None for column in resourceUsageColumns.values()}
+
+    # runs without resource usage sampling do not contain a time series of the container
+    statsFile = reportFilePath.parent / settings.runs['containerStatsFileName']
+    if statsFile.is_file():
+        resourceUsage.update(extract_container_stats(statsFile))
+    else:
+        resourceUsage.update(dict.fromkeys(containerStatsColumns))
 
     # search and extract the main statistics in the report file 
     for index, line in enumerate(lines):
@@ -203,6 +282,10 @@ def extract_statistics_from_file(reportFilePath: Path) -> list[dict]:
         if "Runtime (s) of detectClones:" in line:
             runtime = line.split(":")[1].strip()
 
+        for prefix, column in resourceUsageColumns.items():
+            if prefix in line:
+                resourceUsage[column] = line.split(":")[1].strip()
+
         # get main statistic for each clone type
         if "-- Recall Per Clone Type (type: numDetected / numClones = recall) --" in line:
             cloneStatistic = extract_per_clone_type_statistic(lines[index+1:])
@@ -213,6 +296,7 @@ def extract_statistics_from_file(reportFilePath: Path) -> list[dict]:
         element['Name'] = toolName
         element['Runtime'] = runtime
         element['TotalReportedClones (true and false positives)'] = totalReportedClones
+        element.update(resourceUsage)
 
     return cloneStatistic
 
@@ -239,6 +323,8 @@ def extract_statistics_to_csv(runPath: str|Path, csvPath: Path) -> None:
     df = pd.DataFrame(totalStatistics)
     # and reorder the columns
     columnOrder = ['Name', 'Runtime', 'TotalReportedClones (true and false positives)', 'Type', 'numDetected', 'numClones', 'recall']
+    columnOrder += list(resourceUsageColumns.values())
+    columnOrder += containerStatsColumns
     df = df[columnOrder]
 
     df.to_csv(csvPath, index=False)
@@ -3,15 +3,17 @@ these functions are used by the "Downloads" page of the website
 and the associated routes in the views.py file
 """
 import project.settings as settings
-from flask import send_file, send_from_directory
+from flask import Response, send_from_directory
 from pathlib import Path
 import os
 from datetime import datetime
 import zipfile
 from shutil import rmtree
-from io import BytesIO
 import pandas as pd
 from project.utils.configure import configure_redis
+from project.utils.Run.runQueue import get_active_run_directories, is_active
+from project.utils.Run.runSizes import get_run_sizes, remove_run_sizes
+from project.utils.Run.runArchives import get_zip_compression, archive_is_current, get_archive_file, request_run_archive, remove_run_archive
 
 def input_path_is_valid(path: str|Path) -> bool:
     """
@@ -30,16 +32,19 @@ def input_path_is_valid(path: str|Path) -> bool:
     else:
         return False
 
-def list_directory_content(directory: str):
+def list_directory_content(directory: str, page: int = 1, sort: str = "name", order: str = "asc"):
     """
     Returns:
-     a list of all files and 
+     a list of the files on the requested page (settings.downloads["pageSize"] entries per page),
      a list of all diagrams in a specified directory,
-     a list of dicts, containing the data of the summary.csv file, if there is a summary.csv file in this directory.
+     the URL of the data of the summary.csv file (see get_summary_data), if there is a summary.csv file in this directory,
+     a dict with the current page, number of pages and entries and the sorting of the list.
     Every entry of the first list contains:
      the path (relativ to the "runs" directory), 
      name, size, modification timestamp and 
      whether or not this entry is a file or a directory.
+    The entries are sorted by name, modification time or size (sort) in ascending or descending order (order).
+    The sizes of directories are read from the cached sizes of their run (see runSizes.py).
     """
     files = []
     baseDir = Path(settings.directories["runs"])
@@ -55,70 +60,208 @@ def list_directory_content(directory: str):
     if not input_path_is_valid(directoryPath):
         return None
 
+    if sort not in {"name", "modified", "size"}:
+        sort = "name"
+
     # list of diagram files, to be displayed in the web file browser
     diagrams = []
 
-    # data of the summary.csv file. This data will be displayed in an interactive plot in JavaScript on the webclient
+    # URL of the data of the summary.csv file (see get_summary_data).
+    # This data will be requested by the webclient and displayed in an interactive plot and table in JavaScript
     summary = None
 
     # list all files in the directory
-    for file in os.listdir(directoryPath):
+    for entry in os.scandir(directoryPath):
+        file = entry.name
         # real file system path
         filePath = directoryPath / file
 
-        # size of the file or directory
-        size = get_path_size(filePath)
+        try:
+            isDir = entry.is_dir()
+            modified = entry.stat().st_mtime
+        except FileNotFoundError:
+            continue
 
         # path in the web interface ( example.com/downloads/<directory>/<file> )
         webPath = directory / file
 
-        if filePath.is_dir():
-            isDir = True
+        if isDir:
             if not str(webPath).endswith("/"):
                 webPath = f"{webPath}/"
-        else:
-            isDir = False
 
         files.append({
                 'path': webPath,
                 'name': file,
-                'size': size,
-                'modified': datetime.fromtimestamp(filePath.stat().st_mtime).replace(microsecond=0),
+                # set below, only for the entries, which are displayed (or sorted by size)
+                'size': None,
+                'modified': datetime.fromtimestamp(modified).replace(microsecond=0),
                 'is_dir': isDir,
+                'filePath': filePath,
             })
         
         #
         if file.endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp', 'svg')):
             diagrams.append(webPath)
 
-        diagrams.sort()
-
         if file == "summary.csv":
-            summary = get_csv_data(filePath)
-            #print(summary)
+            summary = f"/api/summary/{directory.as_posix()}/" if directory.parts else "/api/summary/"
+
+    diagrams.sort()
+
+    # the sizes of all entries are needed to sort them by size, otherwise only the sizes of the displayed entries
+    sizes = DirectorySizes()
+    if sort == "size":
+        for file in files:
+            file['size'] = sizes.get(file['filePath'], file['is_dir'])
+
+    # names are sorted case-insensitive
+    if sort == "name":
+        files.sort(key=lambda file: file['name'].lower(), reverse=(order == "desc"))
+    else:
+        files.sort(key=lambda file: file[sort], reverse=(order == "desc"))
+
+    entries = len(files)
+    pageSize = settings.downloads["pageSize"]
+    pages = max(1, -(-entries // pageSize))
+    page = min(max(1, page), pages)
+    files = files[(page - 1) * pageSize : page * pageSize]
+
+    for file in files:
+        if file['size'] is None:
+            file['size'] = sizes.get(file['filePath'], file['is_dir'])
+        del file['filePath']
+
+    pagination = {
+        'page': page,
+        'pages': pages,
+        'entries': entries,
+        'sort': sort,
+        'order': "desc" if order == "desc" else "asc",
+    }
+
+    return files, diagrams, summary, pagination
+
+# parsed summary.csv files: path -> {"stamp": (mtime, size), "data": DataFrame, "aggregated": {...}}
+# (per web server process, the oldest entry is removed if there are more than settings.downloads["summaryCacheEntries"])
+summaryCache = {}
 
-    return files, diagrams, summary
+# aggregations of the numeric columns of summary.csv, which can be requested by the web client
+summaryAggregations = {"mean", "median", "min", "max", "sum"}
 
-def get_csv_data(csv: Path):
+
+def load_summary(csv: Path) -> pd.DataFrame:
     """
     Returns:
-     a list of dicts, containing the data of the specified csv file.
+     the data of the specified summary.csv file, cached until the file is modified
     """
+    csv = Path(csv)
+    stat = csv.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    entry = summaryCache.get(csv)
+    if entry and entry["stamp"] == stamp:
+        return entry
+
+    entry = {"stamp": stamp, "data": pd.read_csv(csv), "aggregated": {}}
+    summaryCache.pop(csv, None)
+    summaryCache[csv] = entry
+    while len(summaryCache) > settings.downloads["summaryCacheEntries"]:
+        del summaryCache[next(iter(summaryCache))]
+    return entry
 
-    df = pd.read_csv(csv)
-    # convert the DataFrame to a list of dictionary for JSON response
-    # The elements of these dictionries are the rows from the csv
-    return df.to_dict(orient='records')
-    """ e.g.:
-    Name,           Runtime,    Type,       numDetected
-    StoneDetector,  13.24,      Type-1,     20828
-    StoneDetector,  13.24,      Type-2,     3475
-    StoneDetector,  13.24,      Type-2 (blind), 242
-    ->
-    [{'Name': 'StoneDetector', 'Runtime': 13.24, 'Type': Type-1, 'numDetected': 20828},
-    {'Name': 'StoneDetector', 'Runtime': 13.24, 'Type': Type-2, 'numDetected': 3475},
-    {'Name': 'StoneDetector', 'Runtime': 13.24, 'Type': Type-2 (blind), 'numDetected': 242}]
+
+def split_argument(value: str|None) -> list[str]:
+    """
+    split a comma-separated query argument, e.g. "Type-1,Type-2" -> ["Type-1", "Type-2"]
     """
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def get_summary_data(directory: str, args: dict):
+    """
+    Returns:
+     the data of the summary.csv file in a directory, selected by the query arguments of the web client, e.g.:
+     /api/summary/<run>/?tools=NiCad,Nil&types=Type-1,Type-2&columns=Name,Type,recall&aggregate=mean
+    Query arguments (all optional):
+     tools, types:      comma-separated names of tools (column 'Name') and clone types (column 'Type'), only these rows are returned
+     columns:           comma-separated columns, which are returned (default: all columns)
+     aggregate:         mean, median, min, max or sum: aggregate the numeric columns of the rows with the same tool and clone type
+                        (e.g. a summary of multiple runs)
+     search:            only rows, which contain this text in one of the returned columns
+     sort, order:       sort the rows by a column, ascending (asc) or descending (desc)
+     offset, limit:     return only a part of the rows (e.g. the current page of a table)
+    The response contains the selected rows and, to build filters on the web client,
+    all columns, tools and clone types of the file:
+    {
+        "columns": ["Name", "Runtime", "Type", ...],
+        "tools": ["NiCad", "Nil"], "types": ["Type-1", "Type-2", ...],
+        "total": 16,
+        "rows": [{"Name": "NiCad", "Type": "Type-1", "recall": 0.98}, ...]
+    }
+    """
+    baseDir = Path(settings.directories["runs"])
+    csv = baseDir / (directory or "") / "summary.csv"
+
+    # safety check: make sure the summary file is a child of the base (downloads) directory
+    if not input_path_is_valid(csv):
+        return "File not found", 404
+
+    entry = load_summary(csv)
+    data = entry["data"]
+
+    tools = split_argument(args.get("tools"))
+    types = split_argument(args.get("types"))
+    columns = [column for column in split_argument(args.get("columns")) if column in data.columns] or list(data.columns)
+    aggregate = args.get("aggregate")
+    if aggregate and aggregate not in summaryAggregations:
+        return "invalid aggregate", 400
+    try:
+        offset = max(0, int(args.get("offset") or 0))
+        limit = max(0, int(args["limit"])) if args.get("limit") else None
+    except ValueError:
+        return "invalid offset or limit", 400
+
+    selected = data
+    if aggregate:
+        groupColumns = [column for column in ("Name", "Type") if column in data.columns]
+        columns = groupColumns + [column for column in columns if column not in groupColumns]
+        # the aggregated data is cached with the file, since it depends only on the selected columns and aggregation
+        key = (tuple(columns), aggregate)
+        if key not in entry["aggregated"]:
+            numericColumns = [column for column in columns if column not in groupColumns and pd.api.types.is_numeric_dtype(data[column])]
+            entry["aggregated"][key] = data.groupby(groupColumns, sort=False)[numericColumns].agg(aggregate).reset_index()
+        selected = entry["aggregated"][key]
+        columns = list(selected.columns)
+
+    if tools and "Name" in selected.columns:
+        selected = selected[selected["Name"].isin(tools)]
+    if types and "Type" in selected.columns:
+        selected = selected[selected["Type"].isin(types)]
+
+    selected = selected[columns]
+
+    if search := args.get("search"):
+        matches = selected.astype(str).apply(lambda column: column.str.contains(search, case=False, regex=False))
+        selected = selected[matches.any(axis=1)]
+
+    if (sort := args.get("sort")) in selected.columns:
+        selected = selected.sort_values(sort, ascending=(args.get("order") != "desc"), kind="stable")
+
+    total = len(selected)
+    selected = selected.iloc[offset : None if limit is None else offset + limit]
+
+    # NaN (e.g. missing resource usage of a tool) is not valid JSON
+    rows = selected.astype(object).where(selected.notna(), None).to_dict(orient='records')
+
+    return {
+        "columns": list(data.columns),
+        "tools": list(data["Name"].unique()) if "Name" in data.columns else [],
+        "types": list(data["Type"].unique()) if "Type" in data.columns else [],
+        "total": total,
+        "rows": rows,
+    }
 
 # Helper function to calculate directory size
 def get_path_size(path: Path):
@@ -135,6 +278,43 @@ def get_path_size(path: Path):
 
     return size
 
+
+class DirectorySizes:
+    """
+    sizes of the directories in the runs directory, read from the cached sizes of their run (see runSizes.py).
+    The sizes of each run are read once per instance, the sizes of queued or executed runs are calculated.
+    """
+    def __init__(self) -> None:
+        self.redis = configure_redis()
+        self.baseDir = Path(settings.directories["runs"])
+        self.activeRunDirs = set(get_active_run_directories(self.redis))
+        # run ID -> sizes of the directories of the run
+        self.runs = {}
+
+    def get(self, path: Path, isDir: bool) -> int:
+        path = Path(path)
+        if not isDir:
+            try:
+                return path.stat().st_size
+            except FileNotFoundError:
+                return 0
+
+        relativePath = path.relative_to(self.baseDir)
+        if not relativePath.parts:
+            return get_path_size(path)
+
+        runID = relativePath.parts[0]
+        runDir = self.baseDir / runID
+        if runID not in self.runs:
+            self.runs[runID] = get_run_sizes(self.redis, runDir, isActive=(runDir in self.activeRunDirs))
+
+        size = self.runs[runID].get(path.relative_to(runDir).as_posix())
+        # the directory was created after the sizes of its run were calculated
+        if size is None:
+            size = get_path_size(path)
+        return size
+
+
 def serve_file(filePath: str):
     """
     Serve a file as download.
@@ -153,10 +333,80 @@ def serve_file(filePath: str):
     
     return send_from_directory(fileDir, file)
 
-def path_download(path: str):
+class ZipStreamBuffer:
+    """
+    Write-only, unseekable file object for zipfile.ZipFile:
+    collects the bytes written by zipfile, until they are taken and sent to the client (see stream_zip).
+    zipfile writes a data descriptor after each entry, since it can not seek back to its header.
+    """
+    def __init__(self) -> None:
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_zip(directory: Path, compression: str = "auto", compressionLevel: int = None):
+    """
+    Generator of a zip archive of a directory: each file is read, compressed and sent to the client in chunks,
+    so the memory usage does not depend on the size of the files.
+    Files, which are removed while the archive is created, are skipped.
+    """
+    if compressionLevel is None:
+        compressionLevel = settings.downloads["zipCompressionLevel"]
+    chunkSize = settings.downloads["zipChunkSize"]
+
+    buffer = ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, mode='w') as z:
+        for file in sorted(directory.rglob('*')):
+            arcname = file.relative_to(directory).as_posix()
+            try:
+                if file.is_dir():
+                    z.mkdir(arcname)
+                    continue
+
+                zipInfo = zipfile.ZipInfo.from_file(file, arcname)
+                zipInfo.compress_type = get_zip_compression(file, compression)
+                # ZipFile.open uses the compression level of the entry, not of the archive
+                zipInfo._compresslevel = compressionLevel
+                with open(file, "rb") as src, z.open(zipInfo, mode='w') as dst:
+                    while chunk := src.read(chunkSize):
+                        dst.write(chunk)
+                        # the compressor may not have produced any output yet: empty chunks are not sent
+                        if data := buffer.take():
+                            yield data
+            except FileNotFoundError:
+                continue
+
+            # rest of the entry (end of the compressed data, data descriptor)
+            if data := buffer.take():
+                yield data
+
+    # central directory
+    yield buffer.take()
+
+
+def path_download(path: str, compression: str = "auto", compressionLevel: int = None):
     """
     Serve a path (file or directory) as download.
-    If a directory is requested, the directory will be zipped as a in memory zip file.
+    If the directory of a finished run is requested, its pre-built archive (see runArchives.py) is sent,
+    if it is up to date (with support of HTTP range requests, e.g. to resume a download).
+    Otherwise the directory will be streamed as zip file (see stream_zip),
+    compressed with the specified compression method (see get_zip_compression).
     """
     baseDir = Path(settings.directories["runs"])
     path = baseDir / path
@@ -169,19 +419,28 @@ def path_download(path: str):
         return "Directory not found", 404
     
     if path.is_dir():
-        # Create a in memory zip file with the contents of the directory
-        zipFile = BytesIO()
-        with zipfile.ZipFile(zipFile, mode='w') as z:
-            for file in path.rglob('*'):
-                z.write(file, arcname=os.path.relpath(file, path))
-        zipFile.seek(0)
-
-        # send the in memory zip file to client
-        return send_file(
-            zipFile,
+        if compression not in {"auto", "store", "deflate"}:
+            return "invalid compression", 400
+
+        redis = configure_redis()
+        # directory of a run, which is neither queued nor executed
+        if path.parent == baseDir and not is_active(redis, path.name):
+            if compression == "auto" and archive_is_current(path):
+                archiveFile = get_archive_file(path.name)
+                return send_from_directory(
+                    archiveFile.parent,
+                    archiveFile.name,
+                    as_attachment=True,
+                    download_name=f"{fileName}.zip"
+                )
+            # the archive does not exist (yet) or is outdated: it is created in the background for the next download
+            request_run_archive(redis, path)
+
+        # send the zip file to the client while it is created (chunked transfer, the size is not known in advance)
+        return Response(
+            stream_zip(path, compression, compressionLevel),
             mimetype='application/zip',
-            as_attachment=True,
-            download_name=f"{fileName}.zip"
+            headers={'Content-Disposition': f'attachment; filename="{fileName}.zip"'}
         )
     else:
         return send_from_directory(
@@ -198,9 +457,7 @@ def path_delete(path: str):
 
     redis = configure_redis()
 
-    currentRunDir = redis.get('run.directory')
-    runIsRunning = redis.hget('run.progress', 'isExecuted')
-    runStatus = redis.get('run.status')
+    activeRunDirs = get_active_run_directories(redis)
 
     baseDir = Path(settings.directories["runs"])
     path = baseDir / path
@@ -211,12 +468,20 @@ def path_delete(path: str):
     if not input_path_is_valid(path):
         return "invalid Path", 403
 
-    # dont delete the directory if this is the directory of the current executed run
-    if path.is_relative_to(currentRunDir) and runIsRunning == "True" and runStatus!="failed":
+    # dont delete the directory if this is (or contains) the directory of a queued or executed run
+    if any(path.is_relative_to(runDir) or runDir.is_relative_to(path) for runDir in activeRunDirs):
         return "This file or directory is currently in use", 423
 
+    # the cached sizes of the run are outdated (see runSizes.py)
+    relativePath = path.relative_to(baseDir)
+    if relativePath.parts:
+        remove_run_sizes(redis, relativePath.parts[0])
+
     if path.is_dir():
         rmtree(path)
+        # remove the pre-built archive of a run directory
+        if path.parent == baseDir:
+            remove_run_archive(path.name)
         return "Directory deleted", 200
     else:
         path.unlink()
@@ -3,16 +3,102 @@ these functions are used by the "Logs" page(s) of the website
 and the associated routes in the views.py file
 """
 import project.settings as settings
+import os
 from flask import url_for
 from pathlib import Path
 from project.utils.configure import configure_redis
+from project.utils.Run import runQueue
 
-def get_log_history(logCategory="run") -> list:
+def get_key_prefix(logCategory: str, runID: str = None) -> str:
     """
-    Retrieve the log history of the latest 'run' or 'imageBuild' activity.
+    returns the prefix of the redis keys and SSE channels of a log category:
+      - "run": keys of the specified run, e.g. "run.<runID>" (channels: "run_<runID>")
+      - "imageBuild": keys of the latest image build "imageBuild"
+    """
+    if logCategory not in {'run', 'imageBuild'}:
+        raise ValueError("logCategory not in {'run', 'imageBuild'}")
+
+    if logCategory == "run":
+        # e.g. "run.<runID>.log", see runQueue.get_run_key()
+        return f"run.{runID}"
+    return logCategory
+
+
+def get_latest_run_id() -> str|None:
+    """
+    returns the ID of the latest submitted run (None, if no run was submitted yet)
+    """
+    redis = configure_redis()
+    return runQueue.get_latest_run_id(redis)
+
+def get_log_file(logCategory="run", runID: str = None) -> Path|None:
+    """
+    returns the log file of the specified run or the latest 'imageBuild' activity from redis
+    (None, if no such activity has been executed yet)
+    """
+    keyPrefix = get_key_prefix(logCategory, runID)
+
+    redis = configure_redis()
+
+    logFile = redis.get(f"{keyPrefix}.log")
+    runStatus = redis.get(f"{keyPrefix}.status")
+
+    if runStatus == None or logFile == None:
+        return None
+    return Path(logFile)
+
+
+def read_log_lines(logFile: Path, numLines: int, before: int = None) -> tuple[list[str], int]:
+    """
+    Read the last lines of a log file before a byte offset (default: the end of the file).
+    The file is read backwards from this offset in blocks (settings.logs["readBlockSize"]),
+    until numLines lines are read, so only these lines are read, no matter how large the log file is.
+
+    Returns:
+        the lines (without line breaks) and the byte offset of the first returned line in the file.
+        The offset can be used as 'before' to read the preceding lines, 0: there are no preceding lines.
+    """
+    blockSize = settings.logs["readBlockSize"]
+
+    with open(logFile, "rb") as log:
+        end = log.seek(0, os.SEEK_END)
+        if before is not None:
+            end = min(max(0, before), end)
+        if end == 0:
+            return [], 0
+
+        blocks = []
+        lineBreaks = 0
+        start = end
+        # one line break more than lines is needed: the line break before the first line
+        while start > 0 and lineBreaks <= numLines:
+            readSize = min(blockSize, start)
+            start -= readSize
+            log.seek(start)
+            block = log.read(readSize)
+            blocks.append(block)
+            lineBreaks += block.count(b"\n")
+
+    data = b"".join(reversed(blocks))
+    # the line break at the end of the last line
+    if data.endswith(b"\n"):
+        data = data[:-1]
+
+    lines = data.split(b"\n")
+    # the first line is incomplete, if the beginning of the file was not reached
+    first = max(len(lines) - numLines, 0 if start == 0 else 1)
+    offset = start + sum(len(line) + 1 for line in lines[:first])
+
+    return [line.decode(errors="replace") for line in lines[first:]], offset
+
+
+def get_log_history(logCategory="run", runID: str = None) -> tuple[list, int]:
+    """
+    Retrieve the log history of the specified run or the latest 'imageBuild' activity.
 
     This function first fetches the location of the log file for the specified category ('run' or 'imageBuild') from a Redis database. 
-    It then reads and returns all log entries from the log file located at the retrieved path. 
+    It then reads and returns the last log entries (settings.logs["initialLines"]) from the log file located at the retrieved path. 
+    Older log entries can be requested by the web client from the log API (see get_log_lines).
 
     If the run status or log file path is not found in the Redis database (indicating no such activity has been executed yet, or the log data is missing),
     the function returns a list containing a single message indicating that no logs are available for the specified category.
@@ -20,45 +106,60 @@ def get_log_history(logCategory="run") -> list:
     Parameters:
         logCategory (str, optional): The category of logs to retrieve. Defaults to 'run'.
                                 Valid options are 'run' for run logs and 'imageBuild' for image build logs.
+        runID (str, optional): The ID of the run (only used for 'run').
 
     Returns:
         list: A list of log entries as strings. Each entry corresponds to a line in the log file.
+        int: The byte offset of the first returned log entry in the log file (0: there are no older log entries).
 
     Raises:
         ValueError: If logCategory is not one of the expected values ('run' or 'imageBuild').
 
     Usage Example:
-    >>> log_entries = get_log_history("run")
+    >>> log_entries, offset = get_log_history("run", "2024-01-01___13-37-00_myRun")
     >>> for entry in log_entries:
     >>>     print(entry)
     """
-    if logCategory not in {'run', 'imageBuild'}:
-        raise ValueError("logCategory not in {'run', 'imageBuild'}")
+    logFile = get_log_file(logCategory, runID)
 
-    redis = configure_redis()
+    if logFile == None:
+        return [f"No {logCategory} has been executed yet."], 0
 
-    logFile = redis.get(f"{logCategory}.log")
-    runStatus = redis.get(f"{logCategory}.status")
+    if not logFile.is_file():
+        return [], 0
 
-    if runStatus == None or logFile == None:
-        return [f"No {logCategory} has been executed yet."]
-    
-    logFile = Path(logFile)
+    return read_log_lines(logFile, settings.logs["initialLines"])
 
-    logHistory = ""
-    if logFile.is_file():
-        with open(logFile, 'r') as log:
-            logHistory = [line for line in log]  
 
-    return logHistory
+def get_log_lines(logCategory="run", runID: str = None, before: int = None, numLines: int = None):
+    """
+    Returns the log entries of the specified run or the latest 'imageBuild' activity before a byte offset in the log file, e.g.:
+    /api/logs/run/<runID>?before=1048576&lines=1000
+    {
+        "lines": ["2024-01-01 13:37:00 | INFO | ...", ...],
+        "offset": 1021345
+    }
+        offset: byte offset of the first returned log entry, to request the preceding log entries (0: there are no older log entries)
+    """
+    if numLines is None:
+        numLines = settings.logs["initialLines"]
+    numLines = min(max(1, numLines), settings.logs["maxLines"])
+
+    logFile = get_log_file(logCategory, runID)
+    if logFile == None or not logFile.is_file():
+        return "Log file not found", 404
 
-def get_container_progress(logCategory="run") -> dict:
+    lines, offset = read_log_lines(logFile, numLines, before)
+    return {"lines": lines, "offset": offset}
+
+
+def get_container_progress(logCategory="run", runID: str = None) -> dict:
     """
     Retrieve the current progress of a container's execution process.
 
     This function returns a dictionary representing the current state and progress of a container's execution.
     The returned dictionary varies depending on the logCategory parameter:
-      - For "run", it fetches the progress details from a Redis database.
+      - For "run", it fetches the progress details of the specified run from a Redis database.
       - For "imageBuild", it returns a dictionary with the status set to "disabled", as the progress tracking
         feature is not supported for the image building process.
 
@@ -73,6 +174,7 @@ def get_container_progress(logCategory="run") -> dict:
 
     Parameters:
         logCategory (str, optional): Specifies the category of logs. Defaults to "run". Valid options are "run" and "imageBuild".
+        runID (str, optional): The ID of the run (only used for "run").
 
     Returns:
         A dictionary containing progress details or a status indicating the feature is disabled.
@@ -81,7 +183,7 @@ def get_container_progress(logCategory="run") -> dict:
         ValueError: If logCategory is not one of the expected values ('run' or 'imageBuild').
 
     Usage Example:
-    >>> progress_info = get_container_progress("run")
+    >>> progress_info = get_container_progress("run", "2024-01-01___13-37-00_myRun")
     >>> print(progress_info)
     {
         "status"        : "running",
@@ -91,13 +193,12 @@ def get_container_progress(logCategory="run") -> dict:
         "isExecuted"    : True
     }
     """
-    if logCategory not in {'run', 'imageBuild'}:
-        raise ValueError("logCategory not in {'run', 'imageBuild'}")
+    keyPrefix = get_key_prefix(logCategory, runID)
 
     redis = configure_redis()
 
     # get dict from redis database
-    progress = redis.hgetall(f"{logCategory}.progress")
+    progress = redis.hgetall(f"{keyPrefix}.progress")
 
     # is or was a run executed? 
     if progress in [ None, {} ]:
@@ -114,7 +215,7 @@ def get_container_progress(logCategory="run") -> dict:
     return progress
 
 
-def get_SSE_channels(logCategory) -> tuple[str, str, str]:
+def get_SSE_channels(logCategory, runID: str = None) -> tuple[str, str, str]:
     """
     Generate and return URLs for Server-Sent Event (SSE) channels based on the specified log category.
 
@@ -124,11 +225,12 @@ def get_SSE_channels(logCategory) -> tuple[str, str, str]:
       - Heartbeats Channel: For sending regular heartbeats to indicate activity.
 
     The specific channels generated depend on the logCategory parameter, which determines the context:
-      - "run": Channels for containers where the current run is executed.
+      - "run": Channels for containers where the specified run is executed.
       - "imageBuild": Channels for the image building process, typically for building new images from git repositories.
 
     Parameters:
         logCategory (str): A string specifying the category of logs. Valid values are "run" and "imageBuild".
+        runID (str, optional): The ID of the run (only used for "run").
 
     Returns:
         Tuple[str, str, str]: A tuple containing the URLs for the logs, progress, and heartbeats channels, respectively.
@@ -137,11 +239,13 @@ def get_SSE_channels(logCategory) -> tuple[str, str, str]:
         ValueError: If logCategory is not one of the expected values ('run' or 'imageBuild').
 
     Usage Example:
-    >>> logs_url, progress_url, heartbeats_url = get_SSE_channels("run")
+    >>> logs_url, progress_url, heartbeats_url = get_SSE_channels("run", "2024-01-01___13-37-00_myRun")
     """      
     
     match logCategory:
-        case "run" | "imageBuild":
+        case "run":
+            channelPrefix = f"run_{runID}"
+        case "imageBuild":
             channelPrefix = logCategory
         case _:
             raise ValueError("logCategory not in {'run', 'imageBuild'}")
@@ -8,6 +8,9 @@ import project.settings as settings
 import project.utils.configFilesParser.configParserFiles as cp
 from project.utils.configure import configure_redis
 from project.utils.Run.setupRun import SetupRun
+from project.utils.Run import setupRun
+from project.utils.Run import runCheckpoints
+from project.utils.Run import runQueue
 from project.utils.Run.executeRun import ExecuteRun
 from project.utils.utils import copy_config_files_from_template_dir_to_workbench
 from project.utils.startup import check_and_initialize_data_directory
@@ -18,33 +21,99 @@ def start_run(formData) -> dict:
     msgToClient = run.start_run()
     return msgToClient
 
-def abort_run() -> dict:
+def resume_run(formData) -> dict:
+    priority = runQueue.get_priority(formData.get("priority"))
+    return setupRun.resume_run(formData.get("runID", ""), priority=priority)
+
+def get_active_runs() -> list[dict]:
     """
-    abort the current run by aborting the celery task, which executes the clone detector tool containers
+    list all queued or executed runs (see runQueue.get_active_runs)
     """
     redis = configure_redis()
-    
-    runTaskID = redis.get('run.task.id')
-    if runTaskID == None:
-        return {'type': "error", 
-                'message': "No run has been executed yet." }
-    
-    runIsRunning = redis.hget('run.progress', 'isExecuted')
-    if runIsRunning == "False":
-        return {'type': "error", 
-                'message': "The current run can't be canceled, since no run is executed at the moment." }
-    
+    return runQueue.get_active_runs(redis)
+
+def get_resumable_runs() -> list[dict]:
+    """
+    list all runs, which can be resumed:
+    their configuration was saved in the run directory and at least one clone detector tool has not been completed
+
+    Returns:
+        list of dicts, sorted by run ID (newest first), e.g.:
+        [
+            {"runID": "2024-01-01___13-37-00_myRun", "missing": 2, "total": 7}
+        ]
+    """
+    redis = configure_redis()
+    runsDir = Path(settings.directories["runs"])
+
+    resumableRuns = []
+    for configFile in runsDir.glob(f"*/{settings.runs['configFileName']}"):
+        runDir = configFile.parent
+        # runs, which are queued or executed at the moment, can not be resumed
+        if runQueue.is_active(redis, runDir.name):
+            continue
+        try:
+            containerConfigs, benchmarks = runCheckpoints.load_run_config(runDir)
+        except (OSError, ValueError, KeyError):
+            continue
+
+        missingJobs = runCheckpoints.get_missing_jobs(runDir, containerConfigs, benchmarks)
+        if missingJobs:
+            resumableRuns.append({
+                "runID"     : runDir.name,
+                "missing"   : len(missingJobs),
+                "total"     : len(containerConfigs) * len(benchmarks)
+            })
+
+    return sorted(resumableRuns, key=lambda x: x['runID'], reverse=True)
+
+def abort_run(runID: str = None) -> dict:
+    """
+    abort a queued or executed run by aborting the celery task, which executes the clone detector tool containers.
+    If no run ID is specified, the only active run is aborted.
+    """
+    redis = configure_redis()
+
+    if not runID:
+        activeRuns = runQueue.get_active_runs(redis)
+        if len(activeRuns) == 0:
+            return {'type': "error",
+                    'message': "The run can't be canceled, since no run is queued or executed at the moment." }
+        if len(activeRuns) > 1:
+            return {'type': "error",
+                    'message': f"Multiple runs are queued or executed at the moment, please specify the run to cancel: {', '.join(run['runID'] for run in activeRuns)}" }
+        runID = activeRuns[0]['runID']
+
+    runTaskID = redis.get(runQueue.get_run_key(runID, 'task.id'))
+    if runTaskID == None or not runQueue.is_active(redis, runID):
+        return {'type': "error",
+                'message': f"The run '{runID}' can't be canceled, since it is not queued or executed at the moment." }
+
     task = ExecuteRun().AsyncResult(runTaskID)
     task.abort()
-    
-    runID = redis.get("run.id")
-    if runID == None:
-        runID = ""
-    
-    return {'type': "success", 
+
+    # a queued run is skipped by the worker, once its task is received
+    if redis.get(runQueue.get_run_key(runID, 'status')) == "queued":
+        redis.set(runQueue.get_run_key(runID, 'status'), "aborted")
+        redis.hset(runQueue.get_run_key(runID, 'progress'), mapping={
+            "status"         : "aborted",
+            "currentMessage" : f"Run '{runID}' aborted while it was queued",
+            "isExecuted"     : "False"
+        })
+        runQueue.remove_active_run(redis, runID)
+
+    return {'type': "success",
             'message': f"Run {runID} canceled" }
 
 
+def abort_all_runs() -> list[dict]:
+    """
+    abort all executed runs (not the queued ones, they stay in the celery task queue)
+    """
+    redis = configure_redis()
+    return [abort_run(run['runID']) for run in runQueue.get_active_runs(redis) if run['status'] == "started"]
+
+
 def duplicate_tool_config(tool: str, newName: str) -> tuple[str, int]:
     """
     duplicate a detector tool's config file
@@ -14,6 +14,8 @@ from shutil import copy2
 import docker, docker.errors
 from project.utils import utils
 from project.utils.configure import configure_redis
+from project.utils.Run.runQueue import reset_interrupted_runs
+from project.utils.Run.resourceScheduler import ResourceScheduler
 
 def check_and_initialize_data_directory(override:bool = False) -> None:
     """
@@ -119,6 +121,7 @@ def on_celeryd_startup(sender=None, instance=None, **kwargs):
     """
     try:
         set_startup_status("The Celery (backend service) container is still starting. Please wait and watch the 'docker compose' output. Reload this page to update this message.", "info")
+        reset_runs()
         check_container_registry_login()
         check_images()
     except Exception as exc:
@@ -148,6 +151,20 @@ def set_startup_status(statusMsg: str, statusType: str) -> None:
     redis.hset('startup_status', mapping=status)
 
 
+def reset_runs() -> None:
+    """
+    Set the runs, which were executed when the Celery container was stopped, to failed
+    and remove the resource reservations of their clone detector tool containers.
+    (assumes a single Celery container, which executes all runs)
+    """
+    redis = configure_redis()
+
+    for runID in reset_interrupted_runs(redis):
+        print(f"Run '{runID}' was interrupted and set to failed. It can be resumed via the 'Run' page.")
+
+    ResourceScheduler.clear_reservations(redis)
+
+
 def check_container_registry_login() -> None:
     """
     Checks the login credentials for a container image registry and configures Redis based on the availability and validity of these credentials.
@@ -170,8 +187,6 @@ def check_container_registry_login() -> None:
     """
     redis = configure_redis()
 
-    redis.hset('run.progress', 'isExecuted', "False")
-
     try:
         username=environ['CONTAINER_REGISTRY_LOGIN_USERNAME']
         password=environ['CONTAINER_REGISTRY_LOGIN_PASSWORD_TOKEN']
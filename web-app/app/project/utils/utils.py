@@ -143,6 +143,10 @@ def read_template_files(fromDir:str = None) -> list[dict]:
                 "mountpoint_detector_config": "/cloneDetection/Applications/NiCad/config/myconfig.cfg",
                 "mountpoint_entrypoint_config": "/cloneDetection/entrypoint.cfg",
             },
+            "resources": {
+                "cpus": "2",
+                "memory": "8g",
+            },
             "arguments": 
             [
                 { "name": "var1", "description": "Description of variable1", "default": "True" },
@@ -226,6 +230,7 @@ def read_template_files(fromDir:str = None) -> list[dict]:
                 'detectorName'         : detectorName,
                 'general'              : config['general'],
                 'container'            : config['container'],
+                'resources'            : config['resources'],
                 'arguments'            : config['arguments'],
                 'benchmarkCfgFilename' : settings.benchmarks['configFileName'],
                 'benchmarkArguments'   : config['benchmarkArguments']
@@ -285,6 +290,7 @@ def read_template_file(file: str) -> dict[dict]:
     Reads the configuration from the specified file.
     This includes:  
         container configuration;  
+        resources (CPU cores and memory) needed by the container (optional);  
         arguments, description and default values of detector tool software
         Benchmark specific arguments, description and default values for this detector tool software
 
@@ -302,6 +308,10 @@ def read_template_file(file: str) -> dict[dict]:
             "mountpoint_detector_config": "/cloneDetection/Applications/NiCad/config/myconfig.cfg",
             "mountpoint_entrypoint_config": "/cloneDetection/entrypoint.cfg",
         },
+        "resources": {
+            "cpus": "2",
+            "memory": "8g",
+        },
         "arguments": [
             {"name": "var1", "description": "Description of variable1", "default": "True"},
             {"name": "var2", "description": "Description of variable2", "default": "dfs"},
@@ -320,6 +330,7 @@ def read_template_file(file: str) -> dict[dict]:
 
     generalSection          = settings.templateFiles['generalSection']
     containerSection        = settings.templateFiles['containerSection']
+    resourcesSection        = settings.templateFiles['resourcesSection']
     descriptionSection      = settings.templateFiles['descriptionSection']
     defaultValueSection     = settings.templateFiles['defaultValueSection']
     benchmarkDescriptionSection   = settings.templateFiles['benchmarkDescriptionSection']
@@ -330,6 +341,10 @@ def read_template_file(file: str) -> dict[dict]:
     else: 
         general = dict()
     container        = dict(configFile[containerSection])
+    if configFile.has_section(resourcesSection):
+        resources    = dict(configFile[resourcesSection])
+    else:
+        resources    = dict()
     arguments        = read_description_and_defaults(configFile, descriptionSection, defaultValueSection)
     benchmarkConfig  = read_description_and_defaults(configFile, benchmarkDescriptionSection, benchmarkDefaultValueSection)
 
@@ -340,6 +355,7 @@ def read_template_file(file: str) -> dict[dict]:
     config = {
         'general'   : general,
         'container' : container,
+        'resources' : resources,
         'arguments' : arguments,
         'benchmarkArguments': benchmarkConfig
     }
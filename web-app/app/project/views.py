@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, redirect, request
+from flask import Blueprint, render_template, redirect, request, url_for
 
 import project.utils.utils as Utils
 import project.utils.pages.downloads as Downloads
@@ -26,18 +26,35 @@ def run():
     benchmarks = Utils.read_benchmark_files()
 
     if request.method == 'GET':
-        return render_template('run_form.html', detectorsTemplates=detectorTemplates, benchmarks=benchmarks)
+        resumableRuns = Run.get_resumable_runs()
+        activeRuns = Run.get_active_runs()
+        return render_template('run_form.html', detectorsTemplates=detectorTemplates, benchmarks=benchmarks, resumableRuns=resumableRuns, activeRuns=activeRuns)
 
     # on form submit
     if request.method == 'POST':
         msgToClient = Run.start_run(formData=request.form)
-        return render_template('run_form.html', detectorsTemplates=detectorTemplates, benchmarks=benchmarks, messageFromServer=msgToClient)
-    
+        resumableRuns = Run.get_resumable_runs()
+        activeRuns = Run.get_active_runs()
+        return render_template('run_form.html', detectorsTemplates=detectorTemplates, benchmarks=benchmarks, resumableRuns=resumableRuns, activeRuns=activeRuns, messageFromServer=msgToClient)
+
+
+# resume a previous run, which was aborted or failed
+@main.route('/run/resume', methods=['POST'])
+def run_resume():
+    detectorTemplates = Utils.read_template_files()
+    benchmarks = Utils.read_benchmark_files()
+
+    msgToClient = Run.resume_run(formData=request.form)
+    resumableRuns = Run.get_resumable_runs()
+    activeRuns = Run.get_active_runs()
+    return render_template('run_form.html', detectorsTemplates=detectorTemplates, benchmarks=benchmarks, resumableRuns=resumableRuns, activeRuns=activeRuns, messageFromServer=msgToClient)
 
-# abort the current run
+
+# abort a queued or executed run (without run ID: the only queued or executed run)
 @main.route('/run_abort', methods=['GET'])
-def run_abort():
-    msg = Run.abort_run()
+@main.route('/run_abort/<runID>', methods=['GET'])
+def run_abort(runID: str = None):
+    msg = Run.abort_run(runID)
     return msg
 
 
@@ -125,13 +142,57 @@ def show_logs(logCategory: str ="run"):
     if logCategory not in { 'run', 'imageBuild' }:
         return "Error: invalid /logs/<logCategory>"
 
-    logHistory = Logs.get_log_history(logCategory)
+    # show the logs of the latest submitted run
+    if logCategory == "run":
+        latestRunID = Logs.get_latest_run_id()
+        if latestRunID:
+            return redirect(url_for("main.show_run_logs", runID=latestRunID))
+
+    logHistory, logOffset = Logs.get_log_history(logCategory)
     containerProgress = Logs.get_container_progress(logCategory)
 
     logsChannel, progressChannel, heartbeatsChannel = Logs.get_SSE_channels(logCategory)
+    logApiUrl = url_for("main.log_lines", logCategory=logCategory)
         
     return render_template("show_logs.html", logHistory=logHistory, containerProgress=containerProgress, 
-                           logsChannel=logsChannel, progressChannel=progressChannel, heartbeatsChannel=heartbeatsChannel)
+                           logsChannel=logsChannel, progressChannel=progressChannel, heartbeatsChannel=heartbeatsChannel,
+                           logOffset=logOffset, logApiUrl=logApiUrl)
+
+
+# logs of a specific run
+@main.route('/logs/run/<runID>', methods=['GET'])
+def show_run_logs(runID: str):
+
+    logHistory, logOffset = Logs.get_log_history("run", runID)
+    containerProgress = Logs.get_container_progress("run", runID)
+
+    logsChannel, progressChannel, heartbeatsChannel = Logs.get_SSE_channels("run", runID)
+    logApiUrl = url_for("main.run_log_lines", runID=runID)
+
+    activeRuns = Run.get_active_runs()
+
+    return render_template("show_logs.html", logHistory=logHistory, containerProgress=containerProgress, 
+                           logsChannel=logsChannel, progressChannel=progressChannel, heartbeatsChannel=heartbeatsChannel,
+                           logOffset=logOffset, logApiUrl=logApiUrl, runID=runID, activeRuns=activeRuns)
+
+
+# log entries before a byte offset in the log file, as JSON ("load older" on the Logs page, see Logs.get_log_lines)
+# e.g. /api/logs/run/<runID>?before=1048576&lines=1000
+@main.route('/api/logs/<logCategory>', methods=['GET'])
+def log_lines(logCategory: str):
+    if logCategory != "imageBuild":
+        return "Error: invalid /api/logs/<logCategory>", 400
+
+    before = request.args.get('before', default=None, type=int)
+    numLines = request.args.get('lines', default=None, type=int)
+    return Logs.get_log_lines(logCategory, None, before, numLines)
+
+
+@main.route('/api/logs/run/<runID>', methods=['GET'])
+def run_log_lines(runID: str):
+    before = request.args.get('before', default=None, type=int)
+    numLines = request.args.get('lines', default=None, type=int)
+    return Logs.get_log_lines("run", runID, before, numLines)
 
 
 ############
@@ -149,12 +210,23 @@ def downloads():
 def show_directory(path: str = None):  
     # Check if there is a trailing slash in the request URL
     if str(request.url).endswith('/'):
-        files, diagrams, summaryData = Downloads.list_directory_content(path)
-        return render_template('downloads.html', files=files, diagrams=diagrams, summaryData=summaryData)
+        # page and sorting of the file browser, e.g. /downloads/?page=2&sort=modified&order=desc
+        page = request.args.get('page', default=1, type=int)
+        sort = request.args.get('sort', default="name")
+        order = request.args.get('order', default="asc")
+        files, diagrams, summaryUrl, pagination = Downloads.list_directory_content(path, page, sort, order)
+        return render_template('downloads.html', files=files, diagrams=diagrams, summaryUrl=summaryUrl, pagination=pagination)
     else:
         return Downloads.serve_file(path)
 
 
+# data of the summary.csv file in a directory, as JSON (filtered, aggregated and paginated, see Downloads.get_summary_data)
+@main.route('/api/summary/', methods=['GET'])
+@main.route('/api/summary/<path:directory>/', methods=['GET'], strict_slashes=False)
+def summary_data(directory: str = None):
+    return Downloads.get_summary_data(directory, request.args)
+
+
 # delete a file or directory
 @main.route('/downloads/<path:directory>', methods=['DELETE'])
 def delete(directory: str):
@@ -165,7 +237,9 @@ def delete(directory: str):
 # download a file or directory (as zip file)
 @main.route('/downloads/<path:directory>/download', methods=['POST'])
 def download(directory: str):
-    ret = Downloads.path_download(directory)
+    # compression of directories (zip files): auto, store or deflate
+    compression = request.form.get('compression', default="auto")
+    ret = Downloads.path_download(directory, compression)
     return ret
 
 ############
@@ -0,0 +1,22 @@
+#!/bin/sh
+# starts the celery workers of the backend image:
+#   runs:   executes the runs (queue 'runs'), at most MAX_CONCURRENT_RUNS at the same time (see project/__init__.py)
+#   tasks:  executes all other tasks (queue 'celery'): image builds of new clone detector tools and run archives.
+#           Its concurrency is the number of CPU cores, independent of the number of executed runs.
+# If one of the workers exits, the other one is stopped as well, so the container is restarted.
+
+celery -A run.celery worker --loglevel=info --queues runs --hostname "runs@%h" &
+runsWorker=$!
+celery -A run.celery worker --loglevel=info --queues celery --hostname "tasks@%h" --concurrency "$(nproc)" &
+tasksWorker=$!
+
+# forward the stop signal of docker to both workers (the runs worker aborts its executed runs, see tasks.py)
+trap 'kill -TERM "$runsWorker" "$tasksWorker" 2>/dev/null' TERM INT
+
+while kill -0 "$runsWorker" 2>/dev/null && kill -0 "$tasksWorker" 2>/dev/null; do
+    sleep 1 &
+    wait $!
+done
+
+kill -TERM "$runsWorker" "$tasksWorker" 2>/dev/null
+wait